@@ -105,6 +105,7 @@ run_service() {
     fi
 
     schedule_resource_sync_task
+    schedule_download_counts_flush_task
 
     exec "${service_path}" "$@"
 }
@@ -124,6 +125,7 @@ run_manage() {
     fi
 
     schedule_resource_sync_task
+    schedule_download_counts_flush_task
 
     exec django-admin "$@"
 }
@@ -204,6 +206,16 @@ schedule_resource_sync_task() {
     fi
 }
 
+schedule_download_counts_flush_task() {
+    buffer_download_counts="$(dynaconf get GALAXY_BUFFER_DOWNLOAD_COUNTS 2>/dev/null)"
+    if [[ "${buffer_download_counts,,}" == "true" ]]; then
+        log_message "Scheduling Download Counts Flush Task to execute every minute"
+        django-admin task-scheduler --id flush_role_download_counts --interval 1 --path "galaxy_ng.app.tasks.download_counts.flush_role_download_counts" || true
+    else
+        log_message "Buffered download counts are not enabled, skipping flush scheduling"
+    fi
+}
+
 redis_connection_hack() {
     redis_host="${PULP_REDIS_HOST:-}"
     redis_password="${PULP_REDIS_PASSWORD:-}"
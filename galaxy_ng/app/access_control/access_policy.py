@@ -1,17 +1,15 @@
 import contextlib
 import logging
 import os
+import threading
 
 from django.conf import settings
-from django.contrib.auth.models import Permission
-from django.db.models import Q, Exists, OuterRef, CharField
-from django.db.models.functions import Cast
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import NotFound, ValidationError
 
 from pulpcore.plugin.util import extract_pk
 from pulpcore.plugin.access_policy import AccessPolicyFromDB
-from pulpcore.plugin.models.role import GroupRole, UserRole
 from pulpcore.plugin import models as core_models
 from pulpcore.plugin.util import get_objects_for_user
 
@@ -23,10 +21,12 @@ from pulp_ansible.app.serializers import CollectionVersionCopyMoveSerializer
 from galaxy_ng.app import models
 from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
+from galaxy_ng.app.common import metrics
 from galaxy_ng.app.constants import COMMUNITY_DOMAINS
 from galaxy_ng.app.utils.rbac import get_v3_namespace_owners
 
 from galaxy_ng.app.access_control.statements import PULP_VIEWSETS
+from galaxy_ng.app.access_control.visibility import visible_repository_ids
 
 log = logging.getLogger(__name__)
 
@@ -50,8 +50,102 @@ def get_view_urlpattern(view):
     return view.urlpattern()
 
 
-def has_model_or_object_permissions(user, permission, obj):
-    return user.has_perm(permission) or user.has_perm(permission, obj)
+def has_model_or_object_permissions(user, permission, obj, request=None):
+    return (
+        user_has_perm(request, user, permission)
+        or user_has_perm(request, user, permission, obj)
+    )
+
+
+class AccessCacheStats:
+    """Thread safe hit/miss counters of the access policy caches of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, name, hit):
+        with self._lock:
+            counter = self._counters.setdefault(name, [0, 0])
+            counter[0 if hit else 1] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+
+    def as_dict(self):
+        with self._lock:
+            counters = {name: list(counter) for name, counter in self._counters.items()}
+        return {
+            name: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+            for name, (hits, misses) in counters.items()
+        }
+
+
+ACCESS_CACHE_STATS = AccessCacheStats()
+
+
+def get_access_cache_stats():
+    """
+    Returns the hits, misses and hit rate of each access policy cache since the process
+    started, e.g. {"policy": {"hits": 10, "misses": 1, "hit_rate": 0.909}, ...}
+    """
+    return ACCESS_CACHE_STATS.as_dict()
+
+
+metrics.register_cache_stats(get_access_cache_stats)
+
+
+def request_memoize(request, name, key, func):
+    """
+    Returns `func()` memoized for the lifetime of `request`.
+
+    A single request evaluates several policy conditions and queryset scopes which
+    look up the same distributions, permissions and user roles, the results are kept
+    on the request object so they are computed once and dropped with the request.
+    Without a request (e.g. conditions called outside of a view) nothing is cached.
+    """
+    if request is None:
+        return func()
+
+    cache = request.__dict__.setdefault("_galaxy_access_cache", {})
+    key = (name, *key)
+    if key in cache:
+        ACCESS_CACHE_STATS.record(name, hit=True)
+        return cache[key]
+
+    ACCESS_CACHE_STATS.record(name, hit=False)
+    cache[key] = value = func()
+    return value
+
+
+def user_has_perm(request, user, permission, obj=None):
+    """`user.has_perm(permission, obj)` memoized for the lifetime of `request`."""
+    if obj is None:
+        key = (user.pk, permission, None, None)
+    else:
+        key = (user.pk, permission, obj._meta.label, obj.pk)
+    return request_memoize(
+        request, "has_perm", key, lambda: user.has_perm(permission, obj)
+    )
+
+
+def get_distribution_repository(request, base_path):
+    """
+    Returns the cast repository of the ansible distribution at `base_path`, memoized for
+    the lifetime of `request`. Raises `AnsibleDistribution.DoesNotExist`.
+    """
+    def lookup():
+        distro = ansible_models.AnsibleDistribution.objects.select_related(
+            "repository"
+        ).get(base_path=base_path)
+        return distro.repository.cast()
+
+    return request_memoize(request, "distribution", (base_path,), lookup)
 
 
 class MockPulpAccessPolicy:
@@ -101,6 +195,10 @@ class GalaxyStatements:
 
 GALAXY_STATEMENTS = GalaxyStatements()
 
+# Resolved access policies by view, the statements only change with a new release or
+# with the deployment mode, which is part of the key.
+_RESOLVED_POLICIES = {}
+
 
 class AccessPolicyBase(AccessPolicyFromDB):
     """
@@ -124,6 +222,41 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
     @classmethod
     def get_access_policy(cls, view):
+        key = cls._get_access_policy_cache_key(view)
+        if key is None:
+            return cls._resolve_access_policy(view)
+
+        policy = _RESOLVED_POLICIES.get(key)
+        ACCESS_CACHE_STATS.record("policy", hit=policy is not None)
+        if policy is None:
+            policy = _RESOLVED_POLICIES[key] = cls._resolve_access_policy(view)
+        return policy
+
+    @classmethod
+    def _get_access_policy_cache_key(cls, view):
+        """
+        Returns the key under which the policy resolved for `view` is cached, or None
+        when it should not be cached.
+        """
+        mode = settings.GALAXY_DEPLOYMENT_MODE
+        if cls.NAME:
+            return (cls.NAME, mode)
+
+        try:
+            viewname = get_view_urlpattern(view)
+        except AttributeError:
+            viewname = None
+        if viewname in PULP_VIEWSETS:
+            return (cls, viewname, mode)
+
+        # only viewsets declaring their own policy, ad hoc views (e.g. the FakeView of
+        # has_distro_permission) fall back to the admin policy and aren't kept around.
+        if hasattr(view, "DEFAULT_ACCESS_POLICY"):
+            return (cls, type(view), mode)
+        return None
+
+    @classmethod
+    def _resolve_access_policy(cls, view):
         statements = GALAXY_STATEMENTS
 
         # If this is a galaxy access policy, load from the statement file
@@ -163,11 +296,10 @@ class AccessPolicyBase(AccessPolicyFromDB):
         is_generic should be set to True when repository is a FK to the generic Repository
         object and False when it's a FK to AnsibleRepository
         """
-        user = view.request.user
-        if user.has_perm("ansible.view_ansiblerepository"):
+        request = view.request
+        user = request.user
+        if user_has_perm(request, user, "ansible.view_ansiblerepository"):
             return qs
-        view_perm = Permission.objects.get(
-            content_type__app_label="ansible", codename="view_ansiblerepository")
 
         if field_name:
             field_name = field_name + "__"
@@ -180,31 +312,15 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if user.is_anonymous:
             qs = qs.filter(private_q)
         else:
-            user_roles = UserRole.objects.filter(user=user, role__permissions=view_perm).filter(
-                object_id=OuterRef("repo_pk_str"))
-
-            group_roles = GroupRole.objects.filter(
-                group__in=user.groups.all(),
-                role__permissions=view_perm
-            ).filter(
-                object_id=OuterRef("repo_pk_str"))
-
-            qs = qs.annotate(
-                repo_pk_str=Cast(f"{field_name}pk", output_field=CharField())
-            ).annotate(
-                has_user_role=Exists(user_roles)
-            ).annotate(
-                has_group_roles=Exists(group_roles)
-            ).filter(
+            qs = qs.filter(
                 private_q
-                | Q(has_user_role=True)
-                | Q(has_group_roles=True)
+                | Q(**{f"{field_name}pk__in": visible_repository_ids(user)})
             )
 
         return qs
 
     def scope_synclist_distributions(self, view, qs):
-        if not view.request.user.has_perm("galaxy.view_synclist"):
+        if not user_has_perm(view.request, view.request.user, "galaxy.view_synclist"):
             my_synclists = get_objects_for_user(
                 view.request.user,
                 "galaxy.view_synclist",
@@ -249,13 +365,11 @@ class AccessPolicyBase(AccessPolicyFromDB):
         )
 
         if path:
-            distro = ansible_models.AnsibleDistribution.objects.get(base_path=path)
-            repo = distro.repository
-            repo = repo.cast()
+            repo = get_distribution_repository(request, path)
 
             if repo.private:
                 perm = "ansible.view_ansiblerepository"
-                return request.user.has_perm(perm) or request.user.has_perm(perm, repo)
+                return has_model_or_object_permissions(request.user, perm, repo, request=request)
 
         return True
 
@@ -264,7 +378,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
         # first check for global permissions ...
         for delete_permission in ["galaxy.change_namespace", "ansible.delete_collection"]:
-            if user.has_perm(delete_permission):
+            if user_has_perm(request, user, delete_permission):
                 return True
 
         # could be a collection or could be a collectionversion ...
@@ -302,7 +416,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if is_github_social_auth:
             return True
 
-        if request.user.has_perm('galaxy.view_user'):  # noqa: SIM103
+        if user_has_perm(request, request.user, 'galaxy.view_user'):  # noqa: SIM103
             return True
 
         return False
@@ -314,7 +428,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
 
         View actions are only enforced when the repo is private.
         """
-        if request.user.has_perm(permission):
+        if user_has_perm(request, request.user, permission):
             return True
 
         try:
@@ -335,7 +449,7 @@ class AccessPolicyBase(AccessPolicyFromDB):
         if permission == "ansible.view_ansiblerepository" and not repo.private:
             return True
 
-        return request.user.has_perm(permission, repo)
+        return user_has_perm(request, request.user, permission, repo)
 
     def can_copy_or_move(self, request, view, action, permission):
         """
@@ -1,13 +1,17 @@
 from django.utils.translation import gettext_lazy as _
-from django.contrib.auth import get_user_model
+from django.contrib.auth import get_backends, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.contenttypes.models import ContentType
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from pulpcore.plugin.models.role import Role
+from pulpcore.backends import ObjectRolePermissionBackend
+from pulpcore.plugin.models.role import GroupRole, Role, UserRole
 
 from pulpcore.plugin.util import get_perms_for_model
 
+from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.models import auth as auth_models
 
 
@@ -120,22 +124,96 @@ class UserPermissionField(serializers.Field):
         return internal
 
 
+def _object_permissions_from_roles_only():
+    """
+    Whether object permissions can only come from pulp's object roles, i.e. every
+    configured backend is either ModelBackend (no object permissions), the pulp
+    ObjectRolePermissionBackend or a backend without permissions.
+    """
+    return all(
+        isinstance(backend, ModelBackend | ObjectRolePermissionBackend)
+        or not hasattr(backend, "has_perm")
+        for backend in get_backends()
+    )
+
+
+class MyPermissionsEvaluator:
+    """
+    Answers MyPermissionsField for all the objects of a model a request serializes.
+
+    The global permissions of the user are checked once and the object roles of the
+    user and of their groups granting one of the model permissions are loaded in two
+    queries, the permissions of each object are then resolved in memory like
+    ObjectRolePermissionBackend does. With other permission backends configured the
+    object permissions fall back to `user.has_perm(codename, obj)`.
+    """
+
+    def __init__(self, request, model):
+        self.user = request.user
+        permissions = get_perms_for_model(model).select_related("content_type")
+        self.codenames = [
+            "{}.{}".format(perm.content_type.app_label, perm.codename) for perm in permissions
+        ]
+        self.global_permissions = {
+            codename for codename in self.codenames
+            if access_policy.user_has_perm(request, self.user, codename)
+        }
+
+        self.object_permissions = None
+        if _object_permissions_from_roles_only():
+            self.object_permissions = self._load_object_permissions(model, permissions)
+
+    def _load_object_permissions(self, model, permissions):
+        object_permissions = {}
+        if not self.user.is_authenticated:
+            return object_permissions
+
+        fields = (
+            "object_id",
+            "role__permissions__content_type__app_label",
+            "role__permissions__codename",
+        )
+        user_roles = UserRole.objects.filter(user=self.user)
+        group_roles = GroupRole.objects.filter(group__in=self.user.groups.all())
+        # object ids are only unique within a model, as in ObjectRolePermissionBackend
+        content_type = ContentType.objects.get_for_model(model)
+        for roles in (user_roles, group_roles):
+            rows = roles.filter(
+                content_type=content_type,
+                object_id__isnull=False,
+                role__permissions__in=permissions,
+            ).values_list(*fields)
+            for object_id, app_label, codename in rows:
+                object_permissions.setdefault(object_id, set()).add(f"{app_label}.{codename}")
+        return object_permissions
+
+    def get_permissions(self, obj):
+        if self.object_permissions is None:
+            if obj._meta.proxy:
+                obj = obj._meta.concrete_model.objects.get(pk=obj.pk)
+            return [
+                codename for codename in self.codenames
+                if codename in self.global_permissions or self.user.has_perm(codename, obj)
+            ]
+
+        granted = self.object_permissions.get(str(obj.pk), ())
+        return [
+            codename for codename in self.codenames
+            if codename in self.global_permissions or codename in granted
+        ]
+
+
 class MyPermissionsField(serializers.Serializer):
     def to_representation(self, original_obj):
         request = self.context.get('request', None)
         if request is None:
             return []
-        user = request.user
-
-        if original_obj._meta.proxy:
-            obj = original_obj._meta.concrete_model.objects.get(pk=original_obj.pk)
-        else:
-            obj = original_obj
-
-        my_perms = []
-        for perm in get_perms_for_model(type(obj)).all():
-            codename = "{}.{}".format(perm.content_type.app_label, perm.codename)
-            if user.has_perm(codename) or user.has_perm(codename, obj):
-                my_perms.append(codename)
 
-        return my_perms
+        model = original_obj._meta.concrete_model
+        evaluator = access_policy.request_memoize(
+            request,
+            "my_permissions",
+            (request.user.pk, model._meta.label),
+            lambda: MyPermissionsEvaluator(request, model),
+        )
+        return evaluator.get_permissions(original_obj)
@@ -0,0 +1,120 @@
+"""access_control/visibility.py
+
+Materialized visibility of private ansible repositories.
+
+A user can view a private repository when the user, or one of the user's
+groups, holds an object role on it with the `ansible.view_ansiblerepository`
+permission. Deriving that for every row of a repository or distribution
+listing means matching the pulp role tables on `object_id` (a text column)
+against the repository primary key, which can't use an index.
+
+Instead `RepositoryVisibility` keeps one row per (user, repository) and
+(group, repository) pair. The rows are recomputed from the role tables by
+the signal handlers whenever a `UserRole` or `GroupRole` is saved or
+deleted, or the permissions of a `Role` change, so scoping is a plain
+`repository_id IN (...)` against an indexed table.
+
+    django-admin rebuild-repository-visibility
+
+recomputes every row.
+"""
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Q
+from pulpcore.plugin.models.role import GroupRole, UserRole
+
+from galaxy_ng.app.models import RepositoryVisibility
+
+logger = logging.getLogger(__name__)
+
+# Pairs of (owner, repository) granted `ansible.view_ansiblerepository` by an
+# object role. {table} is core_userrole or core_grouprole, {column} user_id or group_id.
+INSERT_VISIBILITY_SQL = """
+INSERT INTO galaxy_repositoryvisibility (repository_id, {column})
+SELECT DISTINCT r.repository_ptr_id, a.{column}
+FROM {table} a
+INNER JOIN core_role_permissions rp ON rp.role_id = a.role_id
+INNER JOIN auth_permission p ON p.id = rp.permission_id
+INNER JOIN django_content_type ct ON ct.id = p.content_type_id
+INNER JOIN ansible_ansiblerepository r ON r.repository_ptr_id::text = a.object_id
+WHERE ct.app_label = 'ansible' AND p.codename = 'view_ansiblerepository'
+{filters}
+ON CONFLICT DO NOTHING
+"""
+
+DELETE_VISIBILITY_SQL = """
+DELETE FROM galaxy_repositoryvisibility
+WHERE {column} IS NOT NULL
+{filters}
+"""
+
+OWNERS = {
+    "user": ("core_userrole", "user_id"),
+    "group": ("core_grouprole", "group_id"),
+}
+
+
+def _refresh(kind, owner_ids=None, object_ids=None):
+    table, column = OWNERS[kind]
+
+    insert_filters, delete_filters, params = [], [], []
+    if owner_ids is not None:
+        insert_filters.append(f"AND a.{column} = ANY(%s)")
+        delete_filters.append(f"AND {column} = ANY(%s)")
+        params.append(list(owner_ids))
+    if object_ids is not None:
+        insert_filters.append("AND a.object_id = ANY(%s)")
+        delete_filters.append("AND repository_id::text = ANY(%s)")
+        params.append([str(object_id) for object_id in object_ids])
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            DELETE_VISIBILITY_SQL.format(column=column, filters="\n".join(delete_filters)),
+            params,
+        )
+        cursor.execute(
+            INSERT_VISIBILITY_SQL.format(
+                table=table, column=column, filters="\n".join(insert_filters)
+            ),
+            params,
+        )
+        return cursor.rowcount
+
+
+def refresh_user_visibility(user_ids=None, object_ids=None):
+    """Recompute the visibility rows of the given users and/or repositories."""
+    return _refresh("user", owner_ids=user_ids, object_ids=object_ids)
+
+
+def refresh_group_visibility(group_ids=None, object_ids=None):
+    """Recompute the visibility rows of the given groups and/or repositories."""
+    return _refresh("group", owner_ids=group_ids, object_ids=object_ids)
+
+
+def refresh_role_visibility(role_ids):
+    """Recompute the visibility rows of the objects the given roles are assigned on."""
+    object_ids = set()
+    for model in (UserRole, GroupRole):
+        object_ids.update(
+            model.objects.filter(role_id__in=role_ids, object_id__isnull=False)
+            .values_list("object_id", flat=True)
+        )
+    if object_ids:
+        refresh_user_visibility(object_ids=object_ids)
+        refresh_group_visibility(object_ids=object_ids)
+
+
+def rebuild_repository_visibility():
+    """Recompute every visibility row, returns the number of user and group rows."""
+    users = refresh_user_visibility()
+    groups = refresh_group_visibility()
+    logger.info("Rebuilt repository visibility: %s user and %s group grants", users, groups)
+    return users, groups
+
+
+def visible_repository_ids(user):
+    """Ids of the private repositories the user can view through object roles."""
+    return RepositoryVisibility.objects.filter(
+        Q(user=user) | Q(group__in=user.groups.all())
+    ).values("repository_id")
@@ -0,0 +1,156 @@
+import base64
+from datetime import datetime
+import json
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_QUERY_PARAM = "cursor"
+PAGINATION_QUERY_PARAM = "pagination"
+PAGINATION_CURSOR = "cursor"
+
+
+def keyset_pagination_requested(request):
+    """Cursor pagination is opt-in with `?pagination=cursor` or a `?cursor=` token."""
+    return (
+        CURSOR_QUERY_PARAM in request.query_params
+        or request.query_params.get(PAGINATION_QUERY_PARAM) == PAGINATION_CURSOR
+    )
+
+
+def encode_cursor(values):
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    data = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (TypeError, ValueError, UnicodeError):
+        raise NotFound(_("Invalid cursor"))
+    if not isinstance(values, list):
+        raise NotFound(_("Invalid cursor"))
+    return values
+
+
+class KeysetPaginationMixin:
+    """
+    Adds an opt-in keyset (a.k.a cursor or seek) mode to a pagination class.
+
+    When the request has `?pagination=cursor` or a `?cursor=` token, instead of
+    counting the whole queryset and skipping `offset` rows, the page is selected
+    with a `WHERE` clause built from the ordering columns of the last row of the
+    previous page (plus the primary key as a tie breaker), so walking deep pages
+    costs the same as the first one. The `next` link carries an opaque cursor
+    token, there is no `count`, `previous` or `last`.
+
+    Without those query params the regular pagination class is used unchanged.
+
+    Usage:
+
+    class MyPagination(KeysetPaginationMixin, PageNumberPagination):
+        pass
+
+    The ordering is taken from the queryset so it must be ordered by plain
+    field or annotation names, e.g. `qs.order_by("-download_count", "name")`.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = keyset_pagination_requested(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        page_size = self.get_keyset_page_size(request)
+        ordering = self.get_keyset_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+
+        cursor = request.query_params.get(CURSOR_QUERY_PARAM)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(ordering):
+                raise NotFound(_("Invalid cursor"))
+            queryset = queryset.filter(self.get_keyset_filter(ordering, values))
+
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        results = results[:page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = results[-1]
+            self.next_cursor = encode_cursor(
+                [self._get_value(last, field.lstrip("-")) for field in ordering]
+            )
+        return results
+
+    def get_keyset_page_size(self, request):
+        if hasattr(self, "get_page_size"):
+            return self.get_page_size(request)
+        return self.get_limit(request)
+
+    def get_keyset_ordering(self, queryset):
+        ordering = [item for item in queryset.query.order_by if isinstance(item, str)]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering)
+        pk_fields = ("pk", queryset.model._meta.pk.attname)
+        if not any(item.lstrip("-") in pk_fields for item in ordering):
+            ordering.append("pk")
+        return ordering
+
+    @staticmethod
+    def get_keyset_filter(ordering, values):
+        """Builds the `WHERE` clause selecting the rows after the cursor.
+
+        (a > va) OR (a = va AND b > vb) OR (a = va AND b = vb AND pk > vpk) ...
+
+        NULLs are sorted last on ASC and first on DESC as PostgreSQL does.
+        """
+        keyset = Q(pk__in=[])
+        equal = Q()
+        for item, value in zip(ordering, values, strict=True):
+            field = item.lstrip("-")
+            if item.startswith("-"):
+                after = Q(**{f"{field}__isnull": False}) if value is None else \
+                    Q(**{f"{field}__lt": value})
+            else:
+                after = Q(pk__in=[]) if value is None else \
+                    Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+            keyset |= equal & after
+            equal &= Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value})
+        return keyset
+
+    def get_next_link(self):
+        if not getattr(self, "keyset", False):
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+        url = self.get_keyset_base_url()
+        url = remove_query_param(url, PAGINATION_QUERY_PARAM)
+        return replace_query_param(url, CURSOR_QUERY_PARAM, self.next_cursor)
+
+    def get_keyset_base_url(self):
+        return self.request.build_absolute_uri()
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "keyset", False):
+            return super().get_paginated_response(data)
+        return self.get_keyset_paginated_response(data)
+
+    def get_keyset_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": None,
+            "results": data,
+        })
+
+    @staticmethod
+    def _get_value(row, field):
+        if isinstance(row, dict):
+            # values() querysets have the primary key as "id"
+            return row["id"] if field == "pk" and "pk" not in row else row[field]
+        return getattr(row, field)
@@ -1,16 +1,21 @@
 import logging
 
+from django.db.models import Q
 from pulp_ansible.app.models import (
     AnsibleDistribution,
     CollectionVersion,
+    CollectionVersionSignature,
 )
+from pulpcore.plugin.models import RepositoryContent
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-import semantic_version
 
 from .base import Serializer
-from galaxy_ng.app.api.v3.serializers.namespace import NamespaceSummarySerializer
-from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.api.v3.serializers.namespace import (
+    NamespaceSummarySerializer,
+    get_namespace_summary,
+)
+from galaxy_ng.app.utils.semver import SemverKey
 
 log = logging.getLogger(__name__)
 
@@ -43,33 +48,102 @@ class ContentSerializer(Serializer):
     description = serializers.CharField()
 
 
+def get_request_distro(request):
+    """Get current distribution from request information."""
+    try:
+        # on URLS like _ui/v1/repo/rh-certified/namespace/name and
+        # /api/automation-hub/_ui/v1/repo/community/
+        # the distro_base_path can be parsed from the URL
+        path = request.parser_context['kwargs']['distro_base_path']
+    except KeyError:
+        # this same serializer is used on /_ui/v1/collection-versions/
+        # which can have the distro_base_path passed in as a query param
+        # on the `?repository=` field
+        path = request.query_params.get('repository')
+    except AttributeError:
+        # if there is no request, we are probably in a unit test
+        return None
+
+    if not path:
+        # A bare /_ui/v1/collection-versions/ is not scoped to a single distro
+        return None
+
+    try:
+        return AnsibleDistribution.objects.get(base_path=path)
+    except AnsibleDistribution.DoesNotExist:
+        # `?repository=` filters the list down to nothing, there are no
+        # signatures to look up
+        return None
+
+
+def serialize_signature(signature):
+    return {
+        "signature": signature.data,
+        "pubkey_fingerprint": signature.pubkey_fingerprint,
+        "signing_service": getattr(signature.signing_service, "name", None),
+    }
+
+
+def get_collection_version_context(collection_versions, distro, repository_list=False):
+    """
+    Resolves the data of a page of CollectionVersions the serializers would otherwise
+    query row by row, to be merged in their context:
+
+    - "distro": the distribution (or None) the signatures are looked up in
+    - "signatures": {pk: [signature data]}
+    - "sign_states": {pk: "signed" | "unsigned"}
+    - "repository_lists": {pk: [names]} of the repositories whose latest version has
+      the collection version, when `repository_list` is set
+    """
+    pks = [cv.pk for cv in collection_versions]
+
+    signatures = CollectionVersionSignature.objects.filter(signed_collection__in=pks)
+    if distro:
+        signatures = signatures.filter(repositories=distro.repository).distinct()
+
+    signatures_by_version = {pk: [] for pk in pks}
+    for signature in signatures.select_related("signing_service"):
+        signatures_by_version[signature.signed_collection_id].append(
+            serialize_signature(signature)
+        )
+
+    context = {
+        "distro": distro,
+        "signatures": signatures_by_version,
+        "sign_states": {
+            pk: "signed" if signatures else "unsigned"
+            for pk, signatures in signatures_by_version.items()
+        },
+    }
+
+    if repository_list:
+        # the content of the latest (complete) version of a repository
+        in_latest_version = RepositoryContent.objects.filter(
+            Q(version_removed__isnull=True) | Q(version_removed__complete=False),
+            content__in=pks,
+            version_added__complete=True,
+        ).exclude(repository__name__endswith='-synclist')
+
+        repository_lists = {pk: [] for pk in pks}
+        for pk, name in (
+            in_latest_version.values_list("content_id", "repository__name")
+            .distinct()
+            .order_by("repository__name")
+        ):
+            repository_lists[pk].append(name)
+        context["repository_lists"] = repository_lists
+
+    return context
+
+
 class RequestDistroMixin:
     """This provides _get_current_distro() to all serializers that inherit from it."""
 
     def _get_current_distro(self):
-        """Get current distribution from request information."""
-        request = self.context.get("request")
-        try:
-            # on URLS like _ui/v1/repo/rh-certified/namespace/name and
-            # /api/automation-hub/_ui/v1/repo/community/
-            # the distro_base_path can be parsed from the URL
-            path = request.parser_context['kwargs']['distro_base_path']
-        except KeyError:
-            # this same serializer is used on /_ui/v1/collection-versions/
-            # which can have the distro_base_path passed in as a query param
-            # on the `?repository=` field
-            path = request.query_params.get('repository')
-        except AttributeError:
-            # if there is no request, we are probably in a unit test
-            return None
-
-        if not path:
-            # A bare /_ui/v1/collection-versions/ is not scoped to a single distro
-            return None
-
-        distro = AnsibleDistribution.objects.get(base_path=path)
-
-        return distro
+        """Get current distribution from request information, once per context."""
+        if "distro" not in self.context:
+            self.context["distro"] = get_request_distro(self.context.get("request"))
+        return self.context["distro"]
 
 
 class CollectionMetadataSerializer(RequestDistroMixin, Serializer):
@@ -91,20 +165,17 @@ class CollectionMetadataSerializer(RequestDistroMixin, Serializer):
     @extend_schema_field(serializers.ListField(child=serializers.DictField()))
     def get_signatures(self, obj):
         """Returns signature info for each signature."""
+        signatures_by_version = self.context.get("signatures")
+        if signatures_by_version is not None and obj.pk in signatures_by_version:
+            return signatures_by_version[obj.pk]
+
         distro = self._get_current_distro()
         if not distro:
             signatures = obj.signatures.all()
         else:
             signatures = obj.signatures.filter(repositories=distro.repository)
 
-        data = []
-        for signature in signatures:
-            sig = {}
-            sig["signature"] = signature.data
-            sig["pubkey_fingerprint"] = signature.pubkey_fingerprint
-            sig["signing_service"] = getattr(signature.signing_service, "name", None)
-            data.append(sig)
-        return data
+        return [serialize_signature(signature) for signature in signatures]
 
     @extend_schema_field(serializers.ListField)
     def get_tags(self, collection_version):
@@ -120,6 +191,10 @@ class CollectionVersionSignStateMixin(RequestDistroMixin):
     @extend_schema_field(serializers.CharField())
     def get_sign_state(self, obj):
         """Returns the state of the signature."""
+        sign_states = self.context.get("sign_states")
+        if sign_states is not None and obj.pk in sign_states:
+            return sign_states[obj.pk]
+
         distro = self._get_current_distro()
         if not distro:
             signature_count = obj.signatures.count()
@@ -151,6 +226,9 @@ class CollectionVersionSerializer(CollectionVersionBaseSerializer):
     @extend_schema_field(serializers.ListField)
     def get_repository_list(self, collection_version):
         """Repository list where content is in the latest RepositoryVersion."""
+        repository_lists = self.context.get("repository_lists")
+        if repository_lists is not None and collection_version.pk in repository_lists:
+            return repository_lists[collection_version.pk]
 
         # get all repos where content exists in a RepositoryVersion
         content = collection_version.content_ptr
@@ -188,8 +266,7 @@ class _CollectionSerializer(Serializer):
 
     @extend_schema_field(NamespaceSummarySerializer)
     def get_namespace(self, obj):
-        namespace = Namespace.objects.get(name=obj.namespace)
-        return NamespaceSummarySerializer(namespace, context=self.context).data
+        return get_namespace_summary(obj.namespace, self.context)
 
 
 class CollectionListSerializer(_CollectionSerializer):
@@ -216,11 +293,9 @@ class CollectionDetailSerializer(_CollectionSerializer):
         path = self.context['request'].parser_context['kwargs']['distro_base_path']
         distro = AnsibleDistribution.objects.get(base_path=path)
         repository_version = distro.repository.latest_version()
-        versions_in_repo = CollectionVersion.objects.filter(
+        versions_in_repo = list(CollectionVersion.objects.filter(
             pk__in=repository_version.content,
             collection=obj.collection,
-        ).only("content_ptr_id", "version")
-        versions_in_repo = sorted(
-            versions_in_repo, key=lambda obj: semantic_version.Version(obj.version), reverse=True
-        )
-        return CollectionVersionSummarySerializer(versions_in_repo, many=True).data
+        ).only("content_ptr_id", "version", "pulp_created").order_by(SemverKey().desc()))
+        context = get_collection_version_context(versions_in_repo, distro=None)
+        return CollectionVersionSummarySerializer(versions_in_repo, many=True, context=context).data
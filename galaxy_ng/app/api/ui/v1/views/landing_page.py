@@ -10,6 +10,7 @@ from galaxy_ng.app.api import base as api_base
 class LandingPageView(api_base.APIView):
     permission_classes = [access_policy.LandingPageAccessPolicy]
     action = "retrieve"
+    response_cache_scopes = ("collections", "namespaces")
 
     def get(self, request, *args, **kwargs):
         golden_name = settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
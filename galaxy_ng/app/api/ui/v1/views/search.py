@@ -1,33 +1,22 @@
-from django.contrib.postgres.aggregates import JSONBAgg
 from django.contrib.postgres.search import SearchQuery
 from django.db.models import (
-    Exists,
     F,
     FloatField,
     Func,
-    JSONField,
-    OuterRef,
     Q,
-    Subquery,
     Value,
 )
-from django.db.models.fields.json import KT
-from django.db.models.functions import Coalesce
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from pulp_ansible.app.models import (
-    AnsibleCollectionDeprecated,
-    CollectionDownloadCount,
-    CollectionVersion,
-)
 from rest_framework import mixins
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
 from galaxy_ng.app.api import base as api_base
+from galaxy_ng.app.api.pagination import KeysetPaginationMixin
 from galaxy_ng.app.api.ui.v1.serializers import SearchResultsSerializer
-from galaxy_ng.app.api.v1.models import LegacyRole
-from galaxy_ng.app.models.namespace import Namespace
+from galaxy_ng.app.models import SearchIndex
 
 FILTER_PARAMS = [
     "keywords",
@@ -44,6 +33,7 @@ SORTABLE_FIELDS = ["name", "namespace_name", "download_count", "last_updated", "
 SORTABLE_FIELDS += [f"-{item}" for item in SORTABLE_FIELDS]
 DEFAULT_SEARCH_TYPE = "websearch"  # websearch,sql
 QUERYSET_VALUES = [
+    "id",
     "namespace_avatar",
     "content_list",
     "deprecated",
@@ -62,11 +52,27 @@ QUERYSET_VALUES = [
 RANK_NORMALIZATION = 32
 
 
+class SearchPagination(KeysetPaginationMixin, api_base.GALAXY_PAGINATION_CLASS):
+    """Limit/offset pagination, or keyset pagination with `?pagination=cursor`."""
+
+    def get_keyset_base_url(self):
+        return self.request.get_full_path()
+
+    def get_keyset_paginated_response(self, data):
+        return Response({
+            "meta": {},
+            "links": {"next": self.get_next_link()},
+            "data": data,
+        })
+
+
 class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
     """Search collections and roles"""
 
     permission_classes = [AllowAny]
     serializer_class = SearchResultsSerializer
+    pagination_class = SearchPagination
+    response_cache_scopes = ("collections", "roles", "namespaces")
 
     @extend_schema(
         parameters=[
@@ -85,6 +91,8 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
             OpenApiParameter("tags", many=True),
             OpenApiParameter("platform"),
             OpenApiParameter("order_by", enum=SORTABLE_FIELDS),
+            OpenApiParameter("pagination", enum=["cursor"]),
+            OpenApiParameter("cursor", description="Opaque token from links:next"),
         ]
     )
     def list(self, *args, **kwargs):
@@ -121,6 +129,11 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
 
         Pagination is based on `limit` and `offset` parameters.
 
+        Crawlers walking the whole result set should pass `pagination=cursor`
+        instead, pages are then selected by the sorting columns of the last
+        row of the previous page, the `count` is not computed and only
+        `links:next` is returned, carrying an opaque `cursor` parameter.
+
         ## Results
 
         Results are embedded in the pagination serializer including
@@ -148,7 +161,7 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         return super().list(*args, **kwargs)
 
     def get_queryset(self):
-        """Returns the UNION ALL from CollectionVersion and LegacyRole"""
+        """Returns the SearchIndex queryset for collections and roles"""
         request = self.request
         self.filter_params = self.get_filter_params(request)
         self.sort = self.get_sorting_param(request)
@@ -156,7 +169,7 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         return qs
 
     def get_search_results(self, filter_params, sort):
-        """Validates filter_params, builds each queryset and then unionize and apply filters."""
+        """Validates filter_params, builds the queryset and then apply filters."""
         type_ = filter_params.get("type", "").lower()
         if type_ not in ("role", "collection", ""):
             raise ValidationError("'type' must be ['collection', 'role']")
@@ -169,16 +182,8 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
         if keywords and search_type == "websearch":
             query = SearchQuery(keywords, search_type="websearch")
 
-        collections = self.get_collection_queryset(query=query)
-        roles = self.get_role_queryset(query=query)
-        result_qs = self.filter_and_sort(
-            collections,
-            roles,
-            filter_params,
-            sort,
-            type_,
-            query=query
-        )
+        qs = self.get_index_queryset(query=query)
+        result_qs = self.filter_and_sort(qs, filter_params, sort, type_, query=query)
         return result_qs
 
     def get_filter_params(self, request):
@@ -202,16 +207,8 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
             raise ValidationError("'order_by=relevance' works only with 'search_type=websearch'")
         return sort
 
-    def get_collection_queryset(self, query=None):
-        """Build the CollectionVersion queryset from annotations."""
-        deprecated_qs = AnsibleCollectionDeprecated.objects.filter(
-            namespace=OuterRef("namespace"), name=OuterRef("name")
-        )
-        download_count_qs = CollectionDownloadCount.objects.filter(
-            namespace=OuterRef("namespace"), name=OuterRef("name")
-        )
-        namespace_qs = Namespace.objects.filter(name=OuterRef("namespace"))
-
+    def get_index_queryset(self, query=None):
+        """Build the SearchIndex queryset, the index is maintained by tasks.search."""
         relevance = Value(0)
         if query:
             relevance = Func(
@@ -222,61 +219,14 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
                 output_field=FloatField(),
             )
 
-        # The order of the fields here is important, must match the role_queryset
-        qs = (
-            CollectionVersion.objects.annotate(
-                namespace_name=F("namespace"),
-                description_text=F("description"),
-                platform_names=Value([], JSONField()),  # There is no platforms for collections
-                tag_names=JSONBAgg("tags__name"),
-                content_type=Value("collection"),
-                last_updated=F("timestamp_of_interest"),
-                deprecated=Exists(deprecated_qs),
-                download_count=Coalesce(
-                    Subquery(download_count_qs.values("download_count")[:1]), Value(0)
-                ),
-                latest_version=F("version"),
-                content_list=F("contents"),
-                namespace_avatar=Subquery(namespace_qs.values("_avatar_url")),
-                search=F("search_vector"),
-                relevance=relevance,
-            )
-            .values(*QUERYSET_VALUES)
-            .filter(is_highest=True)
-        )
-        return qs
-
-    def get_role_queryset(self, query=None):
-        """Build the LegacyRole queryset from annotations."""
-        relevance = Value(0)
-        if query:
-            relevance = Func(
-                F("search"),
-                query,
-                RANK_NORMALIZATION,
-                function="ts_rank",
-                output_field=FloatField(),
-            )
-        # The order of the fields here is important, must match the collection_queryset
-        qs = LegacyRole.objects.annotate(
-            namespace_name=F("namespace__name"),
-            description_text=KT("full_metadata__description"),
-            platform_names=F("full_metadata__platforms"),
-            tag_names=F("full_metadata__tags"),
-            content_type=Value("role"),
-            last_updated=F("created"),
-            deprecated=Value(False),  # there is no deprecation for roles
-            download_count=Coalesce(F("legacyroledownloadcount__count"), Value(0)),
-            latest_version=KT("full_metadata__versions__-1__version"),
-            content_list=Value([], JSONField()),  # There is no contents for roles
-            namespace_avatar=F("namespace__namespace___avatar_url"),  # v3 namespace._avatar_url
-            search=F("legacyrolesearchvector__search_vector"),
+        qs = SearchIndex.objects.annotate(
+            search=F("search_vector"),
             relevance=relevance,
         ).values(*QUERYSET_VALUES)
         return qs
 
-    def filter_and_sort(self, collections, roles, filter_params, sort, type_="", query=None):
-        """Apply filters individually on each queryset and then combine to sort."""
+    def filter_and_sort(self, qs, filter_params, sort, type_="", query=None):
+        """Apply filters on the index queryset and sort."""
         facets = {}
         if deprecated := filter_params.get("deprecated"):
             if deprecated.lower() not in ("true", "false"):
@@ -286,24 +236,23 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
             facets["name__iexact"] = name
         if namespace := filter_params.get("namespace"):
             facets["namespace_name__iexact"] = namespace
+        if type_.lower() in ("role", "collection"):
+            facets["content_type"] = type_.lower()
         if facets:
-            collections = collections.filter(**facets)
-            roles = roles.filter(**facets)
+            qs = qs.filter(**facets)
 
         if tags := filter_params.get("tags"):
             tag_filter = Q()
             for tag in tags:
                 tag_filter &= Q(tag_names__icontains=tag)
-            collections = collections.filter(tag_filter)
-            roles = roles.filter(tag_filter)
+            qs = qs.filter(tag_filter)
 
         if platform := filter_params.get("platform"):
-            roles = roles.filter(full_metadata__platforms__icontains=platform)
-            collections = collections.filter(platform_names=platform)  # never match but required
+            # There is no platforms for collections
+            qs = qs.filter(content_type="role", platform_names__icontains=platform)
 
         if query:
-            collections = collections.filter(search=query)
-            roles = roles.filter(search=query)
+            qs = qs.filter(search_vector=query)
         elif keywords := filter_params.get("keywords"):
             query = (
                 Q(name__icontains=keywords)
@@ -312,16 +261,9 @@ class SearchListView(api_base.GenericViewSet, mixins.ListModelMixin):
                 | Q(tag_names__icontains=keywords)
                 | Q(platform_names__icontains=keywords)
             )
-            collections = collections.filter(query)
-            roles = roles.filter(query)
-
-        if type_.lower() == "role":
-            qs = roles.order_by(*sort)
-        elif type_.lower() == "collection":
-            qs = collections.order_by(*sort)
-        else:
-            qs = collections.union(roles, all=True).order_by(*sort)
-        return qs
+            qs = qs.filter(query)
+
+        return qs.order_by(*sort)
 
 
 def test():
@@ -1,4 +1,4 @@
-from django.db.models import Exists, OuterRef, Q, Value, F, Func, CharField
+from django.db.models import Exists, OuterRef, Q, Value
 from django.db.models import When, Case
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
@@ -25,7 +25,12 @@ import semantic_version
 from galaxy_ng.app.api import base as api_base
 from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.api.ui.v1 import serializers, versioning
+from galaxy_ng.app.api.ui.v1.serializers.collection import (
+    get_collection_version_context,
+    get_request_distro,
+)
 from galaxy_ng.app.api.v3.serializers.sync import CollectionRemoteSerializer
+from galaxy_ng.app.utils.semver import SemverKey, filter_by_spec
 
 
 class CollectionByCollectionVersionFilter(pulp_ansible_viewsets.CollectionVersionFilter):
@@ -51,6 +56,15 @@ class CollectionByCollectionVersionFilter(pulp_ansible_viewsets.CollectionVersio
         return qs
 
 
+def highest_versions(queryset):
+    """A subquery of the pks of the highest CollectionVersion of each collection in `queryset`."""
+    return (
+        queryset.order_by("collection_id", SemverKey().desc(), "-pulp_created")
+        .distinct("collection_id")
+        .values("pk")
+    )
+
+
 class CollectionViewSet(
     api_base.GenericViewSet,
     mixins.ListModelMixin,
@@ -77,13 +91,11 @@ class CollectionViewSet(
             raise Http404(_("Distribution base path is required"))
 
         base_versions_query = CollectionVersion.objects.filter(pk__in=self._distro_content)
-
-        # Build a dict to be used by the annotation filter at the end of the method
-        collection_versions = {}
-        for collection_id, version in base_versions_query.values_list("collection_id", "version"):
-            value = collection_versions.get(str(collection_id))
-            if not value or semantic_version.Version(version) > semantic_version.Version(value):
-                collection_versions[str(collection_id)] = version
+        if "name" in self.kwargs:
+            # detail view, only look for the highest version of that collection
+            base_versions_query = base_versions_query.filter(
+                namespace=self.kwargs["namespace"], name=self.kwargs["name"]
+            )
 
         deprecated_query = AnsibleCollectionDeprecated.objects.filter(
             namespace=OuterRef("namespace"),
@@ -91,45 +103,32 @@ class CollectionViewSet(
             pk__in=self._distro_content,
         )
 
-        if not collection_versions.items():
-            return CollectionVersion.objects.none().annotate(
-                # AAH-122: annotated filterable fields must exist in all the returned querysets
-                #          in order for filters to work.
-                deprecated=Exists(deprecated_query),
-                sign_state=Value("unsigned"),
-            )
-
-        # The main queryset to be annotated
-        version_qs = base_versions_query.select_related("collection")
-
-        # AAH-1484 - replacing `Q(collection__id, version)` with this annotation
-        # This builds `61505561-f806-4ddd-8f53-c403f0ec04ed:3.2.9` for each row.
-        # this is done to be able to filter at the end of this method and
-        # return collections only once and only for its highest version.
-        version_identifier_expression = Func(
-            F("collection__pk"), Value(":"), F("version"),
-            function="concat",
-            output_field=CharField(),
-        )
+        # The highest version of every collection is picked by the database (DISTINCT ON
+        # collection over the semver columns), so only the requested page is loaded.
+        version_qs = CollectionVersion.objects.filter(
+            pk__in=highest_versions(base_versions_query)
+        ).select_related("collection").prefetch_related("tags")
 
+        # AAH-122: annotated filterable fields must exist in all the returned querysets
+        #          in order for filters to work.
         version_qs = version_qs.annotate(
             deprecated=Exists(deprecated_query),
-            version_identifier=version_identifier_expression,
             sign_state=Case(
                 When(signatures__pk__in=self._distro_content, then=Value("signed")),
                 default=Value("unsigned"),
             )
         )
 
-        # AAH-1484 - filtering by version_identifier
-        version_qs = version_qs.filter(
-            version_identifier__in=[
-                ":".join([pk, version]) for pk, version in collection_versions.items()
-            ]
-        )
-
         return version_qs
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        context = self.get_serializer_context()
+        context.update(get_collection_version_context(page, get_request_distro(request)))
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
     def get_object(self):
         """Return CollectionVersion object, latest or via query param 'version'."""
         version = self.request.query_params.get('version', None)
@@ -187,12 +186,7 @@ class CollectionVersionFilter(filterset.FilterSet):
 
     def version_range_filter(self, queryset, name, value):
         try:
-            s = semantic_version.SimpleSpec(value)
-            full_version_list = [
-                semantic_version.Version(v) for v in queryset.values_list('version', flat=True)]
-            version_list = [str(v) for v in s.filter(full_version_list)]
-
-            return queryset.filter(version__in=version_list)
+            return filter_by_spec(queryset, semantic_version.SimpleSpec(value))
         except ValueError:
             raise ValidationError(_('{} must be a valid semantic version range.').format(name))
 
@@ -201,7 +195,7 @@ class CollectionVersionFilter(filterset.FilterSet):
             ('pulp_created', 'pulp_created'),
             ('namespace', 'namespace'),
             ('name', 'collection'),
-            ('version', 'version'),
+            ('semver_key', 'version'),
         )
     )
 
@@ -217,7 +211,7 @@ class CollectionVersionFilter(filterset.FilterSet):
 class CollectionVersionViewSet(api_base.GenericViewSet):
     lookup_url_kwarg = 'version'
     lookup_value_regex = r'[0-9a-z_]+/[0-9a-z_]+/[0-9A-Za-z.+-]+'
-    queryset = CollectionVersion.objects.all()
+    queryset = CollectionVersion.objects.annotate(semver_key=SemverKey()).prefetch_related("tags")
     serializer_class = serializers.CollectionVersionSerializer
     filterset_class = CollectionVersionFilter
     versioning_class = versioning.UIVersioning
@@ -227,7 +221,11 @@ class CollectionVersionViewSet(api_base.GenericViewSet):
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(page, many=True)
+        context = self.get_serializer_context()
+        context.update(get_collection_version_context(
+            page, get_request_distro(request), repository_list=True
+        ))
+        serializer = self.get_serializer(page, many=True, context=context)
         return self.get_paginated_response(serializer.data)
 
     @extend_schema(summary=_("Retrieve collection version"),
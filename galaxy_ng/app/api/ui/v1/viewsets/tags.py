@@ -1,4 +1,5 @@
-from django.db.models import Count
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from rest_framework import mixins
 from django_filters import filters
 from django_filters.rest_framework import DjangoFilterBackend, filterset
@@ -11,12 +12,14 @@ from galaxy_ng.app.api.ui.v1 import versioning
 from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.api.v1.models import LegacyRoleTag
 from galaxy_ng.app.api.v1.serializers import LegacyRoleTagSerializer
+from galaxy_ng.app.tasks import tag_counts
 
 
 class TagsViewSet(api_base.GenericViewSet):
     serializer_class = TagSerializer
     permission_classes = [access_policy.TagsAccessPolicy]
     versioning_class = versioning.UIVersioning
+    response_cache_scopes = ("collections",)
 
     queryset = Tag.objects.all()
 
@@ -34,9 +37,10 @@ class CollectionTagFilterOrdering(filters.OrderingFilter):
         if value is not None and any(v in ["count", "-count"] for v in value):
             order = "-" if "-count" in value else ""
 
-            return qs.filter(
-                ansible_collectionversion__ansible_crossrepositorycollectionversionindex__is_highest=True  # noqa: E501
-            ).annotate(count=Count('ansible_collectionversion')).order_by(f"{order}count")
+            # sorted by the number of highest versions with the tag
+            return qs.filter(usage__highest_count__gt=0).annotate(
+                count=F("usage__highest_count")
+            ).order_by(f"{order}usage__highest_count")
 
         return super().filter(qs, value)
 
@@ -68,20 +72,22 @@ class CollectionsTagsViewSet(
     versioning_class = versioning.UIVersioning
     filter_backends = (DjangoFilterBackend,)
     filterset_class = CollectionTagFilter
+    response_cache_scopes = ("collections",)
 
     queryset = Tag.objects.all()
 
     def get_queryset(self):
+        tag_counts.refresh_stale_collection_tag_counts()
         qs = super().get_queryset()
-        return qs.annotate(count=Count("ansible_collectionversion"))
+        return qs.annotate(count=Coalesce(F("usage__count"), Value(0)))
 
 
 class RoleTagFilterOrdering(filters.OrderingFilter):
     def filter(self, qs, value):
         if value is not None and any(v in ["count", "-count"] for v in value):
-            order = "-" if "-count" in value else ""
-
-            return qs.annotate(count=Count('legacyrole')).order_by(f"{order}count")
+            if "-count" in value:
+                return qs.order_by(F("usage__count").desc(nulls_last=True))
+            return qs.order_by(F("usage__count").asc(nulls_first=True))
 
         return super().filter(qs, value)
 
@@ -115,7 +121,9 @@ class RolesTagsViewSet(
     versioning_class = versioning.UIVersioning
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RoleTagFilter
+    response_cache_scopes = ("roles",)
 
     def get_queryset(self):
+        tag_counts.refresh_stale_role_tag_counts()
         qs = super().get_queryset()
-        return qs.annotate(count=Count("legacyrole"))
+        return qs.annotate(count=Coalesce(F("usage__count"), Value(0)))
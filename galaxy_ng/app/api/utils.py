@@ -143,11 +143,17 @@ class RemoteSyncTaskField(serializers.Field):
         super().__init__(*args, **kwargs, read_only=True)
 
     def to_representation(self, remote):
-        # Query the database for sync tasks that reserve the given remote's PK
-        task = pulp_models.Task.objects.filter(
-            reserved_resources_record__icontains=remote.pk,
-            name__icontains="sync"
-        ).order_by('-pulp_last_updated').first()
+        # Lists can resolve the sync tasks of a page of remotes at once and
+        # pass them in the context as {remote pk: task or None}
+        sync_tasks = self.context.get("remote_sync_tasks", {})
+        if remote.pk in sync_tasks:
+            task = sync_tasks[remote.pk]
+        else:
+            # Query the database for sync tasks that reserve the given remote's PK
+            task = pulp_models.Task.objects.filter(
+                reserved_resources_record__icontains=remote.pk,
+                name__icontains="sync"
+            ).order_by('-pulp_last_updated').first()
 
         if not task:
             return {}
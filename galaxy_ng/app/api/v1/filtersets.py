@@ -81,6 +81,9 @@ class LegacyRoleFilterOrdering(filters.OrderingFilter):
         if value is not None and any(v in ["download_count", "-download_count"] for v in value):
             order = "-" if "-download_count" in value else ""
 
+            if "download_count" in qs.query.annotations:
+                return qs.order_by(f"{order}download_count")
+
             return qs.annotate(
                 download_count=Case(
                     When(legacyroledownloadcount=None, then=Value(0)),
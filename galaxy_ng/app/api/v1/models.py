@@ -187,6 +187,32 @@ class LegacyRoleDownloadCount(models.Model):
     count = models.IntegerField(default=0)
 
 
+class LegacyRoleTagCount(models.Model):
+    """
+    The number of roles a LegacyRoleTag is attached to, marked stale when
+    tags are attached or detached, see galaxy_ng.app.tasks.tag_counts.
+    """
+
+    tag = models.OneToOneField(
+        LegacyRoleTag,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="usage",
+    )
+
+    count = models.IntegerField(default=0)
+    stale = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=["count"], name="galaxy_roletagcount_count_idx"),
+            models.Index(
+                fields=["stale"], condition=models.Q(stale=True),
+                name="galaxy_roletagcount_stale_idx",
+            ),
+        )
+
+
 class LegacyRoleSearchVector(models.Model):
     role = models.OneToOneField(
         LegacyRole,
@@ -200,6 +226,31 @@ class LegacyRoleSearchVector(models.Model):
         indexes = (GinIndex(fields=["search_vector"]),)
 
 
+class LegacyRoleSyncCheckpoint(models.Model):
+    """
+    Progress of legacy_sync_from_upstream for one upstream and filter set.
+
+    next_page is the upstream page to resume from after an interrupted sync,
+    watermark is the newest upstream role `modified` timestamp seen by the
+    last completed sync and run_watermark the one seen so far by the current.
+    """
+
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    upstream = models.CharField(max_length=512, unique=True, editable=False)
+    next_page = models.IntegerField(null=True)
+    watermark = models.DateTimeField(null=True)
+    run_watermark = models.DateTimeField(null=True)
+    completed = models.DateTimeField(null=True)
+
+    def __repr__(self):
+        return f'<LegacyRoleSyncCheckpoint: {self.upstream}>'
+
+    def __str__(self):
+        return self.upstream
+
+
 class LegacyRoleImport(models.Model):
     role = models.ForeignKey(
         'LegacyRole',
@@ -331,14 +331,7 @@ class LegacyRoleSerializer(serializers.ModelSerializer):
                 versions = versions[:11]
             versions = [LegacyRoleVersionSummary(obj, x).to_json() for x in versions]
 
-        provider_ns = None
-        if obj.namespace and obj.namespace.namespace:
-            pulp_href = get_url(obj.namespace.namespace)
-            provider_ns = {
-                'id': obj.namespace.namespace.id,
-                'name': obj.namespace.namespace.name,
-                'pulp_href': pulp_href
-            }
+        provider_ns, avatar_url = self._get_namespace_summary(obj.namespace)
 
         # FIXME(jctanner): repository is a bit hacky atm
         repository = {}
@@ -349,11 +342,6 @@ class LegacyRoleSerializer(serializers.ModelSerializer):
         if not repository.get('original_name'):
             repository['original_name'] = obj.full_metadata.get('github_repo')
 
-        # prefer the provider avatar url
-        avatar_url = f'https://github.com/{obj.namespace.name}.png'
-        if obj.namespace and obj.namespace.namespace and obj.namespace.namespace.avatar_url:
-            avatar_url = obj.namespace.namespace.avatar_url
-
         return {
             'dependencies': dependencies,
             'namespace': {
@@ -367,7 +355,38 @@ class LegacyRoleSerializer(serializers.ModelSerializer):
             'versions': versions
         }
 
+    def _get_namespace_summary(self, legacy_namespace):
+        """
+        Return the provider namespace and avatar url of a legacy namespace.
+
+        A page of roles usually repeats the same few namespaces, so the
+        result is kept in the serializer context for the whole request.
+        """
+        cache = self.context.setdefault('legacy_namespace_summaries', {})
+        if legacy_namespace.id in cache:
+            return cache[legacy_namespace.id]
+
+        provider_ns = None
+        namespace = legacy_namespace.namespace
+        if namespace:
+            provider_ns = {
+                'id': namespace.id,
+                'name': namespace.name,
+                'pulp_href': get_url(namespace)
+            }
+
+        # prefer the provider avatar url
+        avatar_url = f'https://github.com/{legacy_namespace.name}.png'
+        if namespace and namespace.avatar_url:
+            avatar_url = namespace.avatar_url
+
+        cache[legacy_namespace.id] = (provider_ns, avatar_url)
+        return provider_ns, avatar_url
+
     def get_download_count(self, obj):
+        # annotated by LegacyRolesViewSet.get_queryset
+        if hasattr(obj, 'download_count'):
+            return obj.download_count
         counter = LegacyRoleDownloadCount.objects.filter(legacyrole=obj).first()
         if counter:
             return counter.count
@@ -7,8 +7,11 @@ import subprocess
 import traceback
 import tempfile
 import uuid
+from urllib.parse import parse_qs, urlparse
 
 from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from ansible.module_utils.compat.version import LooseVersion
 
@@ -16,7 +19,9 @@ from galaxy_importer.config import Config
 from galaxy_importer.legacy_role import import_legacy_role
 
 from galaxy_ng.app.models.auth import User
+from galaxy_ng.app.common import response_cache
 from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.tasks import search
 from galaxy_ng.app.utils.galaxy import upstream_role_iterator
 from galaxy_ng.app.utils.legacy import process_namespace
 from galaxy_ng.app.utils.namespaces import generate_v3_namespace_from_attributes
@@ -26,6 +31,7 @@ from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
 from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
 from galaxy_ng.app.api.v1.models import LegacyRoleImport
+from galaxy_ng.app.api.v1.models import LegacyRoleSyncCheckpoint
 from galaxy_ng.app.api.v1.utils import sort_versions
 from galaxy_ng.app.api.v1.utils import parse_version_tag
 
@@ -560,6 +566,140 @@ def legacy_role_import(
     return this_role
 
 
+def build_role_full_metadata(rdata, rversions):
+    """Map an upstream v1 role and its versions to LegacyRole.full_metadata."""
+    github_user = rdata.get('github_user')
+    github_repo = rdata['github_repo']
+    clone_url = f'https://github.com/{github_user}/{github_repo}'
+    sfields = rdata.get('summary_fields', {})
+
+    full_metadata = {
+        'upstream_id': rdata['id'],
+        'role_type': rdata.get('role_type', 'ANS'),
+        'imported': rdata.get('imported', datetime.datetime.now().isoformat()),  # noqa: DTZ005
+        'created': rdata.get('created', datetime.datetime.now().isoformat()),  # noqa: DTZ005
+        'modified': rdata.get('modified', datetime.datetime.now().isoformat()),  # noqa: DTZ005
+        'clone_url': clone_url,
+        'tags': sfields.get('tags', []),
+        'commit': rdata.get('commit'),
+        'commit_message': rdata.get('commit_message'),
+        'commit_url': rdata.get('commit_url'),
+        'github_user': github_user,
+        'github_repo': github_repo,
+        'github_branch': rdata['github_branch'],
+        # 'github_reference': github_reference,
+        'issue_tracker_url': rdata.get('issue_tracker_url', clone_url + '/issues'),
+        'dependencies': sfields.get('dependencies', []),
+        'versions': rversions[:],
+        'description': rdata.get('description'),
+        'license': rdata.get('license'),
+        'readme': rdata.get('readme'),
+        'readme_html': rdata.get('readme_html'),
+        'min_ansible_version': rdata.get('min_ansible_version'),
+        'company': rdata.get('company'),
+    }
+
+    full_metadata['versions'] = normalize_versions(full_metadata['versions'])
+    full_metadata['versions'] = sort_versions(full_metadata['versions'])
+    return full_metadata
+
+
+def _upstream_modified(rdata):
+    modified = rdata.get('modified')
+    return parse_datetime(modified) if isinstance(modified, str) else None
+
+
+def _role_is_unchanged(role, rdata, watermark):
+    """
+    A role is unchanged if the last completed sync already stored it and
+    the upstream modified timestamp has not moved since.
+    """
+    modified = _upstream_modified(rdata)
+    return (
+        watermark is not None
+        and modified is not None
+        and modified <= watermark
+        and role.full_metadata.get('modified') == rdata.get('modified')
+    )
+
+
+def sync_upstream_role_batch(batch, watermark=None):
+    """
+    Write a batch of upstream roles with a constant number of queries.
+
+    :param batch:
+        A list of (LegacyNamespace, role data, role versions) tuples.
+    :param watermark:
+        The watermark of the last completed sync, roles not modified
+        upstream since are left alone apart from their download count.
+
+    Returns the ids of the roles that were created or changed.
+    """
+
+    # the last occurrence of a role wins, as it did when syncing one by one
+    by_key = {}
+    for namespace, rdata, rversions in batch:
+        by_key[(namespace.pk, rdata.get('name'))] = (namespace, rdata, rversions)
+    if not by_key:
+        return []
+
+    existing = {
+        (role.namespace_id, role.name): role
+        for role in LegacyRole.objects.select_related('legacyroledownloadcount').filter(
+            namespace_id__in={key[0] for key in by_key},
+            name__in={key[1] for key in by_key},
+        )
+    }
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    counts = []
+    for key, (namespace, rdata, rversions) in by_key.items():
+        logger.info(f'POPULATE {rdata.get("github_user")}.{key[1]}')
+        role = existing.get(key)
+        if role is None:
+            logger.debug(f'SYNC create initial role for {key}')
+            role = LegacyRole(
+                namespace=namespace,
+                name=key[1],
+                full_metadata=build_role_full_metadata(rdata, rversions),
+            )
+            to_create.append(role)
+        elif not _role_is_unchanged(role, rdata, watermark):
+            full_metadata = build_role_full_metadata(rdata, rversions)
+            if dict(role.full_metadata) != full_metadata:
+                role.full_metadata = full_metadata
+                role.modified = now
+                to_update.append(role)
+
+        download_count = rdata.get('download_count', 0)
+        counter = getattr(role, 'legacyroledownloadcount', None) if role.pk else None
+        if counter is None or counter.count != download_count:
+            counts.append((role, download_count))
+
+    with transaction.atomic():
+        LegacyRole.objects.bulk_create(to_create)
+        LegacyRole.objects.bulk_update(to_update, ['full_metadata', 'modified'])
+        LegacyRoleDownloadCount.objects.bulk_create(
+            [LegacyRoleDownloadCount(legacyrole=role, count=count) for role, count in counts],
+            update_conflicts=True,
+            unique_fields=['legacyrole'],
+            update_fields=['count'],
+        )
+
+    changed = {role.pk for role in to_create + to_update}
+    changed.update(role.pk for role, _ in counts)
+    return sorted(changed)
+
+
+def _page_number(url):
+    if not url:
+        return None
+    page = parse_qs(urlparse(url).query).get('page')
+    return int(page[0]) if page else None
+
+
 def legacy_sync_from_upstream(
     baseurl=None,
     github_user=None,
@@ -567,6 +707,7 @@ def legacy_sync_from_upstream(
     role_version=None,
     limit=None,
     start_page=None,
+    resume=True,
 ):
     """
     Sync legacy roles from a remote v1 api.
@@ -579,12 +720,22 @@ def legacy_sync_from_upstream(
         Allow the client to reduce the set of synced roles by the role name.
     :param limit:
         Allow the client to reduce the total number of synced roles.
+    :param start_page:
+        Start from this upstream page instead of the checkpoint.
+    :param resume:
+        Resume an interrupted sync of the same upstream and filters from
+        the page after the last one that was written.
 
     This is conceptually similar to the pulp_ansible/app/tasks/roles.py:synchronize
     function but has more robust handling and better schema matching. Although
     not considered something we'd be normally running on a production hosted
     galaxy instance, it is necessary for mirroring the roles into that future
     system until it is ready to deprecate the old instance.
+
+    Roles are written one upstream page at a time with bulk queries and the
+    progress is recorded in a LegacyRoleSyncCheckpoint with the same
+    transaction. Roles whose upstream `modified` timestamp has not changed
+    since the last completed sync are not rewritten.
     """
 
     logger.debug(
@@ -592,15 +743,46 @@ def legacy_sync_from_upstream(
         + f' {baseurl} {github_user} {role_name} {role_version} {limit}'
     )
 
-    logger.debug('SYNC INDEX EXISTING NAMESPACES')
-    nsmap = {}
-
     # allow the user to specify how many roles to sync
     if limit is not None:
         limit = int(limit)
 
-    # index of all roles
-    rmap = {}
+    upstream = '|'.join([
+        baseurl or 'https://old-galaxy.ansible.com', github_user or '', role_name or ''
+    ])
+    checkpoint, _ = LegacyRoleSyncCheckpoint.objects.get_or_create(upstream=upstream)
+    if start_page is None and resume and checkpoint.next_page:
+        logger.info(f'SYNC resuming {upstream} from page {checkpoint.next_page}')
+        start_page = checkpoint.next_page
+    elif checkpoint.next_page is not None or checkpoint.run_watermark is not None:
+        # starting over, forget about the interrupted run
+        checkpoint.next_page = None
+        checkpoint.run_watermark = None
+        checkpoint.save()
+
+    logger.debug('SYNC INDEX EXISTING NAMESPACES')
+    nsmap = {}
+    batch = []
+
+    def write_batch():
+        modified = [_upstream_modified(rdata) for _, rdata, _ in batch]
+        modified = [m for m in modified if m is not None]
+        if checkpoint.run_watermark is not None:
+            modified.append(checkpoint.run_watermark)
+
+        with transaction.atomic():
+            role_ids = sync_upstream_role_batch(batch, watermark=checkpoint.watermark)
+            checkpoint.run_watermark = max(modified, default=None)
+            checkpoint.save()
+        batch.clear()
+
+        if role_ids:
+            search.index_roles(role_ids=role_ids)
+            response_cache.bump_generation("roles")
+
+    def page_done(next_url):
+        checkpoint.next_page = _page_number(next_url)
+        write_batch()
 
     iterator_kwargs = {
         'baseurl': baseurl,
@@ -608,7 +790,9 @@ def legacy_sync_from_upstream(
         'role_name': role_name,
         'limit': limit,
         'start_page': start_page,
+        'page_callback': page_done,
     }
+    role_count = 0
     for ns_data, rdata, rversions in upstream_role_iterator(**iterator_kwargs):
 
         # processing a namespace should make owners and set rbac as needed ...
@@ -618,83 +802,22 @@ def legacy_sync_from_upstream(
         else:
             namespace, v3_namespace = nsmap[ns_data['name']]
 
-        github_user = rdata.get('github_user')
-        role_name = rdata.get('name')
-
-        logger.info(f'POPULATE {github_user}.{role_name}')
-
-        rkey = (github_user, role_name)
-        remote_id = rdata['id']
-        role_versions = rversions[:]
-        github_repo = rdata['github_repo']
-        github_branch = rdata['github_branch']
-        clone_url = f'https://github.com/{github_user}/{github_repo}'
-        sfields = rdata.get('summary_fields', {})
-        role_tags = sfields.get('tags', [])
-        commit_hash = rdata.get('commit')
-        commit_msg = rdata.get('commit_message')
-        commit_url = rdata.get('commit_url')
-        issue_tracker = rdata.get('issue_tracker_url', clone_url + '/issues')
-        role_description = rdata.get('description')
-        role_license = rdata.get('license')
-        role_readme = rdata.get('readme')
-        role_html = rdata.get('readme_html')
-        role_dependencies = sfields.get('dependencies', [])
-        role_min_ansible = rdata.get('min_ansible_version')
-        role_company = rdata.get('company')
-        role_imported = rdata.get('imported', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_created = rdata.get('created', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_modified = rdata.get('modified', datetime.datetime.now().isoformat())  # noqa: DTZ005
-        role_type = rdata.get('role_type', 'ANS')
-        role_download_count = rdata.get('download_count', 0)
-
-        if rkey not in rmap:
-            logger.debug(f'SYNC create initial role for {rkey}')
-            this_role, _ = LegacyRole.objects.get_or_create(
-                namespace=namespace,
-                name=role_name
-            )
-            rmap[rkey] = this_role
-        else:
-            this_role = rmap[rkey]
+        batch.append((namespace, rdata, rversions))
+        role_count += 1
 
-        new_full_metadata = {
-            'upstream_id': remote_id,
-            'role_type': role_type,
-            'imported': role_imported,
-            'created': role_created,
-            'modified': role_modified,
-            'clone_url': clone_url,
-            'tags': role_tags,
-            'commit': commit_hash,
-            'commit_message': commit_msg,
-            'commit_url': commit_url,
-            'github_user': github_user,
-            'github_repo': github_repo,
-            'github_branch': github_branch,
-            # 'github_reference': github_reference,
-            'issue_tracker_url': issue_tracker,
-            'dependencies': role_dependencies,
-            'versions': role_versions,
-            'description': role_description,
-            'license': role_license,
-            'readme': role_readme,
-            'readme_html': role_html,
-            'min_ansible_version': role_min_ansible,
-            'company': role_company,
-        }
-
-        new_full_metadata['versions'] = normalize_versions(new_full_metadata['versions'])
-        new_full_metadata['versions'] = sort_versions(new_full_metadata['versions'])
+    if batch:
+        write_batch()
 
-        if dict(this_role.full_metadata) != new_full_metadata:
-            with transaction.atomic():
-                this_role.full_metadata = new_full_metadata
-                this_role.save()
-
-        with transaction.atomic():
-            counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=this_role)
-            counter.count = role_download_count
-            counter.save()
+    if limit is None or role_count < limit:
+        # the whole upstream was walked, roles it did not modify
+        # since run_watermark can be skipped by the next run.
+        checkpoint.next_page = None
+        if checkpoint.run_watermark is not None:
+            checkpoint.watermark = max(
+                filter(None, [checkpoint.watermark, checkpoint.run_watermark])
+            )
+        checkpoint.run_watermark = None
+        checkpoint.completed = timezone.now()
+        checkpoint.save()
 
     logger.debug('STOP LEGACY SYNC!')
@@ -83,6 +83,7 @@ class LegacyNamespacesViewSet(
 
     permission_classes = [LegacyAccessPolicy]
     authentication_classes = GALAXY_AUTHENTICATION_CLASSES
+    response_cache_scopes = ("roles", "namespaces")
 
     @transaction.atomic
     def destroy(self, request, pk=None):
@@ -1,8 +1,8 @@
 import logging
 
 from django.conf import settings
-from django.db import transaction
-from django.db.utils import InternalError as DatabaseInternalError
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 
@@ -14,13 +14,14 @@ from rest_framework.settings import perform_import
 from rest_framework.pagination import PageNumberPagination
 
 from galaxy_ng.app.access_control.access_policy import LegacyAccessPolicy
+from galaxy_ng.app.api.pagination import KeysetPaginationMixin
 
 from galaxy_ng.app.api.v1.tasks import (
     legacy_role_import,
 )
+from galaxy_ng.app.tasks.download_counts import count_role_download
 from galaxy_ng.app.api.v1.models import (
     LegacyRole,
-    LegacyRoleDownloadCount,
     LegacyRoleImport,
 )
 from galaxy_ng.app.api.v1.serializers import (
@@ -48,7 +49,9 @@ GALAXY_AUTHENTICATION_CLASSES = perform_import(
 logger = logging.getLogger(__name__)
 
 
-class LegacyRolesSetPagination(PageNumberPagination):
+class LegacyRolesSetPagination(KeysetPaginationMixin, PageNumberPagination):
+    """Page number pagination, or keyset pagination with `?pagination=cursor`."""
+
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 1000
@@ -67,6 +70,26 @@ class LegacyRolesViewSet(viewsets.ModelViewSet):
 
     permission_classes = [LegacyAccessPolicy]
     authentication_classes = GALAXY_AUTHENTICATION_CLASSES
+    response_cache_scopes = ("roles", "namespaces")
+
+    @classmethod
+    def response_cacheable(cls, request):
+        # the lookups of a single role by the CLI count as downloads
+        return not (request.GET.get('owner__username') and request.GET.get('name'))
+
+    def get_queryset(self):
+        """Fetch everything LegacyRoleSerializer needs along with the roles.
+
+        The namespaces are joined and the download count is annotated so
+        serializing a page takes a constant number of queries.
+        """
+        return super().get_queryset().select_related(
+            'namespace',
+            'namespace__namespace',
+            'namespace__namespace__last_created_pulp_metadata',
+        ).annotate(
+            download_count=Coalesce(F('legacyroledownloadcount__count'), Value(0))
+        )
 
     def list(self, request):
 
@@ -78,25 +101,7 @@ class LegacyRolesViewSet(viewsets.ModelViewSet):
             role_name = request.query_params.get('name')
             role = LegacyRole.objects.filter(namespace__name=role_namespace, name=role_name).first()
             if role:
-
-                with transaction.atomic():
-
-                    try:
-                        # attempt to get or create the counter first
-                        counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=role)
-
-                        # now lock the row so that we avoid race conditions
-                        counter = LegacyRoleDownloadCount.objects.select_for_update().get(
-                            pk=counter.pk
-                        )
-
-                        # increment and save
-                        counter.count += 1
-                        counter.save()
-                    except DatabaseInternalError as e:
-                        # Fail gracefully if the database is in read-only mode.
-                        if "read-only" not in str(e):
-                            raise e
+                count_role_download(role)
 
         return super().list(request)
 
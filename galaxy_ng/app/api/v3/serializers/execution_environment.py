@@ -1,10 +1,13 @@
-import json
-
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import OuterRef, Q, Subquery, TextField
+from django.db.models.functions import Cast
 from rest_framework import serializers
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 
 from pulpcore.plugin.util import get_users_with_perms
+from pulpcore.plugin.models.role import UserRole
 from pulpcore.plugin.serializers import IdentityField
 
 from pulp_container.app import models as container_models
@@ -12,6 +15,7 @@ from pulpcore.plugin import models as core_models
 
 from galaxy_ng.app import models
 from galaxy_ng.app.access_control.fields import MyPermissionsField
+from galaxy_ng.app.utils import config_blobs
 
 from galaxy_ng.app.api.ui.v1 import serializers as ui_serializers
 
@@ -61,11 +65,76 @@ class ContainerNamespaceSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.ListField)
     def get_owners(self, namespace):
+        owners = self.context.get("namespace_owners", {})
+        if namespace.pk in owners:
+            return owners[namespace.pk]
         return get_users_with_perms(
             namespace, with_group_users=False, for_concrete_model=True
         ).values_list("username", flat=True)
 
 
+def _get_namespace_owners(namespaces):
+    """
+    Bulk version of ContainerNamespaceSerializer.get_owners: the users with a
+    role on the namespace or on all namespaces, without the group members.
+    """
+    ctype = ContentType.objects.get_for_model(models.ContainerNamespace, for_concrete_model=True)
+    object_ids = [str(namespace.pk) for namespace in namespaces]
+    user_roles = UserRole.objects.filter(role__permissions__content_type=ctype).filter(
+        Q(object_id=None, domain__isnull=True) | Q(content_type=ctype, object_id__in=object_ids)
+    )
+
+    global_owners = set()
+    owners = {object_id: set() for object_id in object_ids}
+    for object_id, username in user_roles.values_list("object_id", "user__username").distinct():
+        if object_id is None:
+            global_owners.add(username)
+        else:
+            owners[object_id].add(username)
+    return {
+        namespace.pk: sorted(owners[str(namespace.pk)] | global_owners)
+        for namespace in namespaces
+    }
+
+
+def _get_remote_sync_tasks(remote_ids):
+    """Latest sync task of each remote, in the way of utils.RemoteSyncTaskField."""
+    latest_sync = core_models.Task.objects.filter(
+        reserved_resources_record__icontains=Cast(OuterRef("pk"), output_field=TextField()),
+        name__icontains="sync",
+    ).order_by("-pulp_last_updated")
+    task_ids = dict(
+        core_models.Remote.objects.filter(pk__in=remote_ids)
+        .annotate(last_sync_task=Subquery(latest_sync.values("pk")[:1]))
+        .values_list("pk", "last_sync_task")
+    )
+    tasks = core_models.Task.objects.in_bulk([pk for pk in task_ids.values() if pk])
+    return {remote_id: tasks.get(task_id) for remote_id, task_id in task_ids.items()}
+
+
+def get_repository_list_context(distributions):
+    """
+    Resolves the namespace owners and the remote sync tasks of a page of
+    distributions in a fixed number of queries, to be merged in the context of
+    ContainerRepositorySerializer:
+
+    - "namespace_owners": {namespace pk: [username]}
+    - "remote_sync_tasks": {remote pk: latest sync task or None}
+    """
+    namespaces = {
+        distro.namespace_id: distro.namespace for distro in distributions if distro.namespace_id
+    }
+    remote_ids = {
+        distro.repository.remote_id
+        for distro in distributions
+        if distro.repository and distro.repository.remote_id
+    }
+    return {
+        "namespace_owners": _get_namespace_owners(list(namespaces.values())),
+        "remote_sync_tasks": _get_remote_sync_tasks(remote_ids),
+    }
+
+
 class ContainerRepositorySerializer(serializers.ModelSerializer):
     pulp = serializers.SerializerMethodField()
     namespace = ContainerNamespaceSerializer()
@@ -116,18 +185,31 @@ class ContainerRepositorySerializer(serializers.ModelSerializer):
         repo = distro.repository
         remote = None
         if repo.remote:
+            try:
+                # selected along with the distribution by ContainerRepositoryViewSet
+                container_remote = repo.remote.containerremote
+            except ObjectDoesNotExist:
+                container_remote = repo.remote.cast()
             remote = ui_serializers.ContainerRemoteSerializer(
-                repo.remote.cast(), context=self.context).data
+                container_remote, context=self.context).data
 
-        sign_state = (repo.content.filter(
-            pulp_type="container.signature"
-        ).count() > 0 and "signed") or "unsigned"
+        # is_signed and latest_version_number are annotated by ContainerRepositoryViewSet
+        if hasattr(distro, "is_signed"):
+            is_signed = distro.is_signed
+        else:
+            is_signed = repo.content.filter(pulp_type="container.signature").exists()
+        sign_state = (is_signed and "signed") or "unsigned"
+
+        if hasattr(distro, "latest_version_number"):
+            version = distro.latest_version_number
+        else:
+            version = repo.latest_version().number
 
         return {
             "repository": {
                 "id": repo.pk,
                 "pulp_type": repo.pulp_type,
-                "version": repo.latest_version().number,
+                "version": version,
                 "name": repo.name,
                 "description": repo.description,
                 "created_at": repo.pulp_created,
@@ -237,15 +319,41 @@ class ContainerManifestSerializer(serializers.ModelSerializer):
 class ContainerManifestDetailSerializer(ContainerManifestSerializer):
     @extend_schema_field(OpenApiTypes.OBJECT)
     def get_config_blob(self, obj):
-        with obj.config_blob._artifacts.first().file.open() as f:
-            config_json = json.load(f)
-
         return {
             "digest": obj.config_blob.digest,
-            "data": config_json,
+            "data": config_blobs.get_config_blob_data(obj.config_blob),
         }
 
 
+def get_history_content_context(repository_versions):
+    """
+    Resolves the manifests and tags added or removed by a page of repository
+    versions with prefetched memberships in two queries, to be merged in the
+    context of ContainerRepositoryHistorySerializer:
+
+    - "manifest_digests": {manifest pk: digest}
+    - "tags": {tag pk: (name, tagged manifest digest)}
+    """
+    manifest_pks = set()
+    tag_pks = set()
+    for version in repository_versions:
+        for membership in (*version.added_memberships.all(), *version.removed_memberships.all()):
+            if membership.content.pulp_type == "container.manifest":
+                manifest_pks.add(membership.content_id)
+            elif membership.content.pulp_type == "container.tag":
+                tag_pks.add(membership.content_id)
+
+    manifests = container_models.Manifest.objects.filter(pk__in=manifest_pks)
+    tags = container_models.Tag.objects.filter(pk__in=tag_pks)
+    return {
+        "manifest_digests": dict(manifests.values_list("pk", "digest")),
+        "tags": {
+            pk: (name, digest)
+            for pk, name, digest in tags.values_list("pk", "name", "tagged_manifest__digest")
+        },
+    }
+
+
 class ContainerRepositoryHistorySerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source='pulp_id')
     added = serializers.SerializerMethodField()
@@ -273,14 +381,25 @@ class ContainerRepositoryHistorySerializer(serializers.ModelSerializer):
             "tag_name": None,
         }
 
-        # TODO(jerabekjiri): Figure out if there is a way to prefetch Manifest and Tag objects
+        # resolved in bulk by get_history_content_context() when listing
+        manifest_digests = self.context.get("manifest_digests", {})
+        tags = self.context.get("tags", {})
+
         if content.pulp_type == "container.manifest":
-            manifest = container_models.Manifest.objects.get(pk=content.pk)
-            return_data["manifest_digest"] = manifest.digest
+            if content.pk in manifest_digests:
+                return_data["manifest_digest"] = manifest_digests[content.pk]
+            else:
+                manifest = container_models.Manifest.objects.get(pk=content.pk)
+                return_data["manifest_digest"] = manifest.digest
         elif content.pulp_type == "container.tag":
-            tag = container_models.Tag.objects.select_related("tagged_manifest").get(pk=content.pk)
-            return_data["manifest_digest"] = tag.tagged_manifest.digest
-            return_data["tag_name"] = tag.name
+            if content.pk in tags:
+                return_data["tag_name"], return_data["manifest_digest"] = tags[content.pk]
+            else:
+                tag = container_models.Tag.objects.select_related("tagged_manifest").get(
+                    pk=content.pk
+                )
+                return_data["manifest_digest"] = tag.tagged_manifest.digest
+                return_data["tag_name"] = tag.name
 
         return return_data
 
@@ -1,6 +1,8 @@
 import logging
 import re
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.core import validators
 from django.utils.translation import gettext_lazy as _
@@ -183,3 +185,49 @@ class NamespaceSummarySerializer(NamespaceSerializer):
         )
 
         read_only_fields = ('name', )
+
+
+NAMESPACE_SUMMARY_CACHE_KEY = "galaxy_namespace_summary:{name}"
+
+
+def get_namespace_summary(name, context):
+    """
+    The NamespaceSummarySerializer data of the namespace `name`, computed at most once
+    per serializer `context` (i.e. per request) for list views repeating namespaces.
+
+    With GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT set, the summaries are also kept in the
+    django cache for that many seconds, without their user specific related_fields.
+    They are invalidated when the namespace, or a role assigned on it, changes.
+    """
+    summaries = context.setdefault("namespace_summaries", {})
+    if name in summaries:
+        return summaries[name]
+
+    timeout = settings.get("GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT", 0)
+    key = NAMESPACE_SUMMARY_CACHE_KEY.format(name=name)
+    summary = cache.get(key) if timeout else None
+
+    if summary is None:
+        namespace = models.Namespace.objects.get(name=name)
+        summary = dict(NamespaceSummarySerializer(namespace, context=context).data)
+        if timeout:
+            cache.set(key, {**summary, "related_fields": None}, timeout)
+    elif _includes_related_fields(context):
+        namespace = models.Namespace.objects.get(name=name)
+        related_fields = NamespaceRelatedFieldSerializer(namespace, context=context).data
+        summary = {**summary, "related_fields": related_fields}
+    else:
+        summary = {**summary, "related_fields": {}}
+
+    summaries[name] = summary
+    return summary
+
+
+def _includes_related_fields(context):
+    request = context.get("request")
+    return request is not None and bool(request.GET.getlist("include_related"))
+
+
+def invalidate_namespace_summary(name):
+    if settings.get("GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT", 0):
+        cache.delete(NAMESPACE_SUMMARY_CACHE_KEY.format(name=name))
@@ -70,6 +70,7 @@ class RequirementsFileRenderer(BaseRenderer):
 class ExcludesView(api_base.APIView):
     permission_classes = [access_policy.CollectionAccessPolicy]
     action = 'list'
+    response_cache_scopes = ("synclists",)
     renderer_classes = [
         JSONRenderer,
         BrowsableAPIRenderer,
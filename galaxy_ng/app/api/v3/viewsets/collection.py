@@ -3,7 +3,7 @@ import logging
 import requests
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -37,6 +37,7 @@ from galaxy_ng.app.tasks import (
     import_and_auto_approve,
     import_to_staging,
 )
+from galaxy_ng.app.utils import content_proxy
 
 
 log = logging.getLogger(__name__)
@@ -161,7 +162,7 @@ class CollectionArtifactDownloadView(api_base.APIView):
     action = 'download'
 
     def _get_tcp_response(self, url):
-        return requests.get(url, stream=True, allow_redirects=False)
+        return content_proxy.fetch(url, self.request)
 
     def _get_ansible_distribution(self, base_path):
         return AnsibleDistribution.objects.get(base_path=base_path)
@@ -190,23 +191,33 @@ class CollectionArtifactDownloadView(api_base.APIView):
                 distro_base_path=distro_base_path,
                 filename=filename,
             )
-            response = self._get_tcp_response(
-                distribution.content_guard.cast().preauthenticate_url(url)
-            )
+            url = distribution.content_guard.cast().preauthenticate_url(url)
+
+            if content_proxy.get_accel_header():
+                # the webserver streams the artifact from the content app
+                metrics.collection_artifact_download_successes.inc()
+                return content_proxy.accel_redirect_response(url)
+
+            response = self._get_tcp_response(url)
 
             if response.status_code == requests.codes.not_found:
+                response.close()
                 metrics.collection_artifact_download_failures.labels(
                     status=requests.codes.not_found
                 ).inc()
                 raise NotFound()
             if response.status_code == requests.codes.found:
+                response.close()
                 return HttpResponseRedirect(response.headers['Location'])
-            if response.status_code == requests.codes.ok:
+            if response.status_code in (requests.codes.ok, requests.codes.partial_content):
                 metrics.collection_artifact_download_successes.inc()
-                return StreamingHttpResponse(
-                    response.raw.stream(amt=4096),
-                    content_type=response.headers['Content-Type']
-                )
+                return content_proxy.streaming_response(response)
+            if response.status_code in (
+                requests.codes.not_modified,
+                requests.codes.requested_range_not_satisfiable,
+            ):
+                return content_proxy.relayed_response(response)
+            response.close()
             metrics.collection_artifact_download_failures.labels(status=response.status_code).inc()
             raise APIException(
                 _('Unexpected response from content app. Code: %s.') % response.status_code
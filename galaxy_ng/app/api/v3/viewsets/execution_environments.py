@@ -1,7 +1,7 @@
 import logging
 
 from django.core import exceptions
-from django.db.models import Count, Prefetch, Q
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery
 from django.shortcuts import get_object_or_404
 from django_filters import filters
 from django_filters.rest_framework import DjangoFilterBackend, filterset
@@ -17,6 +17,10 @@ from galaxy_ng.app import models
 from galaxy_ng.app.access_control import access_policy
 from galaxy_ng.app.api import base as api_base
 from galaxy_ng.app.api.v3 import serializers
+from galaxy_ng.app.api.v3.serializers.execution_environment import (
+    get_history_content_context,
+    get_repository_list_context,
+)
 from galaxy_ng.app.tasks.deletion import (
     delete_container_distribution,
     delete_container_image_manifest,
@@ -108,13 +112,35 @@ class TagFilter(filterset.FilterSet):
 
 
 class ContainerRepositoryViewSet(api_base.ModelViewSet):
-    queryset = models.ContainerDistribution.objects.all().select_related('namespace')
+    queryset = models.ContainerDistribution.objects.all().select_related(
+        'namespace',
+        'repository',
+        'repository__remote__containerremote__registry__registry',
+    ).annotate(
+        is_signed=Exists(core_models.RepositoryContent.objects.filter(
+            repository=OuterRef('repository'),
+            content__pulp_type='container.signature',
+        )),
+        latest_version_number=Subquery(
+            core_models.RepositoryVersion.objects.filter(
+                repository=OuterRef('repository'), complete=True
+            ).order_by('-number').values('number')[:1]
+        ),
+    )
     serializer_class = serializers.ContainerRepositorySerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RepositoryFilter
     permission_classes = [access_policy.ContainerRepositoryAccessPolicy]
     lookup_field = "base_path"
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        context = self.get_serializer_context()
+        context.update(get_repository_list_context(page))
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
     @extend_schema(
         description="Trigger an asynchronous delete task",
         responses={202: AsyncOperationResponseSerializer},
@@ -213,6 +239,14 @@ class ContainerRepositoryHistoryViewSet(ContainerContentBaseViewset):
             ).order_by('-pulp_created')
         )
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        context = self.get_serializer_context()
+        context.update(get_history_content_context(page))
+        serializer = self.get_serializer(page, many=True, context=context)
+        return self.get_paginated_response(serializer.data)
+
 
 class ContainerReadmeViewSet(ContainerContentBaseViewset):
     queryset = models.ContainerDistroReadme.objects
@@ -1,4 +1,5 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import REGISTRY, CounterMetricFamily
 
 
 collection_import_attempts = Counter(
@@ -31,3 +32,81 @@ collection_artifact_download_successes = Counter(
     "galaxy_api_collection_artifact_download_successes",
     "count of successful collection artifact downloads"
 )
+
+# Per request instrumentation, see galaxy_ng.app.common.middleware
+
+REQUEST_LATENCY_BUCKETS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf")
+)
+
+api_request_latency_seconds = Histogram(
+    "galaxy_api_request_latency_seconds",
+    "request latency by view",
+    ["view", "method"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+
+api_request_sql_queries = Histogram(
+    "galaxy_api_request_sql_queries",
+    "number of SQL queries of the sampled requests by view",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float("inf")),
+)
+
+api_request_sql_seconds = Histogram(
+    "galaxy_api_request_sql_seconds",
+    "time spent in SQL queries of the sampled requests by view",
+    ["view"],
+    buckets=REQUEST_LATENCY_BUCKETS,
+)
+
+api_response_size_bytes = Histogram(
+    "galaxy_api_response_size_bytes",
+    "response body size by view",
+    ["view"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, float("inf")),
+)
+
+api_response_cache_requests = Counter(
+    "galaxy_api_response_cache_requests",
+    "lookups of the anonymous response cache by view",
+    ["view", "result"],
+)
+
+
+class CacheStatsCollector:
+    """
+    Exports the hit/miss counters of the in process caches as
+    galaxy_cache_requests_total{cache=..., result="hit"|"miss"}.
+
+    Caches count their lookups themselves (e.g. the access policy caches) and
+    register a function returning {cache_name: {"hits": int, "misses": int}},
+    the counters are only read when the metrics are scraped.
+    """
+
+    def __init__(self):
+        self.providers = []
+
+    def register(self, provider):
+        self.providers.append(provider)
+
+    def collect(self):
+        family = CounterMetricFamily(
+            "galaxy_cache_requests",
+            "lookups of the in process caches",
+            labels=["cache", "result"],
+        )
+        for provider in self.providers:
+            for cache, stats in provider().items():
+                family.add_metric([cache, "hit"], stats["hits"])
+                family.add_metric([cache, "miss"], stats["misses"])
+        yield family
+
+
+cache_stats = CacheStatsCollector()
+REGISTRY.register(cache_stats)
+
+
+def register_cache_stats(provider):
+    """Export the hits and misses returned by `provider()`, see CacheStatsCollector."""
+    cache_stats.register(provider)
@@ -0,0 +1,234 @@
+import heapq
+import itertools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from galaxy_ng.app.common import metrics, response_cache
+
+log = logging.getLogger(__name__)
+
+UNRESOLVED_VIEW = "<unresolved>"
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting the queries of a request and their time.
+
+    When `keep` is set the `keep` slowest queries are kept with their params so
+    they can be logged (and explained) for slow requests.
+    """
+
+    def __init__(self, keep=0):
+        self.count = 0
+        self.duration = 0.0
+        self.keep = keep
+        self.slowest = []
+        self._order = itertools.count()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.keep:
+                entry = (elapsed, next(self._order), sql, params, many)
+                if len(self.slowest) < self.keep:
+                    heapq.heappush(self.slowest, entry)
+                else:
+                    heapq.heappushpop(self.slowest, entry)
+
+    def slowest_queries(self):
+        """The kept queries as (seconds, sql, params, many), slowest first."""
+        return [
+            (elapsed, sql, params, many)
+            for elapsed, _, sql, params, many in sorted(self.slowest, reverse=True)
+        ]
+
+
+def get_view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED_VIEW
+    return match.view_name or match._func_path
+
+
+def get_response_size(response):
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """
+    Exports per view request metrics through prometheus_client.
+
+    Every request is counted in the latency and response size histograms, which
+    costs a clock read and a histogram update. A sample of the requests
+    (GALAXY_REQUEST_METRICS_SAMPLE_RATE) is also instrumented with a database
+    execute wrapper recording the number of SQL queries and the time spent in
+    them.
+
+    Sampled requests slower than GALAXY_SLOW_REQUEST_THRESHOLD seconds are
+    logged with their slowest queries, with GALAXY_SLOW_REQUEST_EXPLAIN the
+    query plans of the slowest SELECT queries are logged too.
+
+    Disabled with GALAXY_REQUEST_METRICS_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not settings.get("GALAXY_REQUEST_METRICS_ENABLED", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = settings.get("GALAXY_REQUEST_METRICS_SAMPLE_RATE", 0.1)
+        self.slow_threshold = settings.get("GALAXY_SLOW_REQUEST_THRESHOLD", None)
+        self.explain = settings.get("GALAXY_SLOW_REQUEST_EXPLAIN", False)
+        self.keep_queries = settings.get("GALAXY_SLOW_REQUEST_LOGGED_QUERIES", 5)
+
+    def __call__(self, request):
+        recorder = None
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            recorder = QueryRecorder(keep=self.keep_queries if self.slow_threshold else 0)
+
+        start = time.perf_counter()
+        if recorder is None:
+            response = self.get_response(request)
+        else:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        try:
+            self.record(request, response, duration, recorder)
+        except Exception:
+            # metrics must never break a request
+            log.exception("Failed to record the metrics of %s", request.path)
+        return response
+
+    def record(self, request, response, duration, recorder):
+        view = get_view_name(request)
+        metrics.api_request_latency_seconds.labels(view=view, method=request.method).observe(
+            duration
+        )
+
+        size = get_response_size(response)
+        if size is not None:
+            metrics.api_response_size_bytes.labels(view=view).observe(size)
+
+        if recorder is None:
+            return
+
+        metrics.api_request_sql_queries.labels(view=view).observe(recorder.count)
+        metrics.api_request_sql_seconds.labels(view=view).observe(recorder.duration)
+
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            self.log_slow_request(request, view, response, duration, recorder)
+
+    def log_slow_request(self, request, view, response, duration, recorder):
+        log.warning(
+            "Slow request %s %s (%s) status=%s duration=%.3fs queries=%s sql=%.3fs",
+            request.method,
+            request.get_full_path(),
+            view,
+            response.status_code,
+            duration,
+            recorder.count,
+            recorder.duration,
+        )
+        for elapsed, sql, params, many in recorder.slowest_queries():
+            log.warning("Slow request %s query %.3fs: %s %r", view, elapsed, sql, params)
+            if self.explain and not many and sql.lstrip()[:6].upper() == "SELECT":
+                log.warning("Slow request %s plan:\n%s", view, self.explain_query(sql, params))
+
+    @staticmethod
+    def explain_query(sql, params):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {sql}", params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+
+
+# Headers the authentication classes read the credentials from
+AUTHENTICATION_HEADERS = ("Authorization", "X-Rh-Identity", "X-DAB-JW-TOKEN")
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves the responses of anonymous GET requests to the views with a
+    `response_cache_scopes` attribute from Redis, see
+    galaxy_ng.app.common.response_cache.
+
+    Disabled unless GALAXY_RESPONSE_CACHE_ENABLED = True.
+    """
+
+    def __init__(self, get_response):
+        if not response_cache.is_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        pending = getattr(request, "_response_cache_pending", None)
+        if pending is None or response.status_code != 200 or response.streaming:
+            return response
+
+        # process_view runs before DRF authentication, only the user of the
+        # DRF request tells whether the response was computed anonymously
+        renderer_context = getattr(response, "renderer_context", None) or {}
+        drf_request = renderer_context.get("request")
+        if drf_request is None or drf_request.user.is_authenticated:
+            return response
+
+        entry_key, generation = pending
+        etag = response_cache.store(entry_key, generation, response)
+        if etag is None:
+            return response
+
+        response["ETag"] = etag
+        return response_cache.not_modified(request, etag) or response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None)
+        scopes = getattr(view_class, "response_cache_scopes", None)
+        if not scopes or not self.is_anonymous(request):
+            return None
+
+        cacheable = getattr(view_class, "response_cacheable", None)
+        if cacheable is not None and not cacheable(request):
+            return None
+
+        view = get_view_name(request)
+        entry_key = response_cache.get_entry_key(request, view)
+        entry, generation = response_cache.lookup(entry_key, scopes)
+        if generation is None:
+            # no redis
+            return None
+
+        metrics.api_response_cache_requests.labels(
+            view=view, result="miss" if entry is None else "hit"
+        ).inc()
+        if entry is not None:
+            return response_cache.cached_response(request, entry)
+
+        request._response_cache_pending = (entry_key, generation)
+        return None
+
+    @staticmethod
+    def is_anonymous(request):
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if any(header in request.headers for header in AUTHENTICATION_HEADERS):
+            return False
+        user = getattr(request, "user", None)
+        return user is None or not user.is_authenticated
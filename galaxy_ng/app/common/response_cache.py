@@ -0,0 +1,141 @@
+"""common/response_cache.py
+
+Redis backed cache of the responses of the anonymous read endpoints.
+
+A view opts in with a `response_cache_scopes` attribute naming the kinds of
+content its responses are built from, e.g. `("collections", "namespaces")`,
+and can refuse single requests with a `response_cacheable(request)`
+classmethod. ResponseCacheMiddleware (galaxy_ng.app.common.middleware) then
+caches the 200 responses of anonymous GET requests.
+
+Entries are keyed by view name, absolute path, normalized query params and the
+Accept header. Each scope has a generation counter in Redis which is bumped
+(see bump_generation_on_commit) by the signal handlers whenever that content
+changes. An entry stores the generations it was computed with and is only
+served while they are current, the generations are read before the view runs
+so a response computed during a change is never served after it. The version
+stamp of the dynamic settings is part of the generations too, the anonymous
+access settings can change what anonymous users see.
+
+GALAXY_RESPONSE_CACHE_TTL bounds the staleness of the data not covered by a
+scope, e.g. download counts. Responses are served with an ETag and
+conditional requests are answered with 304.
+
+Enabled with GALAXY_RESPONSE_CACHE_ENABLED = True, requires Redis.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+
+from galaxy_ng.app.tasks.settings_cache import (
+    VERSION_KEY as SETTINGS_VERSION_KEY,
+    connection_error_wrapper,
+    get_redis_connection,
+)
+
+ENTRY_KEY = "GALAXY_RESPONSE_CACHE:{view}:{digest}"
+GENERATION_KEY = "GALAXY_RESPONSE_CACHE_GENERATION:{scope}"
+
+
+def is_enabled():
+    return settings.get("GALAXY_RESPONSE_CACHE_ENABLED", False)
+
+
+def get_entry_key(request, view_name):
+    """The key of the cached response of an anonymous request to a view."""
+    query = sorted((key, request.GET.getlist(key)) for key in request.GET)
+    digest = hashlib.sha256(
+        json.dumps([
+            request.build_absolute_uri(request.path),
+            query,
+            request.headers.get("Accept", ""),
+        ]).encode()
+    ).hexdigest()
+    return ENTRY_KEY.format(view=view_name, digest=digest)
+
+
+@connection_error_wrapper(default=lambda: (None, None))
+def lookup(entry_key, scopes):
+    """Returns the cached entry (or None) and the current generations of the scopes."""
+    conn = get_redis_connection()
+    if conn is None:
+        return None, None
+
+    keys = [GENERATION_KEY.format(scope=scope) for scope in scopes]
+    raw_entry, *values = conn.mget([entry_key, *keys, SETTINGS_VERSION_KEY])
+    generation = ":".join(value or "0" for value in values)
+
+    if raw_entry is None:
+        return None, generation
+    entry = json.loads(raw_entry)
+    if entry["generation"] != generation:
+        return None, generation
+    return entry, generation
+
+
+@connection_error_wrapper(default=lambda: None)
+def store(entry_key, generation, response):
+    """Cache a rendered response, returns its ETag."""
+    conn = get_redis_connection()
+    if conn is None:
+        return None
+
+    try:
+        content = response.content.decode(response.charset or "utf-8")
+    except UnicodeDecodeError:
+        return None
+
+    etag = '"{}"'.format(hashlib.sha256(response.content).hexdigest())
+    entry = {
+        "generation": generation,
+        "content": content,
+        "content_type": response["Content-Type"],
+        "etag": etag,
+    }
+    conn.set(entry_key, json.dumps(entry), ex=settings.get("GALAXY_RESPONSE_CACHE_TTL", 300))
+    return etag
+
+
+def not_modified(request, etag):
+    """Returns a 304 response when the request's If-None-Match matches `etag`."""
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match or not etag:
+        return None
+
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in tags or etag in tags or f"W/{etag}" in tags:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+    return None
+
+
+def cached_response(request, entry):
+    """Build the response of a cache hit."""
+    response = not_modified(request, entry["etag"])
+    if response is None:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+        response["ETag"] = entry["etag"]
+    return response
+
+
+@connection_error_wrapper(default=lambda: None)
+def bump_generation(*scopes):
+    """Invalidate the cached responses built from the given scopes."""
+    conn = get_redis_connection()
+    if conn is None or not is_enabled():
+        return
+
+    pipeline = conn.pipeline(transaction=False)
+    for scope in scopes:
+        pipeline.incr(GENERATION_KEY.format(scope=scope))
+    pipeline.execute()
+
+
+def bump_generation_on_commit(*scopes):
+    """bump_generation() once the current transaction is committed."""
+    if is_enabled():
+        transaction.on_commit(lambda: bump_generation(*scopes))
@@ -729,36 +729,38 @@ def configure_dynamic_settings(settings: Dynaconf) -> dict[str, Any]:
             return value.value
 
         # lazy import because it can't happen before apps are ready
-        from galaxy_ng.app.tasks.settings_cache import (
-            get_settings_from_cache,
-            get_settings_from_db,
-        )
-        if data := get_settings_from_cache():
-            metadata = SourceMetadata(loader="hooking", identifier="cache")
-        else:
-            data = get_settings_from_db()
-            if data:
-                metadata = SourceMetadata(loader="hooking", identifier="db")
+        from galaxy_ng.app.tasks.settings_cache import get_dynamic_settings
 
-        # This is the main part, it will update temp_settings with data coming from settings db
-        # and by calling update it will process dynaconf parsing and merging.
-        try:
-            if data:
-                temp_settings.update(data, loader_identifier=metadata, tomlfy=True)
-        except (DynaconfFormatError, DynaconfParseError) as exc:
-            logger.error("Error loading dynamic settings: %s", str(exc))
+        # A per process copy of the cache/db data, refreshed when a setting
+        # changes, so most reads don't leave the process.
+        snapshot = get_dynamic_settings()
+        data = snapshot.data
 
         if not data:
             logger.debug("Dynamic settings are empty, reading key %s from default sources", key)
-        elif key in [_k.split("__")[0] for _k in data]:
-            logger.debug("Dynamic setting for key: %s loaded from %s", key, metadata.identifier)
-        else:
+            return value.value
+
+        if key.upper() not in snapshot.keys:
             logger.debug(
                 "Key %s not on db/cache, %s other keys loaded from %s",
-                key, len(data), metadata.identifier
+                key, len(data), snapshot.source
             )
+            return value.value
+
+        if key in snapshot.values:
+            return snapshot.values[key]
+
+        # This is the main part, it will update temp_settings with data coming from settings db
+        # and by calling update it will process dynaconf parsing and merging.
+        metadata = SourceMetadata(loader="hooking", identifier=snapshot.source)
+        try:
+            temp_settings.update(data, loader_identifier=metadata, tomlfy=True)
+        except (DynaconfFormatError, DynaconfParseError) as exc:
+            logger.error("Error loading dynamic settings: %s", str(exc))
 
-        return temp_settings.get(key, value.value)
+        logger.debug("Dynamic setting for key: %s loaded from %s", key, snapshot.source)
+        snapshot.values[key] = temp_settings.get(key, value.value)
+        return snapshot.values[key]
 
     def alter_hostname_settings(
         temp_settings: Settings,
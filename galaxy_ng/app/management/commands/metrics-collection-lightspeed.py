@@ -11,6 +11,12 @@ logger = logging.getLogger("metrics_collection.export_lightspeed")
 class Command(BaseCommand):
     """Django management command to export collections data to s3 bucket"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full-sync', dest='full-sync', action='store_true',
+            help='Export whole tables instead of the rows changed since the last gathering'
+        )
+
     def handle(self, *args, **options):
         """Handle command"""
 
@@ -18,9 +24,11 @@ class Command(BaseCommand):
             collector_module=lightspeed_data,
             collection_type=Collector.MANUAL_COLLECTION,
             logger=logger,
+            full_sync=options.get('full-sync'),
         )
 
-        collector.gather(since=now() - timedelta(days=8), until=now() - timedelta(days=1))
+        # Each table is exported from where its last gathering ended
+        collector.gather(until=now() - timedelta(days=1))
 
         self.stdout.write("Gather Analytics => S3(Lightspeed): Completed ")
 
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from galaxy_ng.app.access_control.visibility import rebuild_repository_visibility
+
+
+class Command(BaseCommand):
+    """Rebuilds the users and groups that can view each private repository
+
+    Example:
+
+    django-admin rebuild-repository-visibility
+    """
+
+    help = "Rebuild the materialized visibility of private repositories."
+
+    def handle(self, *args, **options):
+        users, groups = rebuild_repository_visibility()
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {users} user and {groups} group repository grants")
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from galaxy_ng.app.tasks.search import index_collections, index_roles, rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Rebuilds the denormalized index used by the _ui/v1/search/ endpoint
+
+    Example:
+
+    django-admin rebuild-search-index
+    django-admin rebuild-search-index --type=role
+    django-admin rebuild-search-index --type=collection --namespace=community
+    """
+
+    help = "Rebuild the collection and role search index."
+
+    def echo(self, message):
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type", choices=["collection", "role"], help="Only rebuild this content type"
+        )
+        parser.add_argument(
+            "--namespace", help="Only rebuild collections of this namespace"
+        )
+
+    def handle(self, *args, **options):
+        type_ = options["type"]
+        namespace = options["namespace"]
+
+        if type_ is None and namespace is None:
+            collections, roles = rebuild_search_index()
+            self.echo(f"Indexed {collections} collections and {roles} roles")
+            return
+
+        if type_ in (None, "collection"):
+            collections = index_collections(namespace=namespace)
+            self.echo(f"Indexed {collections} collections")
+
+        if type_ in (None, "role") and namespace is None:
+            roles = index_roles()
+            self.echo(f"Indexed {roles} roles")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from galaxy_ng.app.tasks.tag_counts import rebuild_tag_counts
+
+
+class Command(BaseCommand):
+    """Recomputes the usage counters of the collection and role tags
+
+    Example:
+
+    django-admin rebuild-tag-counts
+    """
+
+    help = "Rebuild the usage counters of the collection and role tags."
+
+    def handle(self, *args, **options):
+        collections, roles = rebuild_tag_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Counted {collections} collection tags and {roles} role tags")
+        )
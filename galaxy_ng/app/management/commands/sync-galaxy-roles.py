@@ -20,6 +20,11 @@ class Command(BaseCommand):
         parser.add_argument("--role_name", help="find and sync only this role name")
         parser.add_argument("--limit", type=int)
         parser.add_argument("--start_page", type=int)
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="start over instead of resuming an interrupted sync",
+        )
 
     def echo(self, message, style=None):
         style = style or self.style.SUCCESS
@@ -34,4 +39,5 @@ class Command(BaseCommand):
             role_name=options['role_name'],
             limit=options['limit'],
             start_page=options['start_page'],
+            resume=not options['restart'],
         )
@@ -5,6 +5,8 @@ from galaxy_ng.app.metrics_collection.automation_analytics.package import Packag
 
 
 class Collector(BaseCollector):
+    state_key = "automation_analytics"
+
     @staticmethod
     def _package_class():
         return Package
@@ -39,31 +41,3 @@ class Collector(BaseCollector):
             self.logger.log(self.log_level, "No metrics collection, configuration is invalid. "
                                             "Use --dry-run to gather locally without sending.")
         return auth_valid
-
-    def _last_gathering(self):
-        # TODO(slemrmartin): Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        # return settings.AUTOMATION_ANALYTICS_LAST_GATHER
-        return None
-
-    def _load_last_gathered_entries(self):
-        # TODO(slemrmartin): Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        # from awx.conf.models import Setting
-        #
-        # last_entries = Setting.objects.filter(key='AUTOMATION_ANALYTICS_LAST_ENTRIES').first()
-        # last_gathered_entries = \
-        #   json.loads((last_entries.value if last_entries is not None else '') or '{}',
-        #               object_hook=datetime_hook)
-        last_gathered_entries = {}
-        return last_gathered_entries
-
-    def _save_last_gathered_entries(self, last_gathered_entries):
-        # TODO(slemrmartin): Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        pass
-
-    def _save_last_gather(self):
-        # TODO(slemrmartin): Waiting for persistent DB storage in Hub
-        # https://issues.redhat.com/browse/AAH-2009
-        pass
@@ -16,7 +16,7 @@ def instance_info(since, **kwargs):
 
 @register("collections", "1.0", format="csv", description="Data on ansible_collection")
 def collections(since, full_path, until, **kwargs):
-    query = data.collections_query()
+    query = data.collections_query(since, until)
 
     return export_to_csv(full_path, "collections", query)
 
@@ -28,7 +28,7 @@ def collections(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversion",
 )
 def collection_versions(since, full_path, until, **kwargs):
-    query = data.collection_versions_query()
+    query = data.collection_versions_query(since, until)
 
     return export_to_csv(full_path, "collection_versions", query)
 
@@ -37,10 +37,10 @@ def collection_versions(since, full_path, until, **kwargs):
     "collection_version_tags",
     "1.0",
     format="csv",
-    description="Full sync: Data on ansible_collectionversion_tags"
+    description="Data on ansible_collectionversion_tags"
 )
-def collection_version_tags(since, full_path, **kwargs):
-    query = data.collection_version_tags_query()
+def collection_version_tags(since, full_path, until, **kwargs):
+    query = data.collection_version_tags_query(since, until)
     return export_to_csv(full_path, "collection_version_tags", query)
 
 
@@ -50,8 +50,8 @@ def collection_version_tags(since, full_path, **kwargs):
     format="csv",
     description="Data on ansible_tag"
 )
-def collection_tags(since, full_path, **kwargs):
-    query = data.collection_tags_query()
+def collection_tags(since, full_path, until, **kwargs):
+    query = data.collection_tags_query(since, until)
     return export_to_csv(full_path, "collection_tags", query)
 
 
@@ -61,8 +61,8 @@ def collection_tags(since, full_path, **kwargs):
     format="csv",
     description="Data on ansible_collectionversionsignature",
 )
-def collection_version_signatures(since, full_path, **kwargs):
-    query = data.collection_version_signatures_query()
+def collection_version_signatures(since, full_path, until, **kwargs):
+    query = data.collection_version_signatures_query(since, until)
 
     return export_to_csv(full_path, "collection_version_signatures", query)
 
@@ -73,8 +73,8 @@ def collection_version_signatures(since, full_path, **kwargs):
     format="csv",
     description="Data on core_signingservice"
 )
-def signing_services(since, full_path, **kwargs):
-    query = data.signing_services_query()
+def signing_services(since, full_path, until, **kwargs):
+    query = data.signing_services_query(since, until)
     return export_to_csv(full_path, "signing_services", query)
 
 
@@ -85,7 +85,7 @@ def signing_services(since, full_path, **kwargs):
     description="Data from ansible_downloadlog"
 )
 def collection_download_logs(since, full_path, until, **kwargs):
-    query = data.collection_downloads_query()
+    query = data.collection_downloads_query(since, until)
     return export_to_csv(full_path, "collection_download_logs", query)
 
 
@@ -96,7 +96,7 @@ def collection_download_logs(since, full_path, until, **kwargs):
     description="Data from ansible_collectiondownloadcount"
 )
 def collection_download_counts(since, full_path, until, **kwargs):
-    query = data.collection_download_counts_query()
+    query = data.collection_download_counts_query(since, until)
     return export_to_csv(full_path, "collection_download_counts", query)
 
 
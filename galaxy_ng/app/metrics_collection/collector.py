@@ -1,11 +1,74 @@
 from django.db import connection
+from django.utils.dateparse import parse_datetime
 from insights_analytics_collector import Collector as BaseCollector
+from insights_analytics_collector import CollectionCSV as BaseCollectionCSV
+
+from galaxy_ng.app.models import MetricsCollectionState
+
+
+class CollectionCSV(BaseCollectionCSV):
+    """CSV collection exporting only the rows changed since its last gathering.
+
+    The upstream collection never starts earlier than 4 weeks ago, instead
+    a table that was never gathered, or every table on a full sync, is
+    exported from the beginning (since=None). Afterwards each gathering
+    starts where the last successful one of the same key ended.
+    """
+
+    def _gather_since(self):
+        if self.collector.full_sync:
+            return self.collector.gather_since
+        return self.collector.gather_since or self.last_gathered_entry
 
 
 class Collector(BaseCollector):
+    # Name under which the gathering bookkeeping is stored, collectors that
+    # keep no state between gatherings leave it unset.
+    state_key = None
+
+    def __init__(self, *args, full_sync=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.full_sync = full_sync
+
     def _is_valid_license(self):
         return True
 
     @staticmethod
     def db_connection():
         return connection
+
+    @staticmethod
+    def _collection_csv_class():
+        return CollectionCSV
+
+    def _get_state(self):
+        return MetricsCollectionState.objects.get_or_create(collector=self.state_key)[0]
+
+    def _last_gathering(self):
+        if self.state_key is None:
+            return None
+        return self._get_state().last_gather
+
+    def _load_last_gathered_entries(self):
+        if self.state_key is None or self.full_sync:
+            return {}
+        return {
+            key: parse_datetime(value)
+            for key, value in self._get_state().last_gathered_entries.items()
+        }
+
+    def _save_last_gathered_entries(self, last_gathered_entries):
+        if self.state_key is None:
+            return
+        state = self._get_state()
+        state.last_gathered_entries = {
+            key: value.isoformat() for key, value in last_gathered_entries.items() if value
+        }
+        state.save()
+
+    def _save_last_gather(self):
+        if self.state_key is None:
+            return
+        state = self._get_state()
+        state.last_gather = self.gather_until
+        state.save()
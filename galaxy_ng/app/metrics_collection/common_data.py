@@ -69,19 +69,36 @@ def instance_info():
     }
 
 
-def collections_query():
-    return """
+def changed_between(column, since=None, until=None):
+    """WHERE clause selecting the rows of an incremental export.
+
+    Rows whose `column` timestamp is in the (since, until] window are
+    exported, since=None exports everything up to until (full sync).
+    """
+    conditions = []
+    if since is not None:
+        conditions.append(f"{column} > '{since.isoformat()}'::timestamptz")
+    if until is not None:
+        conditions.append(f"{column} <= '{until.isoformat()}'::timestamptz")
+    if not conditions:
+        return ""
+    return "WHERE " + " AND ".join(conditions)
+
+
+def collections_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collection"."pulp_id" AS uuid,
                "ansible_collection"."pulp_created",
                "ansible_collection"."pulp_last_updated",
                "ansible_collection"."namespace",
                "ansible_collection"."name"
         FROM "ansible_collection"
+        {changed_between('"ansible_collection"."pulp_last_updated"', since, until)}
     """
 
 
-def collection_versions_query():
-    return """
+def collection_versions_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collectionversion"."content_ptr_id" AS uuid,
                "core_content"."pulp_created",
                "core_content"."pulp_last_updated",
@@ -98,30 +115,36 @@ def collection_versions_query():
         INNER JOIN "core_content" ON (
             "ansible_collectionversion"."content_ptr_id" = "core_content"."pulp_id"
             )
+        {changed_between('"core_content"."pulp_last_updated"', since, until)}
     """
 
 
-def collection_version_tags_query():
-    return """
-        SELECT id,
-               collectionversion_id AS collection_version_id,
-               tag_id
+def collection_version_tags_query(since=None, until=None):
+    # tags are set when the collection version is imported
+    return f"""
+        SELECT ansible_collectionversion_tags.id,
+               ansible_collectionversion_tags.collectionversion_id AS collection_version_id,
+               ansible_collectionversion_tags.tag_id
         FROM ansible_collectionversion_tags
+        INNER JOIN core_content
+            ON core_content.pulp_id = ansible_collectionversion_tags.collectionversion_id
+        {changed_between('core_content.pulp_last_updated', since, until)}
     """
 
 
-def collection_tags_query():
-    return """
+def collection_tags_query(since=None, until=None):
+    return f"""
             SELECT pulp_id AS uuid,
                    pulp_created,
                    pulp_last_updated,
                    name
             FROM ansible_tag
+            {changed_between('pulp_last_updated', since, until)}
     """
 
 
-def collection_version_signatures_query():
-    return """
+def collection_version_signatures_query(since=None, until=None):
+    return f"""
         SELECT "ansible_collectionversionsignature".content_ptr_id AS uuid,
                "core_content".pulp_created,
                "core_content".pulp_last_updated,
@@ -133,22 +156,25 @@ def collection_version_signatures_query():
         FROM ansible_collectionversionsignature
         INNER JOIN core_content
             ON core_content.pulp_id = "ansible_collectionversionsignature".content_ptr_id
+        {changed_between('"core_content".pulp_last_updated', since, until)}
     """
 
 
-def signing_services_query():
-    return """
+def signing_services_query(since=None, until=None):
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
                public_key,
                name
         FROM core_signingservice
+        {changed_between('pulp_last_updated', since, until)}
     """
 
 
-def collection_downloads_query():
-    return """
+def collection_downloads_query(since=None, until=None):
+    # download logs are only ever appended
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
@@ -157,11 +183,12 @@ def collection_downloads_query():
                extra_data->>'org_id' AS org_id,
                user_agent
         FROM ansible_downloadlog
+        {changed_between('pulp_created', since, until)}
     """
 
 
-def collection_download_counts_query():
-    return """
+def collection_download_counts_query(since=None, until=None):
+    return f"""
         SELECT pulp_id AS uuid,
                pulp_created,
                pulp_last_updated,
@@ -169,4 +196,5 @@ def collection_download_counts_query():
                name,
                download_count
         FROM ansible_collectiondownloadcount
+        {changed_between('pulp_last_updated', since, until)}
     """
@@ -31,7 +31,7 @@ def instance_info(since, **kwargs):
 
 @register("ansible_collection_table", "1.0", format="csv", description="Data on ansible_collection")
 def ansible_collection_table(since, full_path, until, **kwargs):
-    source_query = """
+    source_query = f"""
         COPY (
             SELECT "ansible_collection"."pulp_id",
                    "ansible_collection"."pulp_created",
@@ -39,6 +39,7 @@ def ansible_collection_table(since, full_path, until, **kwargs):
                    "ansible_collection"."namespace",
                    "ansible_collection"."name"
             FROM "ansible_collection"
+            {data.changed_between('"ansible_collection"."pulp_last_updated"', since, until)}
         )
         TO STDOUT WITH CSV HEADER
     """
@@ -53,7 +54,7 @@ def ansible_collection_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversion",
 )
 def ansible_collectionversion_table(since, full_path, until, **kwargs):
-    source_query = """COPY (
+    source_query = f"""COPY (
             SELECT "ansible_collectionversion"."content_ptr_id",
                    "core_content"."pulp_created",
                    "core_content"."pulp_last_updated",
@@ -74,6 +75,7 @@ def ansible_collectionversion_table(since, full_path, until, **kwargs):
                 "ansible_collectionversion"."content_ptr_id" =
                 "ansible_collectionversion_tags"."collectionversion_id"
                 )
+            {data.changed_between('"core_content"."pulp_last_updated"', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "ansible_collectionversion", source_query)
@@ -86,9 +88,12 @@ def ansible_collectionversion_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionversionsignature",
 )
 def ansible_collectionversionsignature_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM ansible_collectionversionsignature
+    source_query = f"""COPY (
+            SELECT ansible_collectionversionsignature.*
+            FROM ansible_collectionversionsignature
+            INNER JOIN core_content
+                ON core_content.pulp_id = ansible_collectionversionsignature.content_ptr_id
+            {data.changed_between('core_content.pulp_last_updated', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "ansible_collectionversionsignature", source_query)
@@ -101,9 +106,11 @@ def ansible_collectionversionsignature_table(since, full_path, until, **kwargs):
     description="Data on ansible_collectionimport",
 )
 def ansible_collectionimport_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM ansible_collectionimport
+    source_query = f"""COPY (
+            SELECT ansible_collectionimport.*
+            FROM ansible_collectionimport
+            INNER JOIN core_task ON core_task.pulp_id = ansible_collectionimport.task_id
+            {data.changed_between('core_task.pulp_last_updated', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "ansible_collectionimport", source_query)
@@ -129,9 +136,12 @@ def ansible_collectionimport_table(since, full_path, until, **kwargs):
     description="Data on container_containerrepository",
 )
 def container_containerrepository_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_containerrepository
+    source_query = f"""COPY (
+            SELECT container_containerrepository.*
+            FROM container_containerrepository
+            INNER JOIN core_repository
+                ON core_repository.pulp_id = container_containerrepository.repository_ptr_id
+            {data.changed_between('core_repository.pulp_last_updated', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "container_containerrepository", source_query)
@@ -144,9 +154,11 @@ def container_containerrepository_table(since, full_path, until, **kwargs):
     description="Data on container_containerremote",
 )
 def container_containerremote_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_containerremote
+    source_query = f"""COPY (
+            SELECT container_containerremote.*
+            FROM container_containerremote
+            INNER JOIN core_remote ON core_remote.pulp_id = container_containerremote.remote_ptr_id
+            {data.changed_between('core_remote.pulp_last_updated', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "container_containerremote", source_query)
@@ -154,9 +166,11 @@ def container_containerremote_table(since, full_path, until, **kwargs):
 
 @register("container_tag_table", "1.0", format="csv", description="Data on container_tag")
 def container_tag_table(since, full_path, until, **kwargs):
-    # currently no rows in the table, so no objects to base a query off
-    source_query = """COPY (
-            SELECT * FROM container_tag
+    source_query = f"""COPY (
+            SELECT container_tag.*
+            FROM container_tag
+            INNER JOIN core_content ON core_content.pulp_id = container_tag.content_ptr_id
+            {data.changed_between('core_content.pulp_last_updated', since, until)}
         ) TO STDOUT WITH CSV HEADER
     """
     return _simple_csv(full_path, "container_tag", source_query)
@@ -166,18 +180,20 @@ def container_tag_table(since, full_path, until, **kwargs):
     "galaxy_legacynamespace", "1.0", format="csv", description="Data on galaxy_legacynamespace"
 )
 def galaxy_legacynamespace_table(since, full_path, until, **kwargs):
-    source_query = """COPY (SELECT
+    source_query = f"""COPY (SELECT
             id, created, modified, name, company, avatar_url, description, namespace_id
             FROM galaxy_legacynamespace
+            {data.changed_between('modified', since, until)}
         ) TO STDOUT WITH CSV HEADER"""
     return _simple_csv(full_path, "galaxy_legacynamespace", source_query)
 
 
 @register("galaxy_legacyrole", "1.0", format="csv", description="Data on galaxy_legacyrole")
 def galaxy_legacyrole_table(since, full_path, until, **kwargs):
-    source_query = """COPY (SELECT
+    source_query = f"""COPY (SELECT
             id, created, modified, name, full_metadata, namespace_id
             FROM galaxy_legacyrole
+            {data.changed_between('modified', since, until)}
         ) TO STDOUT WITH CSV HEADER"""
     return _simple_csv(full_path, "galaxy_legacyrole", source_query)
 
@@ -186,6 +202,7 @@ def galaxy_legacyrole_table(since, full_path, until, **kwargs):
     "galaxy_aiindexdenylist", "1.0", format="csv", description="Data on galaxy_aiindexdenylist"
 )
 def galaxy_aiindexdenylist_table(since, full_path, until, **kwargs):
+    # no timestamps in the table, it is always exported in full
     source_query = """COPY (SELECT * FROM galaxy_aiindexdenylist
         ) TO STDOUT WITH CSV HEADER"""
     return _simple_csv(full_path, "galaxy_aiindexdenylist", source_query)
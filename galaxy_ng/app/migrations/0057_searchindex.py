@@ -0,0 +1,151 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+POPULATE_SEARCH_INDEX = """
+INSERT INTO galaxy_searchindex (
+    content_type, collection_id, name, namespace_name, description_text, latest_version,
+    namespace_avatar, content_list, platform_names, tag_names, deprecated, download_count,
+    last_updated, search_vector, modified
+)
+SELECT
+    'collection',
+    cv.collection_id,
+    cv.name,
+    cv.namespace,
+    cv.description,
+    cv.version,
+    ns._avatar_url,
+    cv.contents,
+    '[]'::jsonb,
+    COALESCE(
+        (
+            SELECT jsonb_agg(t.name)
+            FROM ansible_tag t
+            INNER JOIN ansible_collectionversion_tags cvt ON cvt.tag_id = t.pulp_id
+            WHERE cvt.collectionversion_id = cv.content_ptr_id
+        ),
+        '[]'::jsonb
+    ),
+    EXISTS (
+        SELECT 1
+        FROM ansible_ansiblecollectiondeprecated d
+        WHERE d.namespace = cv.namespace AND d.name = cv.name
+    ),
+    COALESCE(
+        (
+            SELECT dc.download_count
+            FROM ansible_collectiondownloadcount dc
+            WHERE dc.namespace = cv.namespace AND dc.name = cv.name
+            LIMIT 1
+        ),
+        0
+    ),
+    c.timestamp_of_interest,
+    cv.search_vector,
+    now()
+FROM ansible_collectionversion cv
+INNER JOIN core_content c ON c.pulp_id = cv.content_ptr_id
+LEFT OUTER JOIN galaxy_namespace ns ON ns.name = cv.namespace
+WHERE cv.is_highest = TRUE;
+
+INSERT INTO galaxy_searchindex (
+    content_type, role_id, name, namespace_name, description_text, latest_version,
+    namespace_avatar, content_list, platform_names, tag_names, deprecated, download_count,
+    last_updated, search_vector, modified
+)
+SELECT
+    'role',
+    r.id,
+    r.name,
+    lns.name,
+    r.full_metadata ->> 'description',
+    r.full_metadata #>> '{versions,-1,version}',
+    ns._avatar_url,
+    '[]'::jsonb,
+    r.full_metadata -> 'platforms',
+    r.full_metadata -> 'tags',
+    FALSE,
+    COALESCE(dc.count, 0),
+    r.created,
+    sv.search_vector,
+    now()
+FROM galaxy_legacyrole r
+INNER JOIN galaxy_legacynamespace lns ON lns.id = r.namespace_id
+LEFT OUTER JOIN galaxy_namespace ns ON ns.id = lns.namespace_id
+LEFT OUTER JOIN galaxy_legacyroledownloadcount dc ON dc.legacyrole_id = r.id
+LEFT OUTER JOIN galaxy_legacyrolesearchvector sv ON sv.role_id = r.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("galaxy", "0056_set_retain_repo_versions_to_validated_repo"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("content_type", models.CharField(editable=False, max_length=16)),
+                ("name", models.CharField(max_length=64)),
+                ("namespace_name", models.CharField(max_length=64)),
+                ("description_text", models.TextField(null=True)),
+                ("latest_version", models.CharField(max_length=128, null=True)),
+                ("namespace_avatar", models.TextField(null=True)),
+                ("content_list", models.JSONField(default=list, null=True)),
+                ("platform_names", models.JSONField(default=list, null=True)),
+                ("tag_names", models.JSONField(default=list, null=True)),
+                ("deprecated", models.BooleanField(default=False)),
+                ("download_count", models.BigIntegerField(default=0)),
+                ("last_updated", models.DateTimeField(null=True)),
+                ("search_vector", django.contrib.postgres.search.SearchVectorField(null=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "collection",
+                    models.OneToOneField(
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_index",
+                        to="ansible.collection",
+                    ),
+                ),
+                (
+                    "role",
+                    models.OneToOneField(
+                        editable=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_index",
+                        to="galaxy.legacyrole",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="galaxy_search_vector_gin"
+                    ),
+                    models.Index(fields=["download_count"], name="galaxy_search_downloads_idx"),
+                    models.Index(fields=["last_updated"], name="galaxy_search_updated_idx"),
+                    models.Index(fields=["name"], name="galaxy_search_name_idx"),
+                    models.Index(fields=["namespace_name"], name="galaxy_search_namespace_idx"),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SEARCH_INDEX,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
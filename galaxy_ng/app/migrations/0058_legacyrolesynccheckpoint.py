@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0057_searchindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LegacyRoleSyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                ("upstream", models.CharField(editable=False, max_length=512, unique=True)),
+                ("next_page", models.IntegerField(null=True)),
+                ("watermark", models.DateTimeField(null=True)),
+                ("run_watermark", models.DateTimeField(null=True)),
+                ("completed", models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("galaxy", "0058_legacyrolesynccheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricsCollectionState",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("collector", models.CharField(max_length=64, unique=True)),
+                ("last_gather", models.DateTimeField(null=True)),
+                ("last_gathered_entries", models.JSONField(default=dict)),
+                ("modified", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+POPULATE_REPOSITORY_VISIBILITY = """
+INSERT INTO galaxy_repositoryvisibility (repository_id, user_id)
+SELECT DISTINCT r.repository_ptr_id, a.user_id
+FROM core_userrole a
+INNER JOIN core_role_permissions rp ON rp.role_id = a.role_id
+INNER JOIN auth_permission p ON p.id = rp.permission_id
+INNER JOIN django_content_type ct ON ct.id = p.content_type_id
+INNER JOIN ansible_ansiblerepository r ON r.repository_ptr_id::text = a.object_id
+WHERE ct.app_label = 'ansible' AND p.codename = 'view_ansiblerepository';
+
+INSERT INTO galaxy_repositoryvisibility (repository_id, group_id)
+SELECT DISTINCT r.repository_ptr_id, a.group_id
+FROM core_grouprole a
+INNER JOIN core_role_permissions rp ON rp.role_id = a.role_id
+INNER JOIN auth_permission p ON p.id = rp.permission_id
+INNER JOIN django_content_type ct ON ct.id = p.content_type_id
+INNER JOIN ansible_ansiblerepository r ON r.repository_ptr_id::text = a.object_id
+WHERE ct.app_label = 'ansible' AND p.codename = 'view_ansiblerepository';
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("galaxy", "0059_metricscollectionstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RepositoryVisibility",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="auth.group",
+                    ),
+                ),
+                (
+                    "repository",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="ansible.ansiblerepository",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.CheckConstraint(
+                        check=models.Q(
+                            models.Q(("group__isnull", True), ("user__isnull", False)),
+                            models.Q(("group__isnull", False), ("user__isnull", True)),
+                            _connector="OR",
+                        ),
+                        name="galaxy_repovisibility_user_xor_group",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("user__isnull", False)),
+                        fields=("user", "repository"),
+                        name="galaxy_repovisibility_user_uniq",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("group__isnull", False)),
+                        fields=("group", "repository"),
+                        name="galaxy_repovisibility_group_uniq",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_REPOSITORY_VISIBILITY,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
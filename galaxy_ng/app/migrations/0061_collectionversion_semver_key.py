@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# Must encode the versions exactly like galaxy_ng.app.utils.semver.sort_key()
+CREATE_SEMVER_KEY_FUNCTION = """
+CREATE OR REPLACE FUNCTION galaxy_semver_key(
+    major integer, minor integer, patch integer, prerelease text
+) RETURNS text AS $$
+    SELECT
+        lpad(major::text, 10, '0') || '.'
+        || lpad(minor::text, 10, '0') || '.'
+        || lpad(patch::text, 10, '0')
+        || CASE
+            WHEN prerelease = '' THEN '~'
+            ELSE '-' || (
+                SELECT string_agg(
+                    CASE
+                        WHEN part ~ '^[0-9]+$' THEN '0' || lpad(length(part)::text, 2, '0') || part
+                        ELSE '1' || part
+                    END,
+                    '!' ORDER BY idx
+                )
+                FROM unnest(string_to_array(prerelease, '.')) WITH ORDINALITY AS p(part, idx)
+            )
+        END
+$$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+"""
+
+DROP_SEMVER_KEY_FUNCTION = "DROP FUNCTION IF EXISTS galaxy_semver_key(integer, integer, integer, text);"
+
+CREATE_SEMVER_KEY_INDEX = """
+CREATE INDEX IF NOT EXISTS galaxy_collectionversion_semver_key_idx
+ON ansible_collectionversion (
+    collection_id,
+    (galaxy_semver_key(version_major, version_minor, version_patch, version_prerelease) COLLATE "C")
+);
+"""
+
+DROP_SEMVER_KEY_INDEX = "DROP INDEX IF EXISTS galaxy_collectionversion_semver_key_idx;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("galaxy", "0060_repositoryvisibility"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_SEMVER_KEY_FUNCTION, reverse_sql=DROP_SEMVER_KEY_FUNCTION),
+        migrations.RunSQL(sql=CREATE_SEMVER_KEY_INDEX, reverse_sql=DROP_SEMVER_KEY_INDEX),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Every counter starts stale, the first tag listing computes them.
+POPULATE_TAG_COUNTS = """
+INSERT INTO galaxy_collectiontagcount (tag_id, count, highest_count, stale)
+SELECT pulp_id, 0, 0, true FROM ansible_tag;
+
+INSERT INTO galaxy_legacyroletagcount (tag_id, count, stale)
+SELECT id, 0, true FROM galaxy_legacyroletag;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ansible", "0055_alter_collectionversion_version_alter_role_version"),
+        ("galaxy", "0061_collectionversion_semver_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CollectionTagCount",
+            fields=[
+                (
+                    "tag",
+                    models.OneToOneField(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="usage",
+                        serialize=False,
+                        to="ansible.tag",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                ("highest_count", models.IntegerField(default=0)),
+                ("stale", models.BooleanField(default=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["count"], name="galaxy_colltagcount_count_idx"),
+                    models.Index(
+                        fields=["highest_count"], name="galaxy_colltagcount_highest_idx"
+                    ),
+                    models.Index(
+                        condition=models.Q(("stale", True)),
+                        fields=["stale"],
+                        name="galaxy_colltagcount_stale_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="LegacyRoleTagCount",
+            fields=[
+                (
+                    "tag",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="usage",
+                        serialize=False,
+                        to="galaxy.legacyroletag",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                ("stale", models.BooleanField(default=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["count"], name="galaxy_roletagcount_count_idx"),
+                    models.Index(
+                        condition=models.Q(("stale", True)),
+                        fields=["stale"],
+                        name="galaxy_roletagcount_stale_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(sql=POPULATE_TAG_COUNTS, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -9,9 +9,13 @@ from .container import (
     ContainerRegistryRemote,
     ContainerRegistryRepos,
 )
+from .metrics import MetricsCollectionState
 from .namespace import Namespace, NamespaceLink
 from .organization import Organization, Team
+from .search import SearchIndex
 from .synclist import SyncList
+from .tags import CollectionTagCount
+from .visibility import RepositoryVisibility
 
 from pulp_ansible.app.models import (
     AnsibleRepository,
@@ -26,6 +30,8 @@ __all__ = (
     "AIIndexDenyList",
     # collectionimport
     "CollectionImport",
+    # tags
+    "CollectionTagCount",
     # container
     "ContainerDistribution",
     "ContainerDistroReadme",
@@ -34,11 +40,17 @@ __all__ = (
     "ContainerRegistryRepos",
     # auth
     "Group",
+    # metrics
+    "MetricsCollectionState",
     # namespace
     "Namespace",
     "NamespaceLink",
     # organization
     "Organization",
+    # visibility
+    "RepositoryVisibility",
+    # search
+    "SearchIndex",
     # config
     "Setting",
     # synclist
@@ -156,9 +156,13 @@ class Setting(LifecycleModelMixin, models.Model):
 
     @classmethod
     def update_cache(cls):
-        from galaxy_ng.app.tasks.settings_cache import update_setting_cache  # noqa
+        from galaxy_ng.app.tasks.settings_cache import (  # noqa
+            invalidate_local_settings_cache,
+            update_setting_cache,
+        )
 
         update_setting_cache(cls.as_dict())
+        invalidate_local_settings_cache()
 
     @hook(AFTER_CREATE, on_commit=True)
     def _hook_update_create(self):
@@ -0,0 +1,24 @@
+from django.db import models
+
+__all__ = ("MetricsCollectionState",)
+
+
+class MetricsCollectionState(models.Model):
+    """
+    Bookkeeping of a metrics collector between gatherings.
+
+    Fields:
+        collector: Name of the collector, e.g. "automation_analytics".
+        last_gather: End of the interval of the last successful gathering.
+        last_gathered_entries: Maps each collection key to the end of the
+            last interval it was successfully gathered for, as ISO 8601
+            strings. Incremental CSV exports start from there.
+    """
+
+    collector = models.CharField(max_length=64, unique=True)
+    last_gather = models.DateTimeField(null=True)
+    last_gathered_entries = models.JSONField(default=dict)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.collector
@@ -0,0 +1,84 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+from pulp_ansible.app.models import Collection
+
+__all__ = ("SearchIndex",)
+
+
+class SearchIndex(models.Model):
+    """
+    A denormalized row of the unified collection + role search.
+
+    There is one row per collection (pointing to its highest version)
+    and one row per legacy role. The columns hold everything the
+    `_ui/v1/search/` endpoint needs, so listing, filtering and sorting
+    never has to aggregate tags, count downloads or resolve avatars.
+
+    Rows are maintained by the signal handlers and rebuilt by the
+    `rebuild-search-index` management command, see
+    `galaxy_ng.app.tasks.search` for details.
+
+    Fields:
+        content_type: Either "collection" or "role".
+        name: Collection or role name.
+        namespace_name: Collection namespace or legacy namespace name.
+        description_text: Description of the content.
+        latest_version: Highest collection version or last role version.
+        namespace_avatar: Avatar url of the (v3) namespace.
+        content_list: Contents of the collection version (always [] for roles).
+        platform_names: Platforms of the role (always [] for collections).
+        tag_names: List of tag names.
+        deprecated: Whether the collection is deprecated (always False for roles).
+        download_count: Aggregated download counter.
+        last_updated: Time the content was last updated.
+        search_vector: Precomputed full text search vector.
+
+    Relations:
+        collection: Reference to the collection when content_type is "collection".
+        role: Reference to the legacy role when content_type is "role".
+    """
+
+    content_type = models.CharField(max_length=16, editable=False)
+
+    collection = models.OneToOneField(
+        Collection,
+        null=True,
+        editable=False,
+        on_delete=models.CASCADE,
+        related_name="search_index",
+    )
+    role = models.OneToOneField(
+        "galaxy.LegacyRole",
+        null=True,
+        editable=False,
+        on_delete=models.CASCADE,
+        related_name="search_index",
+    )
+
+    name = models.CharField(max_length=64)
+    namespace_name = models.CharField(max_length=64)
+    description_text = models.TextField(null=True)
+    latest_version = models.CharField(max_length=128, null=True)
+    namespace_avatar = models.TextField(null=True)
+    content_list = models.JSONField(null=True, default=list)
+    platform_names = models.JSONField(null=True, default=list)
+    tag_names = models.JSONField(null=True, default=list)
+    deprecated = models.BooleanField(default=False)
+    download_count = models.BigIntegerField(default=0)
+    last_updated = models.DateTimeField(null=True)
+    search_vector = SearchVectorField(null=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __repr__(self):
+        return f'<SearchIndex: {self.content_type} {self.namespace_name}.{self.name}>'
+
+    class Meta:
+        indexes = (
+            GinIndex(fields=["search_vector"], name="galaxy_search_vector_gin"),
+            models.Index(fields=["download_count"], name="galaxy_search_downloads_idx"),
+            models.Index(fields=["last_updated"], name="galaxy_search_updated_idx"),
+            models.Index(fields=["name"], name="galaxy_search_name_idx"),
+            models.Index(fields=["namespace_name"], name="galaxy_search_namespace_idx"),
+        )
@@ -0,0 +1,52 @@
+from django.db import models
+from django.db.models import Q
+
+from pulp_ansible.app.models import Tag
+
+__all__ = ("CollectionTagCount",)
+
+
+class CollectionTagCount(models.Model):
+    """
+    The number of collection versions a tag is attached to.
+
+    Lets `_ui/v1/tags/collections/` list and sort tags by usage without
+    counting the collection version tags on every request.
+
+    Rows are marked stale by the signal handlers when tags are attached or
+    detached, or when the highest versions change, and recomputed before the
+    next listing. The `rebuild-tag-counts` management command recomputes
+    every row, see `galaxy_ng.app.tasks.tag_counts` for details.
+
+    Fields:
+        count: Number of collection versions with the tag.
+        highest_count: Number of those versions which are the highest version
+            of their collection in at least one distributed repository.
+        stale: Whether the counts must be recomputed.
+
+    Relations:
+        tag: The counted tag.
+    """
+
+    tag = models.OneToOneField(
+        Tag,
+        primary_key=True,
+        editable=False,
+        on_delete=models.CASCADE,
+        related_name="usage",
+    )
+    count = models.IntegerField(default=0)
+    highest_count = models.IntegerField(default=0)
+    stale = models.BooleanField(default=True)
+
+    def __repr__(self):
+        return f"<CollectionTagCount: {self.tag_id} {self.count}>"
+
+    class Meta:
+        indexes = (
+            models.Index(fields=["count"], name="galaxy_colltagcount_count_idx"),
+            models.Index(fields=["highest_count"], name="galaxy_colltagcount_highest_idx"),
+            models.Index(
+                fields=["stale"], condition=Q(stale=True), name="galaxy_colltagcount_stale_idx"
+            ),
+        )
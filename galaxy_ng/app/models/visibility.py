@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+
+from pulp_ansible.app.models import AnsibleRepository
+
+__all__ = ("RepositoryVisibility",)
+
+
+class RepositoryVisibility(models.Model):
+    """
+    A user or group that can view a (private) ansible repository.
+
+    One row per repository on which the user or the group has an object role
+    granting `ansible.view_ansiblerepository`, so that scoping repositories and
+    distributions is an indexed `repository_id IN (...)` instead of matching
+    every row against the role tables. Group members are resolved at query
+    time, so membership changes need no maintenance.
+
+    Rows are maintained by the signal handlers and rebuilt by the
+    `rebuild-repository-visibility` management command, see
+    `galaxy_ng.app.access_control.visibility` for details.
+
+    Relations:
+        repository: The repository the user or group can view.
+        user: The user holding the role, if it is a user role.
+        group: The group holding the role, if it is a group role.
+    """
+
+    repository = models.ForeignKey(
+        AnsibleRepository,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    group = models.ForeignKey(
+        "auth.Group",
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    def __repr__(self):
+        owner = f"user={self.user_id}" if self.user_id else f"group={self.group_id}"
+        return f"<RepositoryVisibility: {owner} repository={self.repository_id}>"
+
+    class Meta:
+        constraints = (
+            models.CheckConstraint(
+                check=(
+                    Q(user__isnull=False, group__isnull=True)
+                    | Q(user__isnull=True, group__isnull=False)
+                ),
+                name="galaxy_repovisibility_user_xor_group",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "repository"],
+                condition=Q(user__isnull=False),
+                name="galaxy_repovisibility_user_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["group", "repository"],
+                condition=Q(group__isnull=False),
+                name="galaxy_repovisibility_group_uniq",
+            ),
+        )
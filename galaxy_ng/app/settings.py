@@ -101,6 +101,8 @@ MIDDLEWARE = [
     'pulpcore.middleware.DomainMiddleware',
     'ansible_base.lib.middleware.logging.log_request.LogTracebackMiddleware',
     # END: Pulp standard middleware
+    'galaxy_ng.app.common.middleware.RequestMetricsMiddleware',
+    'galaxy_ng.app.common.middleware.ResponseCacheMiddleware',
     'django_prometheus.middleware.PrometheusAfterMiddleware',
 ]
 MIDDLEWARE += ('crum.CurrentRequestUserMiddleware',)
@@ -363,6 +365,67 @@ AUTHENTICATION_BACKEND_PRESETS_DATA = {
 # Enable the api/$PREFIX/v1 api for legacy roles.
 GALAXY_ENABLE_LEGACY_ROLES = False
 
+# When set to True and Redis is available, legacy role downloads are counted
+# in Redis and written to the database in bulk by the periodic task
+# galaxy_ng.app.tasks.download_counts.flush_role_download_counts
+GALAXY_BUFFER_DOWNLOAD_COUNTS = False
+
+# Number of concurrent requests made by the upstream iterators in
+# galaxy_ng.app.utils.galaxy when syncing from another galaxy.
+GALAXY_UPSTREAM_FETCH_CONCURRENCY = 8
+
+# Per view latency, response size and SQL metrics exported to prometheus by
+# galaxy_ng.app.common.middleware.RequestMetricsMiddleware. The SQL queries are
+# only counted on a sample of the requests (0.0 - 1.0).
+GALAXY_REQUEST_METRICS_ENABLED = True
+GALAXY_REQUEST_METRICS_SAMPLE_RATE = 0.1
+# Log the sampled requests slower than this many seconds (None disables it)
+# with their slowest queries, and their query plans with ..._EXPLAIN = True.
+GALAXY_SLOW_REQUEST_THRESHOLD = None
+GALAXY_SLOW_REQUEST_EXPLAIN = False
+GALAXY_SLOW_REQUEST_LOGGED_QUERIES = 5
+
+# Insights mode collection downloads are relayed from the content app through
+# a per process pool of keep-alive connections, see
+# galaxy_ng.app.utils.content_proxy.
+GALAXY_ARTIFACT_PROXY_CHUNK_SIZE = 64 * 1024
+GALAXY_ARTIFACT_PROXY_POOL_SIZE = 10
+GALAXY_ARTIFACT_PROXY_TIMEOUT = 60
+# Set to "X-Accel-Redirect" (nginx) to let the webserver stream the artifacts
+# from its internal GALAXY_ARTIFACT_PROXY_ACCEL_LOCATION instead.
+GALAXY_ARTIFACT_PROXY_ACCEL_HEADER = None
+GALAXY_ARTIFACT_PROXY_ACCEL_LOCATION = "/_galaxy_content/"
+
+# Seconds the namespace summaries of the collection serializers are kept in the
+# django cache (0 only caches them for the duration of a request).
+GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT = 0
+
+# Cache the responses of the anonymous read endpoints in Redis, invalidated when
+# their content changes, see galaxy_ng.app.common.response_cache.
+GALAXY_RESPONSE_CACHE_ENABLED = False
+GALAXY_RESPONSE_CACHE_TTL = 300
+
+# Container config blobs kept per process for the manifest detail endpoint, as
+# json strings bounded by GALAXY_CONFIG_BLOB_CACHE_MAX_BYTES of memory and parsed
+# on each hit, and optionally in Redis, see galaxy_ng.app.utils.config_blobs.
+GALAXY_CONFIG_BLOB_CACHE_MAX_BYTES = 32 * 1024 * 1024
+GALAXY_CONFIG_BLOB_CACHE_MAX_BLOB_SIZE = 1024 * 1024
+GALAXY_CONFIG_BLOB_CACHE_REDIS = False
+GALAXY_CONFIG_BLOB_CACHE_REDIS_TTL = 60 * 60 * 24
+
+# Registry syncs skip the repositories whose upstream tags and digests match
+# the synced content, and run at most GALAXY_REGISTRY_SYNC_CONCURRENCY syncs of
+# a registry at a time, see galaxy_ng.app.tasks.registry_sync. Signatures can
+# change without the tags, so the repositories of remotes with a sigstore or of
+# registries serving signatures (X-Registry-Supports-Signatures) are always synced.
+GALAXY_REGISTRY_SYNC_SKIP_UNCHANGED = True
+GALAXY_REGISTRY_SYNC_CONCURRENCY = 4
+GALAXY_REGISTRY_SYNC_PROBE_CONCURRENCY = 10
+
+# Red Hat container catalog API indexed for the execution environments of the
+# registry.redhat.io registries, see galaxy_ng.app.tasks.index_registry.
+GALAXY_CONTAINER_CATALOG_API = "https://catalog.redhat.com/api/containers/v1/repositories"
+
 SOCIAL_AUTH_GITHUB_BASE_URL = os.environ.get('SOCIAL_AUTH_GITHUB_BASE_URL', 'https://github.com')
 SOCIAL_AUTH_GITHUB_API_URL = os.environ.get('SOCIAL_AUTH_GITHUB_API_URL', 'https://api.github.com')
 SOCIAL_AUTH_GITHUB_KEY = os.environ.get('SOCIAL_AUTH_GITHUB_KEY')
@@ -395,6 +458,9 @@ GALAXY_METRICS_COLLECTION_ORG_ID = None
 # When set to True will enable the DYNAMIC settings feature
 # Individual allowed dynamic keys are set on ./dynamic_settings.py
 GALAXY_DYNAMIC_SETTINGS = False
+# Seconds each process reuses its copy of the dynamic settings, changes are
+# pushed through Redis so this only bounds the delay if a message is lost.
+GALAXY_SETTINGS_LOCAL_CACHE_TTL = 5
 
 # DJANGO ANSIBLE BASE RESOURCES REGISTRY SETTINGS
 ANSIBLE_BASE_RESOURCE_CONFIG_MODULE = "galaxy_ng.app.api.resource_api"
@@ -11,7 +11,9 @@ import logging
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 from django.db.models.signals import post_delete
+from django.db.models.signals import pre_delete
 from django.db.models.signals import m2m_changed
+from django.db import transaction
 from django.db.models import CharField, Value
 from django.db.models.functions import Concat
 from django.contrib.contenttypes.models import ContentType
@@ -20,14 +22,27 @@ from django.conf import settings
 from rest_framework.exceptions import ValidationError
 from django.apps import apps
 from pulp_ansible.app.models import (
+    AnsibleCollectionDeprecated,
     AnsibleDistribution,
     AnsibleRepository,
     Collection,
+    CollectionDownloadCount,
+    CollectionVersion,
     AnsibleNamespaceMetadata,
+    CrossRepositoryCollectionVersionIndex,
 )
-from galaxy_ng.app.models import Namespace, User, Team
+from galaxy_ng.app.models import Namespace, SyncList, User, Team
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+)
+from galaxy_ng.app.tasks import search, tag_counts
+from galaxy_ng.app.api.v3.serializers import namespace as namespace_serializers
+from galaxy_ng.app.access_control import visibility
+from galaxy_ng.app.common import response_cache
 from galaxy_ng.app.migrations._dab_rbac import copy_roles_to_role_definitions
-from pulpcore.plugin.models import ContentRedirectContentGuard
+from pulpcore.plugin.models import ContentRedirectContentGuard, RepositoryVersion
 
 from ansible_base.rbac.validators import validate_permissions_for_model
 from ansible_base.rbac.models import (
@@ -116,6 +131,233 @@ def associate_namespace_metadata(sender, instance, created, **kwargs):
         _update_metadata()
 
 
+# ___ SEARCH INDEX ___
+
+
+@receiver(post_save, sender=CollectionVersion)
+@receiver(post_delete, sender=CollectionVersion)
+@receiver(post_save, sender=AnsibleCollectionDeprecated)
+@receiver(post_delete, sender=AnsibleCollectionDeprecated)
+def update_collection_search_index(sender, instance, **kwargs):
+    """Refresh the search index row of the collection the instance belongs to."""
+    namespace, name = instance.namespace, instance.name
+    transaction.on_commit(lambda: search.index_collections(namespace=namespace, name=name))
+
+
+@receiver(post_save, sender=CollectionDownloadCount)
+def update_collection_download_count_search_index(sender, instance, **kwargs):
+    """Copy the download counter of a collection, saved on every download, to the search index."""
+    namespace, name = instance.namespace, instance.name
+    transaction.on_commit(
+        lambda: search.index_collection_download_count(namespace=namespace, name=name)
+    )
+
+
+@receiver(post_save, sender=LegacyRole)
+def update_role_search_index(sender, instance, **kwargs):
+    """Refresh the search index row of a legacy role."""
+    role_ids = [instance.pk]
+    transaction.on_commit(lambda: search.index_roles(role_ids=role_ids))
+
+
+@receiver(post_save, sender=LegacyRoleDownloadCount)
+def update_role_download_count_search_index(sender, instance, **kwargs):
+    """Refresh the search index row of a legacy role when its downloads change."""
+    role_ids = [instance.legacyrole_id]
+    transaction.on_commit(lambda: search.index_roles(role_ids=role_ids))
+
+
+@receiver(post_save, sender=LegacyNamespace)
+def update_legacy_namespace_search_index(sender, instance, created, **kwargs):
+    """Refresh the search index rows of the roles of a legacy namespace."""
+    if created:
+        return
+    role_ids = list(instance.roles.values_list("pk", flat=True))
+    if role_ids:
+        transaction.on_commit(lambda: search.index_roles(role_ids=role_ids))
+
+
+@receiver(post_save, sender=Namespace)
+def update_namespace_search_index(sender, instance, created, **kwargs):
+    """Propagate namespace avatar changes to the search index."""
+    if created:
+        return
+    transaction.on_commit(lambda: search.index_namespace_avatar(instance))
+
+
+# ___ Repository visibility ___
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+def update_user_repository_visibility(sender, instance, **kwargs):
+    """Recompute which repositories the user can view through this object role."""
+    if instance.object_id is None:
+        return
+    visibility.refresh_user_visibility(
+        user_ids=[instance.user_id], object_ids=[instance.object_id]
+    )
+
+
+@receiver(post_save, sender=GroupRole)
+@receiver(post_delete, sender=GroupRole)
+def update_group_repository_visibility(sender, instance, **kwargs):
+    """Recompute which repositories the group can view through this object role."""
+    if instance.object_id is None:
+        return
+    visibility.refresh_group_visibility(
+        group_ids=[instance.group_id], object_ids=[instance.object_id]
+    )
+
+
+def update_role_repository_visibility(instance, action, model, pk_set, reverse, **kwargs):
+    """A role gained or lost permissions, recompute the objects it is assigned on."""
+    if action.startswith("pre_"):
+        return
+    if reverse:
+        # instance is a permission, pk_set the affected roles (None when cleared)
+        if pk_set is None:
+            visibility.rebuild_repository_visibility()
+            return
+        role_ids = list(pk_set)
+    else:
+        role_ids = [instance.pk]
+    visibility.refresh_role_visibility(role_ids)
+
+
+m2m_changed.connect(update_role_repository_visibility, sender=Role.permissions.through)
+
+
+# ___ Namespace summaries ___
+
+
+@receiver(post_save, sender=Namespace)
+@receiver(post_delete, sender=Namespace)
+def invalidate_namespace_summary(sender, instance, **kwargs):
+    """Drop the cached NamespaceSummarySerializer data of a changed namespace."""
+    namespace_serializers.invalidate_namespace_summary(instance.name)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+@receiver(post_save, sender=GroupRole)
+@receiver(post_delete, sender=GroupRole)
+def invalidate_namespace_summary_roles(sender, instance, **kwargs):
+    """The users and groups of a namespace summary changed with its object roles."""
+    if instance.object_id is None or not settings.get("GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT", 0):
+        return
+    if instance.content_type_id != ContentType.objects.get_for_model(Namespace).pk:
+        return
+    for name in Namespace.objects.filter(pk=instance.object_id).values_list("name", flat=True):
+        namespace_serializers.invalidate_namespace_summary(name)
+
+
+# ___ Tag counts ___
+
+
+def _changed_tag_ids(instance, action, reverse, pk_set):
+    """The tags an m2m_changed of a `tags` field affects, None for the ignored actions."""
+    if action == "pre_clear" and not reverse:
+        return list(instance.tags.values_list("pk", flat=True))
+    if action in ("post_add", "post_remove", "pre_clear"):
+        return [instance.pk] if reverse else list(pk_set)
+    return None
+
+
+def mark_collection_tag_counts(instance, action, reverse, pk_set, **kwargs):
+    """Tags were attached to or detached from collection versions."""
+    tag_ids = _changed_tag_ids(instance, action, reverse, pk_set)
+    if tag_ids:
+        transaction.on_commit(lambda: tag_counts.mark_collection_tags_stale(tag_ids=tag_ids))
+
+
+def mark_role_tag_counts(instance, action, reverse, pk_set, **kwargs):
+    """Tags were attached to or detached from legacy roles."""
+    tag_ids = _changed_tag_ids(instance, action, reverse, pk_set)
+    if tag_ids:
+        transaction.on_commit(lambda: tag_counts.mark_role_tags_stale(tag_ids=tag_ids))
+
+
+m2m_changed.connect(mark_collection_tag_counts, sender=CollectionVersion.tags.through)
+m2m_changed.connect(mark_role_tag_counts, sender=LegacyRole.tags.through)
+
+
+@receiver(pre_delete, sender=CollectionVersion)
+def mark_deleted_collection_version_tag_counts(sender, instance, **kwargs):
+    """The tags of a deleted collection version are detached with it."""
+    tag_ids = list(instance.tags.values_list("pk", flat=True))
+    transaction.on_commit(lambda: tag_counts.mark_collection_tags_stale(tag_ids=tag_ids))
+
+
+@receiver(pre_delete, sender=LegacyRole)
+def mark_deleted_role_tag_counts(sender, instance, **kwargs):
+    """The tags of a deleted role are detached with it."""
+    tag_ids = list(instance.tags.values_list("pk", flat=True))
+    transaction.on_commit(lambda: tag_counts.mark_role_tags_stale(tag_ids=tag_ids))
+
+
+@receiver(post_save, sender=CrossRepositoryCollectionVersionIndex)
+@receiver(post_delete, sender=CrossRepositoryCollectionVersionIndex)
+def mark_highest_version_tag_counts(sender, instance, **kwargs):
+    """The index flags the highest versions counted in CollectionTagCount.highest_count."""
+    version_ids = [instance.collection_version_id]
+    transaction.on_commit(
+        lambda: tag_counts.mark_collection_tags_stale(collection_version_ids=version_ids)
+    )
+
+
+# ___ Response cache ___
+
+
+@receiver(post_save, sender=RepositoryVersion)
+def bump_collections_response_cache(sender, instance, **kwargs):
+    """A new repository version changes what the collection endpoints show."""
+    if instance.complete and instance.repository.pulp_type.startswith("ansible."):
+        response_cache.bump_generation_on_commit("collections")
+
+
+@receiver(post_save, sender=AnsibleCollectionDeprecated)
+@receiver(post_delete, sender=AnsibleCollectionDeprecated)
+@receiver(post_save, sender=AnsibleDistribution)
+@receiver(post_delete, sender=AnsibleDistribution)
+def bump_collections_response_cache_metadata(sender, instance, **kwargs):
+    """Deprecations and distributions change what the collection endpoints show."""
+    response_cache.bump_generation_on_commit("collections")
+
+
+@receiver(post_save, sender=LegacyRole)
+@receiver(post_delete, sender=LegacyRole)
+@receiver(post_save, sender=LegacyNamespace)
+@receiver(post_delete, sender=LegacyNamespace)
+def bump_roles_response_cache(sender, instance, **kwargs):
+    """Invalidate the cached responses of the legacy role endpoints."""
+    response_cache.bump_generation_on_commit("roles")
+
+
+@receiver(post_save, sender=Namespace)
+@receiver(post_delete, sender=Namespace)
+def bump_namespaces_response_cache(sender, instance, **kwargs):
+    """Invalidate the cached responses showing namespace details."""
+    response_cache.bump_generation_on_commit("namespaces")
+
+
+@receiver(post_save, sender=SyncList)
+@receiver(post_delete, sender=SyncList)
+def bump_synclists_response_cache(sender, instance, **kwargs):
+    """Invalidate the cached excludes of the synclists."""
+    response_cache.bump_generation_on_commit("synclists")
+
+
+def bump_synclists_response_cache_m2m(action, **kwargs):
+    """The collections or namespaces of a synclist changed."""
+    if action.startswith("post_"):
+        response_cache.bump_generation_on_commit("synclists")
+
+
+m2m_changed.connect(bump_synclists_response_cache_m2m, sender=SyncList.collections.through)
+m2m_changed.connect(bump_synclists_response_cache_m2m, sender=SyncList.namespaces.through)
+
+
 # ___ DAB RBAC ___
 
 TEAM_MEMBER_ROLE = 'Galaxy Team Member'
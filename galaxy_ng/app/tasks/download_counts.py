@@ -0,0 +1,126 @@
+"""tasks/download_counts.py
+
+Buffered download counters for legacy roles.
+
+`ansible-galaxy role install` hits `api/v1/roles/?owner__username=..&name=..`
+and every such request counts as a download. Incrementing the
+`LegacyRoleDownloadCount` row synchronously means a `get_or_create`, a
+`select_for_update` and a `save` on the read path, and heavy row lock
+contention on popular roles.
+
+When `GALAXY_BUFFER_DOWNLOAD_COUNTS` is enabled and Redis is available the
+increments are accumulated in a Redis hash with `HINCRBY` and applied to the
+database in bulk by `flush_role_download_counts`, which must be scheduled
+as a periodic task e.g:
+
+    django-admin task-scheduler --id flush_role_download_counts --interval 1 \
+        --path "galaxy_ng.app.tasks.download_counts.flush_role_download_counts"
+
+If Redis is unavailable the counter is incremented synchronously as before.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.utils import InternalError as DatabaseInternalError
+
+from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
+from galaxy_ng.app.tasks import search
+from galaxy_ng.app.tasks.settings_cache import connection_error_wrapper, get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+ROLE_DOWNLOADS_KEY = "GALAXY_ROLE_DOWNLOAD_COUNTS"
+
+# A single statement adds every buffered delta, creating missing counters
+# and ignoring roles that were deleted in the meantime.
+FLUSH_ROLE_DOWNLOADS_SQL = """
+INSERT INTO galaxy_legacyroledownloadcount (legacyrole_id, count)
+SELECT d.role_id, d.delta
+FROM unnest(%s::integer[], %s::integer[]) AS d(role_id, delta)
+WHERE EXISTS (SELECT 1 FROM galaxy_legacyrole r WHERE r.id = d.role_id)
+ON CONFLICT (legacyrole_id) DO UPDATE
+    SET count = galaxy_legacyroledownloadcount.count + EXCLUDED.count
+"""
+
+
+def count_role_download(role):
+    """Count one download of a legacy role, buffered when possible."""
+    if settings.get("GALAXY_BUFFER_DOWNLOAD_COUNTS", False) and _buffer_role_download(role.pk):
+        return
+    _count_role_download_sync(role)
+
+
+@connection_error_wrapper(default=lambda: False)
+def _buffer_role_download(role_id):
+    conn = get_redis_connection()
+    if conn is None:
+        return False
+    conn.hincrby(ROLE_DOWNLOADS_KEY, role_id, 1)
+    return True
+
+
+def _count_role_download_sync(role):
+    with transaction.atomic():
+        try:
+            # attempt to get or create the counter first
+            counter, _ = LegacyRoleDownloadCount.objects.get_or_create(legacyrole=role)
+
+            # now lock the row so that we avoid race conditions
+            counter = LegacyRoleDownloadCount.objects.select_for_update().get(
+                pk=counter.pk
+            )
+
+            # increment and save
+            counter.count += 1
+            counter.save()
+        except DatabaseInternalError as e:
+            # Fail gracefully if the database is in read-only mode.
+            if "read-only" not in str(e):
+                raise e
+
+
+@connection_error_wrapper(default=dict)
+def _drain_role_downloads():
+    """Atomically read and reset the buffered counters."""
+    conn = get_redis_connection()
+    if conn is None:
+        return {}
+    pipe = conn.pipeline(transaction=True)
+    pipe.hgetall(ROLE_DOWNLOADS_KEY)
+    pipe.delete(ROLE_DOWNLOADS_KEY)
+    buffered, _ = pipe.execute()
+    return {int(role_id): int(delta) for role_id, delta in buffered.items()}
+
+
+@connection_error_wrapper
+def _restore_role_downloads(deltas):
+    conn = get_redis_connection()
+    if conn is None:
+        return
+    pipe = conn.pipeline(transaction=False)
+    for role_id, delta in deltas.items():
+        pipe.hincrby(ROLE_DOWNLOADS_KEY, role_id, delta)
+    pipe.execute()
+
+
+def flush_role_download_counts():
+    """Apply the buffered role download counters to the database."""
+    deltas = _drain_role_downloads()
+    if not deltas:
+        return 0
+
+    role_ids = list(deltas.keys())
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(FLUSH_ROLE_DOWNLOADS_SQL, [role_ids, [deltas[r] for r in role_ids]])
+    except Exception:
+        # put the counts back so the next flush can retry them
+        _restore_role_downloads(deltas)
+        raise
+
+    search.index_roles(role_ids=role_ids)
+    logger.info(
+        "Flushed %s downloads of %s roles", sum(deltas.values()), len(role_ids)
+    )
+    return len(role_ids)
@@ -1,8 +1,13 @@
+import asyncio
 import json
 import logging
+import math
 from urllib.parse import quote, urlencode
 
+from django.conf import settings
 from django.core import exceptions
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.http.request import HttpRequest
 
@@ -19,9 +24,6 @@ from galaxy_ng.app import models
 log = logging.getLogger(__name__)
 
 
-CATALOG_API = "https://catalog.redhat.com/api/containers/v1/repositories"
-
-
 class CouldNotCreateContainerError(Exception):
     def __init__(self, remote_name, error=""):
         self.message = _("Failed to create container {remote_name}. {error}").format(
@@ -123,34 +125,133 @@ def create_or_update_remote_container(container_data, registry_pk, request_data)
         _update_distro_readme_and_description(distro, container_data)
 
 
-def index_execution_environments_from_redhat_registry(registry_pk, request_data):
-    registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
-    remotes = []
-
+async def _fetch_catalog_page(registry, page):
     query = {
         "filter": (
             "build_categories=in=('Automation execution environment') "
             "and release_categories=in=('Generally Available')"
         ),
-        "page": 0,
+        "page": page,
         "sort_by": "creation_date[asc]"
     }
+    url = settings.GALAXY_CONTAINER_CATALOG_API + "?" + urlencode(query, quote_via=quote)
+    # the downloaders of the registry share its session and concurrency limit
+    download_result = await registry.get_downloader(url=url).run()
+    with open(download_result.path) as fd:
+        return json.load(fd)
+
+
+def _fetch_catalog(registry):
+    """Returns the containers in the catalog, by name."""
+
+    async def fetch():
+        pages = [await _fetch_catalog_page(registry, 0)]
+        total = pages[0].get("total")
+        if total is not None and pages[0]['page_size']:
+            page_count = math.ceil(total / pages[0]['page_size'])
+            pages.extend(await asyncio.gather(
+                *(_fetch_catalog_page(registry, page) for page in range(1, page_count))
+            ))
+        else:
+            while len(pages[-1]['data']) == pages[-1]['page_size']:
+                pages.append(await _fetch_catalog_page(registry, len(pages)))
+        return pages
+
+    containers = {}
+    for page in asyncio.get_event_loop().run_until_complete(fetch()):
+        for container in _parse_catalog_repositories(page):
+            containers[container['name']] = container
+    return containers
+
+
+def _update_indexed_containers(containers, registry):
+    """
+    Writes the changed descriptions and readmes of the containers already
+    indexed from the registry, returns the containers to create or to report
+    in a create_or_update_remote_container task.
+    """
+    remote_repo_type = container_models.ContainerRepository.get_pulp_type()
+    distros = container_models.ContainerDistribution.objects.filter(
+        base_path__in=containers
+    ).select_related("repository")
+    distros = {distro.base_path: distro for distro in distros}
+    readmes = {
+        readme.container_id: readme
+        for readme in models.ContainerDistroReadme.objects.filter(
+            container__in=distros.values()
+        )
+    }
+    remote_registries = dict(
+        models.ContainerRegistryRepos.objects.filter(
+            repository_remote__in=[
+                distro.repository.remote_id for distro in distros.values() if distro.repository
+            ]
+        ).values_list("repository_remote_id", "registry_id")
+    )
+
+    now = timezone.now()
+    to_dispatch = []
+    changed_distros = []
+    changed_readmes = []
+    new_readmes = []
+    for name, container_data in containers.items():
+        distro = distros.get(name)
+        repo = distro and distro.repository
+        if (
+            distro is None
+            or repo is None
+            or repo.pulp_type != remote_repo_type
+            or repo.remote_id not in remote_registries
+        ):
+            to_dispatch.append(container_data)
+            continue
+
+        # containers of other registries are left alone
+        if remote_registries[repo.remote_id] != registry.pk:
+            continue
+
+        if distro.description != container_data['description']:
+            distro.description = container_data['description']
+            distro.pulp_last_updated = now
+            changed_distros.append(distro)
+
+        readme = readmes.get(distro.pk)
+        if readme is None:
+            new_readmes.append(
+                models.ContainerDistroReadme(container=distro, text=container_data['readme'])
+            )
+        elif readme.text != container_data['readme']:
+            readme.text = container_data['readme']
+            readme.updated = now
+            changed_readmes.append(readme)
+
+    with transaction.atomic():
+        container_models.ContainerDistribution.objects.bulk_update(
+            changed_distros, ["description", "pulp_last_updated"]
+        )
+        models.ContainerDistroReadme.objects.bulk_update(changed_readmes, ["text", "updated"])
+        models.ContainerDistroReadme.objects.bulk_create(new_readmes)
+
+    log.info(
+        "Indexed %d containers from %s: %d descriptions and %d readmes changed",
+        len(containers), registry.name, len(changed_distros),
+        len(changed_readmes) + len(new_readmes),
+    )
+    return to_dispatch
+
+
+def index_execution_environments_from_redhat_registry(registry_pk, request_data):
+    """
+    Indexes the execution environments of the Red Hat catalog.
+
+    The catalog pages are fetched concurrently. The containers already indexed
+    from the registry are compared with the catalog in memory and only their
+    changed descriptions and readmes are written, in bulk.
+    """
+    registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
+    containers = _fetch_catalog(registry)
 
-    # Iterate through the pages on the API response and add the relevant information
-    # about each container repository.
-    while True:
-        url = CATALOG_API + "?" + urlencode(query, quote_via=quote)
-        downloader = registry.get_downloader(url=url)
-        download_result = downloader.fetch()
-        with open(download_result.path) as fd:
-            data = json.load(fd)
-            remotes = remotes + _parse_catalog_repositories(data)
-            if len(data['data']) == data['page_size']:
-                query['page'] += 1
-            else:
-                break
-
-    for remote in remotes:
+    for remote in _update_indexed_containers(containers, registry):
         # create a subtask for each remote, so that if one fails, we can throw a usable error
         # message for the user to look at and prevent the rest of the repositories from failing.
         dispatch(
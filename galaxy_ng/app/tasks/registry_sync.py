@@ -1,19 +1,55 @@
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+from urllib.parse import urljoin, urlparse, urlunparse
 
+from aiohttp.client_exceptions import ClientResponseError
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from pulp_container.app import models as container_models
 from pulp_container.app.tasks.synchronize import synchronize as container_sync
+from pulp_container.constants import SIGNATURE_HEADER, V2_ACCEPT_HEADERS
+from pulpcore.plugin.constants import TASK_STATES
+from pulpcore.plugin.models import ProgressReport, RepositoryContent, Task, TaskGroup
 from pulpcore.plugin.tasking import dispatch
+from pulpcore.plugin.util import get_url
 
 from galaxy_ng.app import models
 
+log = logging.getLogger(__name__)
 
-def launch_container_remote_sync(remote, registry, repository):
+SYNC_LANE_RESOURCE = "galaxy:registry-sync:{registry_pk}:{lane}"
+SYNC_TASK_NAME = f"{container_sync.__module__}.{container_sync.__name__}"
+
+
+def _copy_connection_fields(remote, registry):
+    """Copies the connection fields of the registry to the remote, returns the changed fields."""
+    changed = []
     for key, value in registry.get_connection_fields().items():
-        setattr(remote, key, value)
+        if getattr(remote, key) != value:
+            setattr(remote, key, value)
+            changed.append(key)
+    return changed
+
+
+def launch_container_remote_sync(remote, registry, repository, task_group=None, lane=None):
+    if _copy_connection_fields(remote, registry):
         remote.save()
 
+    exclusive_resources = [repository]
+    if lane is not None:
+        exclusive_resources.append(
+            SYNC_LANE_RESOURCE.format(registry_pk=registry.pk, lane=lane)
+        )
+
     return dispatch(
         container_sync,
         shared_resources=[remote],
-        exclusive_resources=[repository],
+        exclusive_resources=exclusive_resources,
+        task_group=task_group,
         kwargs={
             "remote_pk": str(remote.pk),
             "repository_pk": str(repository.pk),
@@ -23,11 +59,265 @@ def launch_container_remote_sync(remote, registry, repository):
     )
 
 
+def _filter_tags(remote, tags):
+    """The tags a sync of the remote mirrors, see ContainerFirstStage.filter_tags."""
+    if remote.include_tags:
+        tags = [
+            tag for tag in tags
+            if any(fnmatch.fnmatch(tag, pattern) for pattern in remote.include_tags)
+        ]
+    if remote.exclude_tags:
+        tags = [
+            tag for tag in tags
+            if not any(fnmatch.fnmatch(tag, pattern) for pattern in remote.exclude_tags)
+        ]
+    return tags
+
+
+async def _list_upstream_tags(remote):
+    repo_name = remote.namespaced_upstream_name
+    rel_link = f"/v2/{repo_name}/tags/list"
+    tags = []
+    while rel_link:
+        downloader = remote.get_downloader(url=urljoin(remote.url, rel_link))
+        # tags/list does not like the manifest accept headers
+        result = await downloader.run(extra_data={"repo_name": repo_name, "headers": {}})
+        with open(result.path) as fd:
+            tags.extend(json.load(fd)["tags"] or [])
+
+        link = result.headers.get("Link")
+        rel_link = None
+        if link:
+            _, _, path, params, query, fragment = urlparse(link.split(";")[0].strip(">, <"))
+            rel_link = urlunparse(("", "", path, params, query, fragment))
+    return tags
+
+
+async def _get_upstream_digest(remote, tag):
+    repo_name = remote.namespaced_upstream_name
+    downloader = remote.get_downloader(
+        url=urljoin(remote.url, f"/v2/{repo_name}/manifests/{tag}")
+    )
+    result = await downloader.run(extra_data={
+        "repo_name": repo_name,
+        "headers": dict(V2_ACCEPT_HEADERS),
+        "http_method": "head",
+    })
+    return result.headers.get("Docker-Content-Digest")
+
+
+async def _has_signature_api(remote):
+    """Whether the sync fetches signatures from the registry, see get_signature_source."""
+    downloader = remote.get_noauth_downloader(url=urljoin(remote.url, "v2/"))
+    try:
+        headers = (await downloader.run()).headers
+    except ClientResponseError as e:
+        headers = dict(e.headers or {})
+    return headers.get(SIGNATURE_HEADER) == "1"
+
+
+async def _probe_upstream(remote, semaphore):
+    """
+    Returns the {tag: manifest digest} a sync of the remote would mirror, or
+    None when the upstream could not be read or serves signatures, which can
+    change without the tags.
+    """
+    async with semaphore:
+        started = time.monotonic()
+        try:
+            if await _has_signature_api(remote):
+                log.info("Syncing %s, its registry serves signatures", remote.name)
+                return None
+            tags = _filter_tags(remote, await _list_upstream_tags(remote))
+            # the downloader factory of the remote limits the concurrent requests
+            digests = await asyncio.gather(*(_get_upstream_digest(remote, tag) for tag in tags))
+        except Exception as e:
+            log.warning("Could not check the upstream of %s, syncing it: %s", remote.name, e)
+            return None
+        finally:
+            log.info(
+                "Checked the upstream of %s in %.2fs", remote.name, time.monotonic() - started
+            )
+        return dict(zip(tags, digests, strict=True))
+
+
+def _probe_all_upstreams(remotes):
+    semaphore_size = settings.get("GALAXY_REGISTRY_SYNC_PROBE_CONCURRENCY", 10)
+
+    async def probe():
+        semaphore = asyncio.Semaphore(semaphore_size)
+        return await asyncio.gather(*(_probe_upstream(remote, semaphore) for remote in remotes))
+
+    return dict(zip(
+        (remote.pk for remote in remotes),
+        asyncio.get_event_loop().run_until_complete(probe()),
+        strict=True,
+    ))
+
+
+def _get_synced_tags(repository_ids):
+    """Returns the {tag: manifest digest} of the latest content of the repositories."""
+    memberships = RepositoryContent.objects.filter(
+        repository_id__in=repository_ids,
+        version_removed=None,
+        content__pulp_type=container_models.Tag.get_pulp_type(),
+    ).values_list("repository_id", "content_id")
+    tag_ids = {}
+    for repository_id, content_id in memberships:
+        tag_ids.setdefault(content_id, []).append(repository_id)
+
+    tags = {pk: {} for pk in repository_ids}
+    for pk, name, digest in container_models.Tag.objects.filter(pk__in=tag_ids).values_list(
+        "pk", "name", "tagged_manifest__digest"
+    ):
+        for repository_id in tag_ids[pk]:
+            tags[repository_id][name] = digest
+    return tags
+
+
+def _get_last_synced(to_sync):
+    """
+    Returns when the last successful sync of each (remote, repository) pair
+    started, from the resources its task reserved.
+
+    A sync that changes nothing leaves no repository version behind, so the
+    tasks are the only record of it.
+    """
+    resources = {
+        (remote.pk, repository.pk): (get_url(repository), f"shared:{get_url(remote)}")
+        for remote, repository in to_sync
+    }
+    # the records of the syncs of a repository only differ by their lane
+    records = (
+        Task.objects.filter(
+            name=SYNC_TASK_NAME,
+            state=TASK_STATES.COMPLETED,
+            reserved_resources_record__overlap=[repo for repo, _ in resources.values()],
+        )
+        .order_by()
+        .values("reserved_resources_record")
+        .annotate(last_started=Max("started_at"))
+        .values_list("reserved_resources_record", "last_started")
+    )
+
+    last_synced = {}
+    for record, started in records:
+        record = set(record)
+        for key, (repository_resource, remote_resource) in resources.items():
+            if repository_resource in record and remote_resource in record:
+                last_synced[key] = max(started, last_synced.get(key, started))
+    return last_synced
+
+
+def _find_unchanged(to_sync):
+    """Returns the (remote, repository) pairs whose upstream matches the synced content."""
+    synced_tags = _get_synced_tags([repository.pk for _, repository in to_sync])
+    last_synced = _get_last_synced(to_sync)
+
+    # a repository not synced since the remote changed is out of date whatever
+    # the upstream, and the signatures of a sigstore can change without the tags
+    candidates = {}
+    for remote, repository in to_sync:
+        synced = last_synced.get((remote.pk, repository.pk))
+        if (
+            synced_tags[repository.pk]
+            and synced
+            and synced > remote.pulp_last_updated
+            and not remote.sigstore
+        ):
+            candidates.setdefault(remote.pk, (remote, []))[1].append(repository)
+
+    with ProgressReport(
+        message="Checking upstream repositories",
+        code="sync.registry.checking",
+        total=len(candidates),
+    ) as pb:
+        upstream = _probe_all_upstreams([remote for remote, _ in candidates.values()])
+        pb.increase_by(len(candidates))
+
+    return {
+        (remote.pk, repository.pk)
+        for remote, repositories in candidates.values()
+        for repository in repositories
+        if upstream[remote.pk] is not None and upstream[remote.pk] == synced_tags[repository.pk]
+    }
+
+
 def sync_all_repos_in_registry(registry_pk):
+    """
+    Syncs the repositories of all the remotes of a registry.
+
+    The connection fields of the registry are copied to the remotes in one
+    update. With GALAXY_REGISTRY_SYNC_SKIP_UNCHANGED, the repositories whose
+    upstream tags and digests match their content are not synced, unless their
+    remote has a sigstore or their registry serves signatures. The syncs are
+    dispatched in a task group, split over GALAXY_REGISTRY_SYNC_CONCURRENCY
+    lanes that run one sync at a time; the timings of each repository are
+    those of its task in the group.
+    """
     registry = models.ContainerRegistryRemote.objects.get(pk=registry_pk)
-    for remote_rel in models.ContainerRegistryRepos.objects.filter(registry=registry).all():
-        remote = remote_rel.repository_remote
+    remotes = [
+        remote_rel.repository_remote
+        for remote_rel in models.ContainerRegistryRepos.objects.filter(registry=registry)
+        .select_related("repository_remote")
+        .prefetch_related("repository_remote__repository_set")
+    ]
+
+    changed_fields = set()
+    changed_remotes = []
+    now = timezone.now()
+    for remote in remotes:
+        fields = _copy_connection_fields(remote, registry)
+        if fields:
+            remote.pulp_last_updated = now
+            changed_fields.update(fields)
+            changed_remotes.append(remote)
+    if changed_remotes:
+        container_models.ContainerRemote.objects.bulk_update(
+            changed_remotes, [*changed_fields, "pulp_last_updated"]
+        )
 
-        for repo in remote.repository_set.all():
-            repo.cast()
-            launch_container_remote_sync(remote, registry, repo)
+    # cast in one query, get_url casts the repositories one by one otherwise
+    repositories = [repo for remote in remotes for repo in remote.repository_set.all()]
+    container_repositories = container_models.ContainerRepository.objects.in_bulk(
+        [repo.pk for repo in repositories]
+    )
+    to_sync = [
+        (remote, container_repositories.get(repo.pk, repo))
+        for remote in remotes
+        for repo in remote.repository_set.all()
+    ]
+    unchanged = set()
+    if settings.get("GALAXY_REGISTRY_SYNC_SKIP_UNCHANGED", True):
+        unchanged = _find_unchanged(to_sync)
+
+    with ProgressReport(
+        message="Skipping unchanged repositories",
+        code="sync.registry.skipped",
+        total=len(to_sync),
+    ) as pb:
+        pb.increase_by(len(unchanged))
+
+    lanes = max(settings.get("GALAXY_REGISTRY_SYNC_CONCURRENCY", 4), 1)
+    task_group = TaskGroup.objects.create(description=f"Sync registry {registry.name}")
+    with ProgressReport(
+        message="Dispatching repository syncs",
+        code="sync.registry.dispatching",
+        total=len(to_sync) - len(unchanged),
+    ) as pb:
+        dispatched = 0
+        for remote, repository in to_sync:
+            if (remote.pk, repository.pk) in unchanged:
+                log.info("Skipping the sync of %s, upstream is unchanged", repository.name)
+                continue
+            launch_container_remote_sync(
+                remote, registry, repository, task_group=task_group, lane=dispatched % lanes
+            )
+            dispatched += 1
+            pb.increment()
+    task_group.finish()
+
+    log.info(
+        "Dispatched %d syncs of registry %s, skipped %d unchanged repositories",
+        dispatched, registry.name, len(unchanged),
+    )
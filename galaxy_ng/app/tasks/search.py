@@ -0,0 +1,207 @@
+"""tasks/search.py
+
+This module maintains the `galaxy_ng.app.models.SearchIndex` table which
+backs the unified collection + role search on `_ui/v1/search/`.
+
+Each row is computed in the database with a single `INSERT ... SELECT ...
+ON CONFLICT DO UPDATE` statement, so refreshing one collection, a handful of
+roles or the whole index all share the same SQL.
+
+Rows are refreshed by the signal handlers in `galaxy_ng.app.signals.handlers`
+whenever a CollectionVersion, LegacyRole, download counter, deprecation or
+Namespace changes, and the whole table can be rebuilt with the
+`rebuild-search-index` management command or the `rebuild_search_index` task.
+"""
+
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Subquery
+from pulp_ansible.app.models import CollectionDownloadCount, CollectionVersion
+
+from galaxy_ng.app.common import response_cache
+from galaxy_ng.app.models import SearchIndex
+
+log = logging.getLogger(__name__)
+
+INDEX_COLUMNS = (
+    "name",
+    "namespace_name",
+    "description_text",
+    "latest_version",
+    "namespace_avatar",
+    "content_list",
+    "platform_names",
+    "tag_names",
+    "deprecated",
+    "download_count",
+    "last_updated",
+    "search_vector",
+    "modified",
+)
+
+# The order of the selected columns must match INDEX_COLUMNS
+COLLECTION_SOURCE_SQL = """
+SELECT
+    'collection',
+    cv.collection_id,
+    cv.name,
+    cv.namespace,
+    cv.description,
+    cv.version,
+    ns._avatar_url,
+    cv.contents,
+    '[]'::jsonb,
+    COALESCE(
+        (
+            SELECT jsonb_agg(t.name)
+            FROM ansible_tag t
+            INNER JOIN ansible_collectionversion_tags cvt ON cvt.tag_id = t.pulp_id
+            WHERE cvt.collectionversion_id = cv.content_ptr_id
+        ),
+        '[]'::jsonb
+    ),
+    EXISTS (
+        SELECT 1
+        FROM ansible_ansiblecollectiondeprecated d
+        WHERE d.namespace = cv.namespace AND d.name = cv.name
+    ),
+    COALESCE(
+        (
+            SELECT dc.download_count
+            FROM ansible_collectiondownloadcount dc
+            WHERE dc.namespace = cv.namespace AND dc.name = cv.name
+            LIMIT 1
+        ),
+        0
+    ),
+    c.timestamp_of_interest,
+    cv.search_vector,
+    now()
+FROM ansible_collectionversion cv
+INNER JOIN core_content c ON c.pulp_id = cv.content_ptr_id
+LEFT OUTER JOIN galaxy_namespace ns ON ns.name = cv.namespace
+WHERE cv.is_highest = TRUE {where}
+"""
+
+# The order of the selected columns must match INDEX_COLUMNS
+ROLE_SOURCE_SQL = """
+SELECT
+    'role',
+    r.id,
+    r.name,
+    lns.name,
+    r.full_metadata ->> 'description',
+    r.full_metadata #>> '{{versions,-1,version}}',
+    ns._avatar_url,
+    '[]'::jsonb,
+    r.full_metadata -> 'platforms',
+    r.full_metadata -> 'tags',
+    FALSE,
+    COALESCE(dc.count, 0),
+    r.created,
+    sv.search_vector,
+    now()
+FROM galaxy_legacyrole r
+INNER JOIN galaxy_legacynamespace lns ON lns.id = r.namespace_id
+LEFT OUTER JOIN galaxy_namespace ns ON ns.id = lns.namespace_id
+LEFT OUTER JOIN galaxy_legacyroledownloadcount dc ON dc.legacyrole_id = r.id
+LEFT OUTER JOIN galaxy_legacyrolesearchvector sv ON sv.role_id = r.id
+WHERE TRUE {where}
+"""
+
+UPSERT_SQL = """
+INSERT INTO galaxy_searchindex (content_type, {key}, {columns})
+{source}
+ON CONFLICT ({key}) DO UPDATE SET {updates}
+"""
+
+
+def _upsert(key, source_sql, where="", params=None):
+    sql = UPSERT_SQL.format(
+        key=key,
+        columns=", ".join(INDEX_COLUMNS),
+        source=source_sql.format(where=where),
+        updates=", ".join(f"{col} = EXCLUDED.{col}" for col in INDEX_COLUMNS),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params or [])
+        return cursor.rowcount
+
+
+def index_collections(namespace=None, name=None):
+    """Refresh the search index rows of collections.
+
+    When namespace and/or name are given only the matching collections
+    are refreshed, otherwise every collection is.
+    """
+    where = ""
+    params = []
+    stale = SearchIndex.objects.filter(collection__isnull=False)
+    if namespace is not None:
+        where += " AND cv.namespace = %s"
+        params.append(namespace)
+        stale = stale.filter(collection__namespace=namespace)
+    if name is not None:
+        where += " AND cv.name = %s"
+        params.append(name)
+        stale = stale.filter(collection__name=name)
+
+    with transaction.atomic():
+        updated = _upsert("collection_id", COLLECTION_SOURCE_SQL, where, params)
+        # collections without a highest version are not searchable anymore
+        stale.exclude(
+            Exists(
+                CollectionVersion.objects.filter(
+                    collection=OuterRef("collection"), is_highest=True
+                )
+            )
+        ).delete()
+    return updated
+
+
+def index_roles(role_ids=None, namespace_id=None):
+    """Refresh the search index rows of legacy roles.
+
+    role_ids limits the refresh to the given LegacyRole ids and namespace_id
+    to the roles of legacy namespaces mapped to the given v3 Namespace id.
+    """
+    where = ""
+    params = []
+    if role_ids is not None:
+        where += " AND r.id = ANY(%s)"
+        params.append(list(role_ids))
+    if namespace_id is not None:
+        where += " AND lns.namespace_id = %s"
+        params.append(namespace_id)
+    return _upsert("role_id", ROLE_SOURCE_SQL, where, params)
+
+
+def index_collection_download_count(namespace, name):
+    """Propagate the download counter of a collection to its search index row."""
+    download_count = CollectionDownloadCount.objects.filter(
+        namespace=namespace, name=name
+    ).values("download_count")[:1]
+    SearchIndex.objects.filter(
+        content_type="collection", namespace_name=namespace, name=name
+    ).update(download_count=Subquery(download_count))
+
+
+def index_namespace_avatar(namespace):
+    """Propagate a Namespace avatar change to the search index."""
+    SearchIndex.objects.filter(
+        content_type="collection", namespace_name=namespace.name
+    ).update(namespace_avatar=namespace._avatar_url)
+    SearchIndex.objects.filter(
+        role__namespace__namespace=namespace
+    ).update(namespace_avatar=namespace._avatar_url)
+
+
+@transaction.atomic
+def rebuild_search_index():
+    """Rebuild the whole search index."""
+    collections = index_collections()
+    roles = index_roles()
+    transaction.on_commit(lambda: response_cache.bump_generation("collections", "roles"))
+    log.info(f"Search index rebuilt with {collections} collections and {roles} roles")
+    return collections, roles
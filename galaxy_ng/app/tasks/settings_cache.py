@@ -2,6 +2,9 @@
 Tasks related to the settings cache management.
 """
 import logging
+import os
+import threading
+import time
 import redis
 
 from functools import wraps
@@ -16,6 +19,8 @@ from django.db.utils import OperationalError
 logger = logging.getLogger(__name__)
 _conn = None
 CACHE_KEY = "GALAXY_SETTINGS_DATA"
+VERSION_KEY = "GALAXY_SETTINGS_VERSION"
+INVALIDATE_CHANNEL = "GALAXY_SETTINGS_INVALIDATE"
 
 
 def get_redis_connection():
@@ -117,6 +122,10 @@ def update_setting_cache(data: dict[str, Any]) -> int:
     if data:
         updated = conn.hset(CACHE_KEY, mapping=data)
         conn.expire(CACHE_KEY, settings.get("GALAXY_SETTINGS_EXPIRE", 60 * 60 * 24))
+
+    # bump the version stamp and tell every process to drop its local copy
+    version = conn.incr(VERSION_KEY)
+    conn.publish(INVALIDATE_CHANNEL, version)
     return updated
 
 
@@ -137,3 +146,97 @@ def get_settings_from_db():
     except OperationalError as exc:
         logger.error("Could not read settings from database: %s", str(exc))
         return {}
+
+
+class SettingsSnapshot:
+    """A per process copy of the dynamic settings data.
+
+    `values` memoizes the keys already resolved by dynaconf from `data`.
+    """
+
+    def __init__(self, data: dict[str, Any], source: str, version: str | None, ttl: float):
+        self.data = data
+        self.source = source
+        self.version = version
+        self.expires = time.monotonic() + ttl
+        self.keys = {key.split("__")[0].upper() for key in data}
+        self.values: dict[str, Any] = {}
+
+
+_snapshot: SettingsSnapshot | None = None
+_snapshot_lock = threading.Lock()
+_listener = None
+_listener_pid = None
+
+
+def invalidate_local_settings_cache(*args) -> None:
+    """Drop the local copy, the next read loads the settings again."""
+    global _snapshot
+    _snapshot = None
+
+
+@connection_error_wrapper(default=lambda: None)
+def get_settings_version() -> str | None:
+    """Reads the version stamp bumped by every update_setting_cache"""
+    if conn is None:
+        return None
+    return conn.get(VERSION_KEY)
+
+
+@connection_error_wrapper(default=lambda: None)
+def start_invalidation_listener() -> None:
+    """Subscribes this process to the settings invalidation messages.
+
+    The listener runs in a daemon thread, it is (re)started lazily so forked
+    workers and dropped Redis connections get a new one.
+    """
+    global _listener, _listener_pid
+    if conn is None:
+        return
+    if _listener is not None and _listener.is_alive() and _listener_pid == os.getpid():
+        return
+
+    def on_error(exc, pubsub, thread):
+        logger.error("Settings invalidation listener stopped: %s", str(exc))
+        thread.stop()
+        invalidate_local_settings_cache()
+
+    pubsub = conn.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(**{INVALIDATE_CHANNEL: invalidate_local_settings_cache})
+    _listener = pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=on_error)
+    _listener_pid = os.getpid()
+
+
+def get_dynamic_settings() -> SettingsSnapshot:
+    """Returns the dynamic settings, read from Redis or the database at most
+    once per GALAXY_SETTINGS_LOCAL_CACHE_TTL seconds in each process.
+
+    Changes are pushed to every process through Redis pub/sub, the TTL bounds
+    the delay if a message is missed. When the TTL expires and the version
+    stamp in Redis has not changed the local copy is kept.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() < snapshot.expires:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and time.monotonic() < snapshot.expires:
+            return snapshot
+
+        start_invalidation_listener()
+        ttl = settings.get("GALAXY_SETTINGS_LOCAL_CACHE_TTL", 5)
+        version = get_settings_version()
+        if snapshot is not None and version is not None and version == snapshot.version:
+            snapshot.expires = time.monotonic() + ttl
+            return snapshot
+
+        if data := get_settings_from_cache():
+            source = "cache"
+        else:
+            data = get_settings_from_db()
+            source = "db"
+
+        _snapshot = SettingsSnapshot(data, source, version, ttl)
+        return _snapshot
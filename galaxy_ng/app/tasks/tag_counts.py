@@ -0,0 +1,131 @@
+"""tasks/tag_counts.py
+
+Maintenance of the persisted tag usage counters behind `_ui/v1/tags/collections/`
+(CollectionTagCount) and `_ui/v1/tags/roles/` (LegacyRoleTagCount).
+
+Counting the collection versions or roles of every tag on each listing means
+aggregating the whole tag association tables. Instead the signal handlers
+mark the counters of the tags whose associations changed as stale:
+
+- tags attached to or detached from a collection version or a role
+- collection versions and roles deleted with their tags
+- cross repository index rows changed, as they flag the highest versions
+
+The tag viewsets recompute the stale counters (usually none, an indexed
+lookup) before listing. Marking is cheap and coalesces the many changes of an
+import or a sync into one recount per tag.
+
+Every counter can be recomputed with the `rebuild-tag-counts` management
+command, e.g after bulk loads that bypass the signals.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Q
+from pulp_ansible.app.models import CollectionVersion, Tag
+
+from galaxy_ng.app.api.v1.models import LegacyRole, LegacyRoleTag, LegacyRoleTagCount
+from galaxy_ng.app.models import CollectionTagCount
+
+log = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def _upsert(model, rows, fields):
+    model.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["tag"], update_fields=fields
+    )
+
+
+def _mark_stale(model, tag_ids):
+    tag_ids = sorted(set(tag_ids))
+    if tag_ids:
+        _upsert(model, [model(tag_id=tag_id, stale=True) for tag_id in tag_ids], ["stale"])
+
+
+def mark_collection_tags_stale(tag_ids=None, collection_version_ids=None):
+    """Mark the counters of the given tags, or the tags of the given versions, stale."""
+    tag_ids = list(tag_ids or [])
+    if collection_version_ids:
+        tag_ids += CollectionVersion.tags.through.objects.filter(
+            collectionversion_id__in=collection_version_ids
+        ).values_list("tag_id", flat=True)
+    _mark_stale(CollectionTagCount, tag_ids)
+
+
+def mark_role_tags_stale(tag_ids=None, role_ids=None):
+    """Mark the counters of the given tags, or the tags of the given roles, stale."""
+    tag_ids = list(tag_ids or [])
+    if role_ids:
+        tag_ids += LegacyRole.tags.through.objects.filter(
+            legacyrole_id__in=role_ids
+        ).values_list("legacyroletag_id", flat=True)
+    _mark_stale(LegacyRoleTagCount, tag_ids)
+
+
+def _store_collection_tag_counts(tag_ids):
+    highest = Q(ansible_collectionversion__ansible_crossrepositorycollectionversionindex__is_highest=True)  # noqa: E501
+    counts = Tag.objects.filter(pk__in=tag_ids).annotate(
+        version_count=Count("ansible_collectionversion", distinct=True),
+        highest_version_count=Count("ansible_collectionversion", filter=highest, distinct=True),
+    ).values_list("pk", "version_count", "highest_version_count")
+
+    rows = [
+        CollectionTagCount(tag_id=pk, count=count, highest_count=highest_count, stale=False)
+        for pk, count, highest_count in counts
+    ]
+    _upsert(CollectionTagCount, rows, ["count", "highest_count", "stale"])
+    return len(rows)
+
+
+def _store_role_tag_counts(tag_ids):
+    counts = LegacyRoleTag.objects.filter(pk__in=tag_ids).annotate(
+        role_count=Count("legacyrole")
+    ).values_list("pk", "role_count")
+
+    rows = [LegacyRoleTagCount(tag_id=pk, count=count, stale=False) for pk, count in counts]
+    _upsert(LegacyRoleTagCount, rows, ["count", "stale"])
+    return len(rows)
+
+
+def _refresh_stale(model, store):
+    if not model.objects.filter(stale=True).exists():
+        return 0
+
+    with transaction.atomic():
+        # rows marked again while they are recounted wait for this transaction
+        # and stay stale for the next refresh
+        tag_ids = list(
+            model.objects.filter(stale=True)
+            .select_for_update(skip_locked=True)
+            .values_list("tag_id", flat=True)
+        )
+        return store(tag_ids)
+
+
+def refresh_stale_collection_tag_counts():
+    """Recompute the stale CollectionTagCount rows, returns their number."""
+    return _refresh_stale(CollectionTagCount, _store_collection_tag_counts)
+
+
+def refresh_stale_role_tag_counts():
+    """Recompute the stale LegacyRoleTagCount rows, returns their number."""
+    return _refresh_stale(LegacyRoleTagCount, _store_role_tag_counts)
+
+
+def _rebuild(tags, store):
+    stored = 0
+    tag_ids = list(tags.values_list("pk", flat=True))
+    for start in range(0, len(tag_ids), BATCH_SIZE):
+        with transaction.atomic():
+            stored += store(tag_ids[start:start + BATCH_SIZE])
+    return stored
+
+
+def rebuild_tag_counts():
+    """Recompute the counters of every collection and role tag."""
+    collections = _rebuild(Tag.objects.all(), _store_collection_tag_counts)
+    roles = _rebuild(LegacyRoleTag.objects.all(), _store_role_tag_counts)
+    log.info(f"Tag counts rebuilt for {collections} collection and {roles} role tags")
+    return collections, roles
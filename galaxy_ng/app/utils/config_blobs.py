@@ -0,0 +1,122 @@
+"""Cached reads of the container image config blobs.
+
+The manifest detail endpoint shows the parsed config blob of the image, which
+is an artifact in the (possibly remote) storage. Blobs are content addressed
+and never change, so their json text is kept per process in an LRU keyed by
+digest and parsed again on each hit, which is cheap next to a storage read.
+GALAXY_CONFIG_BLOB_CACHE_MAX_BYTES bounds the memory taken by the cached
+strings. With GALAXY_CONFIG_BLOB_CACHE_REDIS the blobs are shared between the
+processes through Redis as well, for GALAXY_CONFIG_BLOB_CACHE_REDIS_TTL seconds.
+
+Blobs larger than GALAXY_CONFIG_BLOB_CACHE_MAX_BLOB_SIZE characters are read
+from storage every time.
+"""
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from galaxy_ng.app.common import metrics
+from galaxy_ng.app.tasks.settings_cache import connection_error_wrapper, get_redis_connection
+
+REDIS_KEY = "GALAXY_CONFIG_BLOB:{digest}"
+
+
+class ConfigBlobCache:
+    """Thread safe LRU of config blob json strings bounded by their size in memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, digest, raw, max_bytes):
+        size = sys.getsizeof(raw)
+        if size > max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self.size -= previous[0]
+            self._entries[digest] = (size, raw)
+            self.size += size
+            while self.size > max_bytes:
+                evicted_size, _ = self._entries.popitem(last=False)[1]
+                self.size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return {"config_blobs": {"hits": self.hits, "misses": self.misses}}
+
+
+CONFIG_BLOB_CACHE = ConfigBlobCache()
+metrics.register_cache_stats(CONFIG_BLOB_CACHE.stats)
+
+
+def _redis_enabled():
+    return settings.get("GALAXY_CONFIG_BLOB_CACHE_REDIS", False)
+
+
+@connection_error_wrapper(default=lambda: None)
+def _redis_get(digest):
+    conn = get_redis_connection()
+    if conn is None:
+        return None
+    return conn.get(REDIS_KEY.format(digest=digest))
+
+
+@connection_error_wrapper(default=lambda: None)
+def _redis_set(digest, raw):
+    conn = get_redis_connection()
+    if conn is None:
+        return
+    ttl = settings.get("GALAXY_CONFIG_BLOB_CACHE_REDIS_TTL", 60 * 60 * 24)
+    conn.set(REDIS_KEY.format(digest=digest), raw, ex=ttl)
+
+
+def _read_artifact(blob):
+    with blob._artifacts.first().file.open() as f:
+        return f.read()
+
+
+def get_config_blob_data(blob):
+    """Returns the parsed json of a config blob, read from the caches when possible."""
+    raw = CONFIG_BLOB_CACHE.get(blob.digest)
+    if raw is not None:
+        return json.loads(raw)
+
+    raw = _redis_get(blob.digest) if _redis_enabled() else None
+    if raw is None:
+        raw = _read_artifact(blob)
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if len(raw) > settings.get("GALAXY_CONFIG_BLOB_CACHE_MAX_BLOB_SIZE", 1024 * 1024):
+            return json.loads(raw)
+        if _redis_enabled():
+            _redis_set(blob.digest, raw)
+
+    CONFIG_BLOB_CACHE.put(
+        blob.digest,
+        raw,
+        settings.get("GALAXY_CONFIG_BLOB_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+    )
+    return json.loads(raw)
@@ -0,0 +1,136 @@
+"""Relaying artifact downloads from the pulp content app.
+
+In insights mode the API serves collection downloads itself by requesting
+the artifact from the content app and streaming it back. The requests go
+through a process wide keep-alive connection pool, the client's `Range` and
+conditional headers are passed through and the body is relayed in chunks of
+GALAXY_ARTIFACT_PROXY_CHUNK_SIZE bytes.
+
+With GALAXY_ARTIFACT_PROXY_ACCEL_HEADER (e.g. "X-Accel-Redirect") set, the
+API doesn't relay anything, it answers with that header pointing to an
+internal webserver location (GALAXY_ARTIFACT_PROXY_ACCEL_LOCATION) proxying
+to the content app, so the webserver streams the bytes instead of Python.
+See webserver_snippets/nginx.conf.
+"""
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from requests.adapters import HTTPAdapter
+
+# request headers of the client passed through to the content app
+FORWARDED_REQUEST_HEADERS = (
+    "Range",
+    "If-Range",
+    "If-None-Match",
+    "If-Modified-Since",
+)
+
+# response headers of the content app passed back to the client
+FORWARDED_RESPONSE_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "Content-Range",
+    "Content-Disposition",
+    "Accept-Ranges",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """A process wide session keeping the connections to the content app alive."""
+    global _session, _session_pid
+    with _session_lock:
+        # don't share the pooled sockets with a forked worker
+        if _session is None or _session_pid != os.getpid():
+            pool_size = settings.get("GALAXY_ARTIFACT_PROXY_POOL_SIZE", 10)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def get_forwarded_headers(request):
+    return {
+        name: request.headers[name] for name in FORWARDED_REQUEST_HEADERS if name in request.headers
+    }
+
+
+def fetch(url, request):
+    """Requests `url` from the content app with the client's range/conditional headers."""
+    return get_session().get(
+        url,
+        headers=get_forwarded_headers(request),
+        stream=True,
+        allow_redirects=False,
+        timeout=settings.get("GALAXY_ARTIFACT_PROXY_TIMEOUT", 60),
+    )
+
+
+def iter_body(response, chunk_size):
+    """Relays the raw body, releasing the connection to the pool when done."""
+    try:
+        yield from response.raw.stream(amt=chunk_size)
+    finally:
+        response.close()
+
+
+def streaming_response(response):
+    """A StreamingHttpResponse relaying a 200/206 response of the content app."""
+    chunk_size = settings.get("GALAXY_ARTIFACT_PROXY_CHUNK_SIZE", 64 * 1024)
+    streaming = StreamingHttpResponse(
+        iter_body(response, chunk_size), status=response.status_code
+    )
+    copy_headers(response, streaming)
+    return streaming
+
+
+def relayed_response(response):
+    """An empty-bodied response (e.g. 304 or 416) relaying the status and headers."""
+    relayed = HttpResponse(status=response.status_code)
+    copy_headers(response, relayed)
+    # the body was not read, don't keep the connection out of the pool
+    response.close()
+    if relayed.status_code == 304:
+        # a 304 has no body, so no length either
+        del relayed["Content-Length"]
+    return relayed
+
+
+def copy_headers(source, target):
+    for name in FORWARDED_RESPONSE_HEADERS:
+        if name in source.headers:
+            target[name] = source.headers[name]
+
+
+def get_accel_header():
+    return settings.get("GALAXY_ARTIFACT_PROXY_ACCEL_HEADER", None)
+
+
+def accel_redirect_response(url):
+    """
+    Hands the download of `url` (a preauthenticated content app url) over to the
+    webserver through its internal location.
+    """
+    parts = urlsplit(url)
+    location = settings.get("GALAXY_ARTIFACT_PROXY_ACCEL_LOCATION", "/_galaxy_content/")
+    target = location.rstrip("/") + parts.path
+    if parts.query:
+        target = f"{target}?{parts.query}"
+
+    response = HttpResponse()
+    # let the webserver set the content type of the proxied response
+    del response["Content-Type"]
+    response[get_accel_header()] = target
+    return response
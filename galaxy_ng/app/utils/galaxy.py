@@ -1,11 +1,29 @@
 import logging
+import random
+import threading
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from urllib.parse import urlparse
 
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
 
 logger = logging.getLogger(__name__)
 
+# How many upstream requests the iterators below run at once, can be
+# overridden with the GALAXY_UPSTREAM_FETCH_CONCURRENCY setting.
+DEFAULT_FETCH_CONCURRENCY = 8
+FETCH_ATTEMPTS = 5
+FETCH_TIMEOUT = 60
+BACKOFF_BASE = 2
+BACKOFF_MAX = 60
+
+_session = None
+_session_lock = threading.Lock()
+
 
 def generate_unverified_email(github_id):
     return str(github_id) + '@GALAXY.GITHUB.UNVERIFIED.COM'
@@ -29,25 +47,113 @@ def int_to_uuid(num):
     return uuid
 
 
+def get_fetch_concurrency():
+    try:
+        concurrency = int(
+            settings.get("GALAXY_UPSTREAM_FETCH_CONCURRENCY", DEFAULT_FETCH_CONCURRENCY)
+        )
+    except (TypeError, ValueError):
+        concurrency = DEFAULT_FETCH_CONCURRENCY
+    return max(concurrency, 1)
+
+
+def get_session():
+    """A process wide session so connections to the upstream are reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = get_fetch_concurrency()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with jitter so retrying workers don't stampede the upstream."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 def safe_fetch(url):
     rr = None
     counter = 0
     while True:
         counter += 1
         logger.info(f'fetch {url}')
-        rr = requests.get(url)
+        try:
+            rr = get_session().get(url, timeout=FETCH_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if counter >= FETCH_ATTEMPTS:
+                raise
+            delay = backoff_delay(counter)
+            logger.info(f'ERROR:{e} waiting {delay:.1f}s to refetch {url}')
+            time.sleep(delay)
+            continue
+
         if rr.status_code < 500:
             return rr
 
-        if counter >= 5:
+        if counter >= FETCH_ATTEMPTS:
             return rr
 
-        logger.info(f'ERROR:{rr.status_code} waiting 60s to refetch {url}')
-        time.sleep(60)
+        delay = backoff_delay(counter)
+        logger.info(f'ERROR:{rr.status_code} waiting {delay:.1f}s to refetch {url}')
+        time.sleep(delay)
 
     return rr
 
 
+@contextmanager
+def fetch_pool(concurrency=None):
+    """Worker pool used by the upstream iterators to fetch ahead of the consumer.
+
+    Pending fetches are cancelled when the consumer stops early.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency or get_fetch_concurrency(),
+        thread_name_prefix='galaxy-upstream',
+    )
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class UpstreamNamespaceCache:
+    """Fetches each upstream v1 namespace and its owners only once.
+
+    Safe to use from the fetch pool workers, concurrent lookups of the
+    same namespace wait for the first one instead of fetching it again.
+    """
+
+    def __init__(self, baseurl):
+        self.baseurl = baseurl
+        self._lock = threading.Lock()
+        self._ns_locks = {}
+        self._namespaces = {}
+
+    def get(self, ns_id):
+        with self._lock:
+            ns_lock = self._ns_locks.setdefault(ns_id, threading.Lock())
+        with ns_lock:
+            if ns_id not in self._namespaces:
+                self._namespaces[ns_id] = self._fetch(ns_id)
+            return self._namespaces[ns_id]
+
+    def _fetch(self, ns_id):
+        ns_url = self.baseurl + f'/api/v1/namespaces/{ns_id}/'
+        logger.info(ns_url)
+        namespace_data = safe_fetch(ns_url).json()
+
+        # get the owners too
+        namespace_data['summary_fields']['owners'] = \
+            get_namespace_owners_details(self.baseurl, ns_id)
+        return namespace_data
+
+
 def paginated_results(next_url):
     """Iterate through a paginated query and combine the results."""
     parsed = urlparse(next_url)
@@ -152,8 +258,14 @@ def upstream_namespace_iterator(
     limit=None,
     start_page=None,
     require_content=True,
+    concurrency=None,
 ):
-    """Abstracts the pagination of v2 collections into a generator with error handling."""
+    """Abstracts the pagination of v2 collections into a generator with error handling.
+
+    The next page and the owners of every namespace on the current page are
+    fetched by a pool of `concurrency` workers, namespaces are yielded in the
+    upstream order.
+    """
     if baseurl is None or not baseurl:
         baseurl = 'https://old-galaxy.ansible.com/api/v1/namespaces'
     if not baseurl.rstrip().endswith('/api/v1/namespaces'):
@@ -174,51 +286,55 @@ def upstream_namespace_iterator(
         pagenum = start_page
         next_url = next_url + f'?page={pagenum}'
 
-    while next_url:
-        logger.info(f'fetch {pagenum} {next_url}')
-
-        page = safe_fetch(next_url)
-
-        # Some upstream pages return ISEs for whatever reason.
-        if page.status_code >= 500:
-            if 'page=' in next_url:
-                next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
-            else:
-                next_url = next_url.rstrip('/') + '/?page={pagenum + 1}'
-            pagenum += 1
-            continue
-
-        ds = page.json()
-        total = ds['count']
+    with fetch_pool(concurrency) as pool:
+        page_future = pool.submit(safe_fetch, next_url)
+        while page_future:
+            logger.info(f'fetch {pagenum} {next_url}')
+
+            page = page_future.result()
+            page_future = None
+
+            # Some upstream pages return ISEs for whatever reason.
+            if page.status_code >= 500:
+                if 'page=' in next_url:
+                    next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
+                else:
+                    next_url = next_url.rstrip('/') + '/?page={pagenum + 1}'
+                pagenum += 1
+                page_future = pool.submit(safe_fetch, next_url)
+                continue
 
-        for ndata in ds['results']:
+            ds = page.json()
+            total = ds['count']
 
-            if not ndata['summary_fields']['content_counts'] and require_content:
-                continue
+            # start fetching the next page while this one is processed
+            if ds.get('next_link'):
+                next_url = _baseurl + ds['next_link']
+                page_future = pool.submit(safe_fetch, next_url)
 
-            ns_id = ndata['id']
+            namespaces = [
+                ndata for ndata in ds['results']
+                if ndata['summary_fields']['content_counts'] or not require_content
+            ]
 
             # get the owners too
-            ndata['summary_fields']['owners'] = get_namespace_owners_details(_baseurl, ns_id)
-
-            # send the collection
-            namespace_count += 1
-            yield total, ndata
+            owner_futures = [
+                pool.submit(get_namespace_owners_details, _baseurl, ndata['id'])
+                for ndata in namespaces
+            ]
 
-            # break early if count reached
-            if limit is not None and namespace_count >= limit:
-                break
+            for ndata, owners in zip(namespaces, owner_futures, strict=True):
+                ndata['summary_fields']['owners'] = owners.result()
 
-        # break early if count reached
-        if limit is not None and namespace_count >= limit:
-            break
+                # send the collection
+                namespace_count += 1
+                yield total, ndata
 
-        # break if no next page
-        if not ds.get('next_link'):
-            break
+                # break early if count reached
+                if limit is not None and namespace_count >= limit:
+                    return
 
-        pagenum += 1
-        next_url = _baseurl + ds['next_link']
+            pagenum += 1
 
 
 def upstream_collection_iterator(
@@ -228,8 +344,14 @@ def upstream_collection_iterator(
     collection_name=None,
     get_versions=True,
     start_page=None,
+    concurrency=None,
 ):
-    """Abstracts the pagination of v2 collections into a generator with error handling."""
+    """Abstracts the pagination of v2 collections into a generator with error handling.
+
+    When walking all collections, the next page and the namespace and versions
+    of every collection on the current page are fetched by a pool of
+    `concurrency` workers, collections are yielded in the upstream order.
+    """
     if baseurl is None or not baseurl:
         baseurl = 'https://old-galaxy.ansible.com/api/v2/collections'
     logger.info(f'upstream_collection_iterator baseurl:{baseurl}')
@@ -251,13 +373,12 @@ def upstream_collection_iterator(
         next_url = _baseurl + '/api/v1/roles/?' + '&'.join(params)
     '''
 
-    namespace_cache = {}
+    namespace_cache = UpstreamNamespaceCache(_baseurl)
 
     if collection_namespace or collection_name:
         if collection_namespace and not collection_name:
             # get the namespace ID first ...
-            ns_name, ns_data = find_namespace(baseurl=baseurl, name=collection_namespace)
-            ns_id = ns_data['id']
+            find_namespace(baseurl=baseurl, name=collection_namespace)
             next_url = (
                 baseurl
                 + f'/api/internal/ui/search/?keywords={collection_namespace}'
@@ -279,20 +400,7 @@ def upstream_collection_iterator(
                         return
 
                     # Get the namespace+owners
-                    ns_id = cdata['namespace']['id']
-                    if ns_id not in namespace_cache:
-                        logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
-                        ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
-                        namespace_data = safe_fetch(ns_url).json()
-                        # logger.info(namespace_data)
-                        namespace_cache[ns_id] = namespace_data
-
-                        # get the owners too
-                        namespace_cache[ns_id]['summary_fields']['owners'] = \
-                            get_namespace_owners_details(_baseurl, ns_id)
-
-                    else:
-                        namespace_data = namespace_cache[ns_id]
+                    namespace_data = namespace_cache.get(cdata['namespace']['id'])
 
                     # get the versions
                     if get_versions:
@@ -322,84 +430,63 @@ def upstream_collection_iterator(
         collection_versions = paginated_results(cdata['versions_url'])
 
         # Get the namespace+owners
-        ns_id = cdata['namespace']['id']
-        if ns_id not in namespace_cache:
-            logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
-            ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
-            namespace_data = safe_fetch(ns_url).json()
-            namespace_cache[ns_id] = namespace_data
+        namespace_data = namespace_cache.get(cdata['namespace']['id'])
 
-            # get the owners too
-            namespace_cache[ns_id]['summary_fields']['owners'] = \
-                get_namespace_owners_details(_baseurl, ns_id)
+        yield namespace_data, cdata, collection_versions
+        return
 
+    def fetch_collection(cdata):
+        # Get the namespace+owners
+        namespace_data = namespace_cache.get(cdata['namespace']['id'])
+
+        # get the versions
+        if get_versions:
+            collection_versions = paginated_results(cdata['versions_url'])
         else:
-            namespace_data = namespace_cache[ns_id]
+            collection_versions = []
 
-        yield namespace_data, cdata, collection_versions
-        return
+        return namespace_data, cdata, collection_versions
 
     pagenum = 0
     collection_count = 0
     next_url = _baseurl + '/api/v2/collections/'
-    while next_url:
-        logger.info(f'fetch {pagenum} {next_url}')
-
-        page = safe_fetch(next_url)
-
-        # Some upstream pages return ISEs for whatever reason.
-        if page.status_code >= 500:
-            if 'page=' in next_url:
-                next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
-            else:
-                next_url = next_url.rstrip('/') + '/?page={pagenum+1}'
-            pagenum += 1
-            continue
-
-        ds = page.json()
-
-        for cdata in ds['results']:
-
-            # Get the namespace+owners
-            ns_id = cdata['namespace']['id']
-            if ns_id not in namespace_cache:
-                logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
-                ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
-                namespace_data = safe_fetch(ns_url).json()
-                # logger.info(namespace_data)
-                namespace_cache[ns_id] = namespace_data
-
-                # get the owners too
-                namespace_cache[ns_id]['summary_fields']['owners'] = \
-                    get_namespace_owners_details(_baseurl, ns_id)
-
-            else:
-                namespace_data = namespace_cache[ns_id]
+    with fetch_pool(concurrency) as pool:
+        page_future = pool.submit(safe_fetch, next_url)
+        while page_future:
+            logger.info(f'fetch {pagenum} {next_url}')
+
+            page = page_future.result()
+            page_future = None
+
+            # Some upstream pages return ISEs for whatever reason.
+            if page.status_code >= 500:
+                if 'page=' in next_url:
+                    next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
+                else:
+                    next_url = next_url.rstrip('/') + '/?page={pagenum+1}'
+                pagenum += 1
+                page_future = pool.submit(safe_fetch, next_url)
+                continue
 
-            # get the versions
-            if get_versions:
-                collection_versions = paginated_results(cdata['versions_url'])
-            else:
-                collection_versions = []
+            ds = page.json()
 
-            # send the collection
-            collection_count += 1
-            yield namespace_data, cdata, collection_versions
+            # start fetching the next page while this one is processed
+            if ds.get('next_link'):
+                next_url = _baseurl + ds['next_link']
+                page_future = pool.submit(safe_fetch, next_url)
 
-            # break early if count reached
-            if limit is not None and collection_count >= limit:
-                break
+            item_futures = [pool.submit(fetch_collection, cdata) for cdata in ds['results']]
+            for item in item_futures:
 
-        # break early if count reached
-        if limit is not None and collection_count >= limit:
-            break
+                # send the collection
+                collection_count += 1
+                yield item.result()
 
-        # break if no next page
-        if not ds.get('next_link'):
-            break
+                # break early if count reached
+                if limit is not None and collection_count >= limit:
+                    return
 
-        pagenum += 1
-        next_url = _baseurl + ds['next_link']
+            pagenum += 1
 
 
 def upstream_role_iterator(
@@ -410,8 +497,18 @@ def upstream_role_iterator(
     role_name=None,
     get_versions=True,
     start_page=None,
+    concurrency=None,
+    page_callback=None,
 ):
-    """Abstracts the pagination of v1 roles into a generator with error handling."""
+    """Abstracts the pagination of v1 roles into a generator with error handling.
+
+    The next page and the details, namespace and versions of every role on the
+    current page are fetched by a pool of `concurrency` workers, roles are
+    yielded in the upstream order.
+
+    If given, `page_callback` is called with the url of the next page (or None
+    after the last one) once every role of a page has been consumed.
+    """
     if baseurl is None or not baseurl:
         baseurl = 'https://old-galaxy.ansible.com/api/v1/roles'
     logger.info(f'upstream_role_iterator baseurl:{baseurl}')
@@ -438,98 +535,98 @@ def upstream_role_iterator(
         else:
             next_url = next_url.rstrip('/') + f'/?page={start_page}'
 
-    namespace_cache = {}
+    namespace_cache = UpstreamNamespaceCache(_baseurl)
 
-    pagenum = 0
-    role_count = 0
-    while next_url:
-        logger.info(f'fetch {pagenum} {next_url} role-count:{role_count} ...')
-
-        page = safe_fetch(next_url)
-
-        # Some upstream pages return ISEs for whatever reason.
-        if page.status_code >= 500:
-            logger.error(f'{next_url} returned 500ISE. incrementing the page manually')
-            if 'page=' in next_url:
-                next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
-            else:
-                next_url = next_url.rstrip('/') + '/?page={pagenum + 1}'
-            pagenum += 1
-            continue
+    def fetch_role(rdata):
+        remote_id = rdata['id']
+        role_upstream_url = _baseurl + f'/api/v1/roles/{remote_id}/'
+        logger.info(f'fetch {role_upstream_url}')
 
-        ds = page.json()
+        role_page = safe_fetch(role_upstream_url)
+        if role_page.status_code == 404:
+            return None
 
-        # iterate each role
-        for rdata in ds['results']:
+        role_data = None
+        try:
+            role_data = role_page.json()
+            if role_data.get('detail', '').lower().strip() == 'not found':
+                return None
+        except Exception:
+            return None
 
-            remote_id = rdata['id']
-            role_upstream_url = _baseurl + f'/api/v1/roles/{remote_id}/'
-            logger.info(f'fetch {role_upstream_url}')
+        # Get the namespace+owners
+        ns_id = role_data['summary_fields']['namespace']['id']
+        try:
+            namespace_data = namespace_cache.get(ns_id)
+        except requests.exceptions.JSONDecodeError:
+            return None
+
+        # Get all of the versions because they have more info than the summary
+        if get_versions:
+            versions_url = role_upstream_url + 'versions'
+            role_versions = paginated_results(versions_url)
+        else:
+            role_versions = []
 
-            role_page = safe_fetch(role_upstream_url)
-            if role_page.status_code == 404:
-                continue
+        return namespace_data, role_data, role_versions
 
-            role_data = None
-            try:
-                role_data = role_page.json()
-                if role_data.get('detail', '').lower().strip() == 'not found':
-                    continue
-            except Exception:
+    pagenum = 0
+    role_count = 0
+    with fetch_pool(concurrency) as pool:
+        page_future = pool.submit(safe_fetch, next_url)
+        while page_future:
+            logger.info(f'fetch {pagenum} {next_url} role-count:{role_count} ...')
+
+            page = page_future.result()
+            page_future = None
+
+            # Some upstream pages return ISEs for whatever reason.
+            if page.status_code >= 500:
+                logger.error(f'{next_url} returned 500ISE. incrementing the page manually')
+                if 'page=' in next_url:
+                    next_url = next_url.replace(f'page={pagenum}', f'page={pagenum + 1}')
+                else:
+                    next_url = next_url.rstrip('/') + '/?page={pagenum + 1}'
+                pagenum += 1
+                page_future = pool.submit(safe_fetch, next_url)
                 continue
 
-            # Get the namespace+owners
-            ns_id = role_data['summary_fields']['namespace']['id']
-            if ns_id not in namespace_cache:
-                logger.info(_baseurl + f'/api/v1/namespaces/{ns_id}/')
-                ns_url = _baseurl + f'/api/v1/namespaces/{ns_id}/'
-
-                nsd_rr = safe_fetch(ns_url)
-                try:
-                    namespace_data = nsd_rr.json()
-                except requests.exceptions.JSONDecodeError:
-                    continue
-                namespace_cache[ns_id] = namespace_data
-
-                # get the owners too
-                namespace_cache[ns_id]['summary_fields']['owners'] = \
-                    get_namespace_owners_details(_baseurl, ns_id)
-
-            else:
-                namespace_data = namespace_cache[ns_id]
+            ds = page.json()
 
-            # Get all of the versions because they have more info than the summary
-            if get_versions:
-                versions_url = role_upstream_url + 'versions'
-                role_versions = paginated_results(versions_url)
+            # start fetching the next page while this one is processed
+            if ds.get('next'):
+                next_url = ds['next']
+            elif ds.get('next_link'):
+                next_url = ds['next_link']
             else:
-                role_versions = []
-
-            # send the role
-            role_count += 1
-            yield namespace_data, role_data, role_versions
-
-            # break early if count reached
-            if limit is not None and role_count >= limit:
-                break
+                # no next page
+                next_url = None
+
+            if next_url:
+                api_prefix = '/api/v1'
+                if not next_url.startswith(_baseurl):
+                    if not next_url.startswith(api_prefix):
+                        next_url = _baseurl + api_prefix + next_url
+                    else:
+                        next_url = _baseurl + next_url
+                page_future = pool.submit(safe_fetch, next_url)
+
+            # iterate each role
+            role_futures = [pool.submit(fetch_role, rdata) for rdata in ds['results']]
+            for role_future in role_futures:
+                role = role_future.result()
+                if role is None:
+                    continue
 
-        # break early if count reached
-        if limit is not None and role_count >= limit:
-            break
+                # send the role
+                role_count += 1
+                yield role
 
-        if ds.get('next'):
-            next_url = ds['next']
-        elif ds.get('next_link'):
-            next_url = ds['next_link']
-        else:
-            # break if no next page
-            break
+                # break early if count reached
+                if limit is not None and role_count >= limit:
+                    return
 
-        api_prefix = '/api/v1'
-        if not next_url.startswith(_baseurl):
-            if not next_url.startswith(api_prefix):
-                next_url = _baseurl + api_prefix + next_url
-            else:
-                next_url = _baseurl + next_url
+            if page_callback is not None:
+                page_callback(next_url)
 
-        pagenum += 1
+            pagenum += 1
@@ -0,0 +1,97 @@
+"""Semantic version ordering of collection versions in the database.
+
+`sort_key()` encodes a version so that the byte ("C" collation) order of the
+keys is the semantic version order:
+
+    <major>.<minor>.<patch> zero padded to 10 digits
+    "~" for a release, or "-" and the pre-release identifiers joined by "!",
+    numeric identifiers as "0" + their 2 digits length + the number and
+    alphanumeric identifiers as "1" + the identifier.
+
+The build metadata has no precedence and is left out. The `galaxy_semver_key()`
+SQL function (migration 0061) computes the same key from pulp_ansible's
+version_major/minor/patch/prerelease columns of ansible_collectionversion,
+which is indexed on (collection_id, key). `SemverKey` is the expression using
+that index.
+"""
+import semantic_version
+from django.db.models import CharField, F, Func, Q
+from semantic_version.base import AllOf, AnyOf, Never, Range
+
+
+def sort_key(version):
+    if not isinstance(version, semantic_version.Version):
+        version = semantic_version.Version(version)
+    key = f"{version.major:010d}.{version.minor:010d}.{version.patch:010d}"
+    if not version.prerelease:
+        return f"{key}~"
+    identifiers = (
+        f"0{len(part):02d}{part}" if part.isdigit() else f"1{part}"
+        for part in version.prerelease
+    )
+    return f"{key}-{'!'.join(identifiers)}"
+
+
+class SemverKey(Func):
+    """The sort key of the CollectionVersion at `prefix` (e.g. "collection_version__")."""
+
+    function = "galaxy_semver_key"
+    template = '%(function)s(%(expressions)s) COLLATE "C"'
+    output_field = CharField()
+
+    def __init__(self, prefix=""):
+        super().__init__(
+            F(f"{prefix}version_major"),
+            F(f"{prefix}version_minor"),
+            F(f"{prefix}version_patch"),
+            F(f"{prefix}version_prerelease"),
+        )
+
+
+_RANGE_LOOKUPS = {
+    Range.OP_EQ: "exact",
+    Range.OP_GT: "gt",
+    Range.OP_GTE: "gte",
+    Range.OP_LT: "lt",
+    Range.OP_LTE: "lte",
+}
+
+
+def _clause_q(clause, field):
+    if isinstance(clause, AllOf):
+        q = Q()
+        for child in clause.clauses:
+            q &= _clause_q(child, field)
+        return q
+    if isinstance(clause, AnyOf):
+        q = Q(pk__in=[])
+        for child in clause.clauses:
+            q |= _clause_q(child, field)
+        return q
+    if isinstance(clause, Never):
+        return Q(pk__in=[])
+    if isinstance(clause, Range) and clause.operator in _RANGE_LOOKUPS:
+        lookup = _RANGE_LOOKUPS[clause.operator]
+        return Q(**{f"{field}__{lookup}": sort_key(clause.target)})
+    # Always, != and anything else can't narrow the candidates down
+    return Q()
+
+
+def spec_candidates_q(spec, field="semver_key"):
+    """
+    A filter on the sort key annotation `field` keeping a superset of the versions
+    matching the SimpleSpec `spec`.
+
+    The bounds are exact, but the pre-release and build policies of the spec can
+    still exclude some of the candidates, see `filter_by_spec()`.
+    """
+    return _clause_q(spec.clause, field)
+
+
+def filter_by_spec(queryset, spec):
+    """Filters a CollectionVersion queryset by a semantic_version.SimpleSpec."""
+    if "semver_key" not in queryset.query.annotations:
+        queryset = queryset.annotate(semver_key=SemverKey())
+    candidates = queryset.filter(spec_candidates_q(spec)).values_list("version", flat=True)
+    matching = [v for v in candidates if spec.match(semantic_version.Version(v))]
+    return queryset.filter(version__in=matching)
@@ -0,0 +1,203 @@
+"""In-process benchmarks of the hot API views.
+
+Each scenario is requested through the django test client against a seeded
+data set, recording for every request the number of SQL queries and the wall
+time, and in a separate pass the peak memory allocated while serving it.
+
+The results are written to a JSON report. Two reports, e.g. of two commits,
+can be compared with
+
+    python -m galaxy_ng.tests.performance.benchmark base.json new.json
+
+which prints the differences and exits with 1 when a metric regressed more
+than the configured thresholds.
+"""
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime
+
+from galaxy_ng.tests.performance import constants
+
+
+def env_config(defaults, prefix="GALAXY_BENCHMARK_"):
+    """Returns `defaults` with each key overridden by its environment variable."""
+    config = {}
+    for key, default in defaults.items():
+        value = os.environ.get(f"{prefix}{key.upper()}")
+        config[key] = default if value is None else type(default)(value)
+    return config
+
+
+def get_volumes():
+    return env_config(constants.VOLUMES)
+
+
+def get_thresholds():
+    return env_config(constants.THRESHOLDS, prefix="GALAXY_BENCHMARK_MAX_")
+
+
+def get_run_config():
+    return env_config({
+        "iterations": constants.ITERATIONS,
+        "warmup": constants.WARMUP,
+        "report": constants.REPORT,
+        "baseline": "",
+    })
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non empty list."""
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(request, iterations, warmup):
+    """
+    Calls `request()`, which must return a response, `warmup` + `iterations` times.
+
+    Returns the status code, the number of queries of the last request, the wall
+    time percentiles in seconds and the peak memory in bytes of one more request
+    traced with tracemalloc (tracing slows the timed requests down so it is
+    done separately).
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        request()
+
+    times = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = request()
+            times.append(time.perf_counter() - start)
+        queries.append(len(ctx.captured_queries))
+
+    tracemalloc.start()
+    try:
+        request()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "response_bytes": len(response.content),
+        "queries": queries[-1],
+        "queries_max": max(queries),
+        "wall": {
+            "min": min(times),
+            "mean": statistics.fmean(times),
+            "p50": percentile(times, 50),
+            "p90": percentile(times, 90),
+            "p99": percentile(times, 99),
+            "max": max(times),
+        },
+        "peak_memory": peak_memory,
+    }
+
+
+class Report:
+    """Collects the scenario results of a run and writes them as JSON."""
+
+    def __init__(self, volumes, run_config):
+        self.data = {
+            "created": datetime.now(UTC).isoformat(),
+            "volumes": volumes,
+            "iterations": run_config["iterations"],
+            "warmup": run_config["warmup"],
+            "results": {},
+        }
+
+    def add(self, name, result):
+        self.data["results"][name] = result
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _metrics(result):
+    return {
+        "queries": result["queries"],
+        "p50": result["wall"]["p50"],
+        "p90": result["wall"]["p90"],
+        "peak_memory": result["peak_memory"],
+    }
+
+
+def compare_result(name, baseline, current, thresholds):
+    """Returns a message per metric of a scenario that regressed beyond its threshold."""
+    regressions = []
+    before, after = _metrics(baseline), _metrics(current)
+    for metric, allowed in thresholds.items():
+        if metric not in before:
+            continue
+        if metric == "queries":
+            regressed = after[metric] - before[metric] > allowed
+        else:
+            regressed = before[metric] > 0 and (after[metric] / before[metric] - 1) > allowed
+        if regressed:
+            regressions.append(
+                f"{name}: {metric} went from {before[metric]:.6g} to {after[metric]:.6g}"
+            )
+    return regressions
+
+
+def compare_reports(baseline, current, thresholds):
+    """
+    Returns the rows of a comparison table and the list of regressions of every
+    scenario found in both reports.
+    """
+    rows = []
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        if name not in baseline["results"]:
+            continue
+        before = _metrics(baseline["results"][name])
+        after = _metrics(result)
+        rows.append((name, before, after))
+        regressions.extend(compare_result(name, baseline["results"][name], result, thresholds))
+    return rows, regressions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: python -m galaxy_ng.tests.performance.benchmark BASE.json NEW.json")
+        return 2
+
+    baseline, current = load_report(argv[0]), load_report(argv[1])
+    if baseline["volumes"] != current["volumes"]:
+        print("warning: the reports were seeded with different volumes")
+
+    rows, regressions = compare_reports(baseline, current, get_thresholds())
+    print(f"{'scenario':<20} {'queries':>15} {'p50 ms':>19} {'p90 ms':>19} {'peak KiB':>21}")
+    for name, before, after in rows:
+        print(
+            f"{name:<20}"
+            f" {before['queries']:>6} -> {after['queries']:<6}"
+            f" {before['p50'] * 1000:>8.2f} -> {after['p50'] * 1000:<8.2f}"
+            f" {before['p90'] * 1000:>8.2f} -> {after['p90'] * 1000:<8.2f}"
+            f" {before['peak_memory'] / 1024:>9.0f} -> {after['peak_memory'] / 1024:<9.0f}"
+        )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
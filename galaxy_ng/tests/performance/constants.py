@@ -1,59 +1,73 @@
-URLS = {
-    '_ui/v1/settings/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
-    },
-    '_ui/v1/namespaces/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
-    },
-    '_ui/v1/auth/login/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
-    },
-    '_ui/v1/collection-versions/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
-    },
-    '_ui/v1/distributions/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
-    },
-    '_ui/v1/imports/collections/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
+# Data volumes seeded before the benchmarks run. Each one can be overridden
+# with an environment variable, e.g. GALAXY_BENCHMARK_NAMESPACES=500
+VOLUMES = {
+    "namespaces": 20,
+    "collections_per_namespace": 3,
+    "versions_per_collection": 3,
+    "roles_per_namespace": 3,
+    "users": 20,
+    "groups": 5,
+    "tags": 10,
+}
+
+# Measured requests per scenario (GALAXY_BENCHMARK_ITERATIONS) and the untimed
+# requests made before, to fill the per process caches (GALAXY_BENCHMARK_WARMUP).
+ITERATIONS = 10
+WARMUP = 2
+
+# Where the JSON report is written (GALAXY_BENCHMARK_REPORT) and the report of a
+# previous run to compare it with (GALAXY_BENCHMARK_BASELINE).
+REPORT = "benchmark-report.json"
+
+# Allowed regressions against the baseline report. queries is an absolute number
+# of extra queries, the others are relative increases, e.g. 0.5 allows p50 to
+# be 50% slower. Each one can be overridden, e.g. GALAXY_BENCHMARK_MAX_P90=1.0
+THRESHOLDS = {
+    "queries": 0,
+    "p50": 0.5,
+    "p90": 1.0,
+    "peak_memory": 0.5,
+}
+
+# The hot views: url name, url kwargs, query params and settings to run under.
+# "{base_path}" is replaced with the base path of the seeded distribution.
+SCENARIOS = {
+    "search": {
+        "url": "galaxy:api:ui:v1:search-view",
+        "params": {"order_by": "-download_count"},
     },
-    '_ui/v1/me/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "search_keywords": {
+        "url": "galaxy:api:ui:v1:search-view",
+        "params": {"keywords": "benchmark", "search_type": "sql"},
     },
-    '_ui/v1/remotes/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "collections": {
+        "url": "galaxy:api:v3:collections-list",
+        "kwargs": {"distro_base_path": "{base_path}"},
+        "params": {"limit": 100},
     },
-    '_ui/v1/search/' : {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "ui_collections": {
+        "url": "galaxy:api:ui:v1:collections-list",
+        "kwargs": {"distro_base_path": "{base_path}"},
+        "params": {"limit": 100},
     },
-    '_ui/v1/users/': {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "legacy_roles": {
+        "url": "galaxy:api:v1:legacy_role-list",
+        "params": {"page_size": 100},
     },
-    '_ui/v1/tags/': {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "namespaces": {
+        "url": "galaxy:api:v3:namespaces-list",
+        "params": {"limit": 100},
     },
-    '_ui/v1/tags/collections/': {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "tags": {
+        "url": "galaxy:api:ui:v1:tags-list",
+        "params": {"limit": 100},
     },
-    '_ui/v1/feature-flags/': {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "excludes": {
+        "url": "galaxy:api:v3:excludes-file",
+        "kwargs": {"path": "{base_path}"},
     },
-    '_ui/v1/tags/roles/': {
-        'baseline' : 0.5,
-        'method' : 'GET'
+    "landing_page": {
+        "url": "galaxy:api:ui:v1:landing-page",
+        "settings": {"GALAXY_DEPLOYMENT_MODE": "insights"},
     },
-    # more API calls with POST requests will be added
 }
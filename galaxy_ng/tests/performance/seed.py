@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from pulp_ansible.app.models import (
+    AnsibleDistribution,
+    Collection,
+    CollectionVersion,
+    Tag,
+)
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+)
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.models.auth import Group, User
+from galaxy_ng.app.tasks.search import rebuild_search_index
+
+
+@dataclass
+class SeededData:
+    user: User
+    distribution: AnsibleDistribution
+    counts: dict
+
+
+def seed(volumes):
+    """
+    Creates the benchmark data set, sized by `volumes` (see constants.VOLUMES).
+
+    Collection versions are added to the repository of the default distribution
+    in a single repository version. Bulk created roles don't fire the signals
+    maintaining the search index, so it is rebuilt at the end.
+    """
+    users = [
+        User.objects.create(username=f"benchmark_user{i}") for i in range(volumes["users"])
+    ]
+    groups = [
+        Group.objects.create(name=f"benchmark_group{i}") for i in range(volumes["groups"])
+    ]
+    for i, group in enumerate(groups):
+        group.user_set.add(*users[i::len(groups)])
+
+    tags = Tag.objects.bulk_create(Tag(name=f"tag{i}") for i in range(volumes["tags"]))
+
+    distribution = AnsibleDistribution.objects.get(
+        base_path=settings.GALAXY_API_DEFAULT_DISTRIBUTION_BASE_PATH
+    )
+
+    version_ids = []
+    roles = []
+    for i in range(volumes["namespaces"]):
+        namespace = Namespace.objects.create(
+            name=f"benchmark_ns{i}", company=f"Benchmark {i}"
+        )
+        for j in range(volumes["collections_per_namespace"]):
+            collection = Collection.objects.create(namespace=namespace.name, name=f"col{j}")
+            for k in range(volumes["versions_per_collection"]):
+                version = CollectionVersion.objects.create(
+                    collection=collection,
+                    namespace=namespace.name,
+                    name=collection.name,
+                    version=f"1.{k}.0",
+                    description=f"benchmark collection {j} version {k}",
+                    is_highest=k == volumes["versions_per_collection"] - 1,
+                )
+                if tags:
+                    version.tags.add(tags[(i + j + k) % len(tags)])
+                version_ids.append(version.pk)
+
+        legacy_namespace = LegacyNamespace.objects.create(
+            name=namespace.name, namespace=namespace
+        )
+        roles.extend(
+            LegacyRole(
+                namespace=legacy_namespace,
+                name=f"role{j}",
+                full_metadata={
+                    "description": f"benchmark role {j}",
+                    "tags": [tag.name for tag in tags[j % max(len(tags), 1):][:2]],
+                    "versions": [{"version": "1.0.0"}],
+                },
+            )
+            for j in range(volumes["roles_per_namespace"])
+        )
+
+    roles = LegacyRole.objects.bulk_create(roles)
+    LegacyRoleDownloadCount.objects.bulk_create(
+        LegacyRoleDownloadCount(legacyrole=role, count=i) for i, role in enumerate(roles)
+    )
+
+    repository = distribution.repository.cast()
+    with repository.new_version() as new_version:
+        new_version.add_content(CollectionVersion.objects.filter(pk__in=version_ids))
+
+    rebuild_search_index()
+
+    return SeededData(
+        user=users[0],
+        distribution=distribution,
+        counts={
+            "collection_versions": len(version_ids),
+            "roles": len(roles),
+            "users": len(users),
+            "groups": len(groups),
+            "tags": len(tags),
+        },
+    )
@@ -1,34 +1,143 @@
-import time
-import pytest
-
-from galaxy_ng.tests.performance.constants import URLS
-from ..integration.utils import (
-    UIClient,
-    get_client,
-)
-
-
-@pytest.fixture
-def api_client(ansible_config):
-    config = ansible_config("admin")
-    api_client = get_client(
-        config=config,
-        request_token=False,
-        require_auth=False
-    )
-    return api_client
-
-
-@pytest.mark.deployment_community
-@pytest.mark.parametrize(("url", "info"), URLS.items())
-def test_api_performance(ansible_config, api_client, url, info):
-    threshold = 0.25
-    results = []
-    cfg = ansible_config('basic_user')
-    with UIClient(config=cfg) as uclient:
-        start_time = time.time()
-        uclient.get(url)
-        elapsed_time = time.time() - start_time
-        difference = (elapsed_time - info['baseline']) / info['baseline']
-        results.append({url: difference})
-        assert difference < threshold
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import NoReverseMatch, reverse
+from rest_framework.test import APIClient
+
+from galaxy_ng.app.access_control import access_policy
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.tests.performance import benchmark
+from galaxy_ng.tests.performance.constants import SCENARIOS
+from galaxy_ng.tests.performance.seed import seed
+from galaxy_ng.tests.unit.api.base import MOCKED_RH_IDENTITY
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestBenchmarks(TestCase):
+    """
+    Seeds constants.VOLUMES and measures every scenario of constants.SCENARIOS.
+
+    The report is written to GALAXY_BENCHMARK_REPORT when the class is done, and
+    when GALAXY_BENCHMARK_BASELINE points to a previous report each scenario
+    fails if it regressed beyond the GALAXY_BENCHMARK_MAX_* thresholds.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.run_config = benchmark.get_run_config()
+        cls.thresholds = benchmark.get_thresholds()
+        cls.report = benchmark.Report(benchmark.get_volumes(), cls.run_config)
+        cls.baseline = None
+        if cls.run_config["baseline"]:
+            cls.baseline = benchmark.load_report(cls.run_config["baseline"])
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed(benchmark.get_volumes())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.report.data["counts"] = cls.data.counts
+        cls.report.write(cls.run_config["report"])
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.data.user)
+
+        patcher = mock.patch.object(
+            access_policy.AccessPolicyBase, "_get_rh_identity", return_value=MOCKED_RH_IDENTITY
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_scenario(self, name):
+        scenario = SCENARIOS[name]
+        kwargs = {
+            key: value.format(base_path=self.data.distribution.base_path)
+            for key, value in scenario.get("kwargs", {}).items()
+        }
+        try:
+            url = reverse(scenario["url"], kwargs=kwargs)
+        except NoReverseMatch:
+            self.skipTest(f"{scenario['url']} is not enabled")
+
+        params = scenario.get("params", {})
+        with override_settings(**scenario.get("settings", {})):
+            result = benchmark.measure(
+                lambda: self.client.get(url, params),
+                iterations=self.run_config["iterations"],
+                warmup=self.run_config["warmup"],
+            )
+        result["url"] = url
+        self.report.add(name, result)
+
+        self.assertEqual(result["status"], 200)
+        # the same request must not run a different number of queries once warm
+        self.assertEqual(result["queries"], result["queries_max"])
+
+        if self.baseline and name in self.baseline["results"]:
+            regressions = benchmark.compare_result(
+                name, self.baseline["results"][name], result, self.thresholds
+            )
+            self.assertEqual(regressions, [])
+
+    def test_search(self):
+        self._run_scenario("search")
+
+    def test_search_keywords(self):
+        self._run_scenario("search_keywords")
+
+    def test_collections(self):
+        self._run_scenario("collections")
+
+    def test_ui_collections(self):
+        self._run_scenario("ui_collections")
+
+    def test_legacy_roles(self):
+        self._run_scenario("legacy_roles")
+
+    def test_namespaces(self):
+        self._run_scenario("namespaces")
+
+    def test_tags(self):
+        self._run_scenario("tags")
+
+    def test_excludes(self):
+        self._run_scenario("excludes")
+
+    def test_landing_page(self):
+        self._run_scenario("landing_page")
+
+
+class TestReportComparison(TestCase):
+    def _report(self, queries, p50, peak_memory):
+        result = {
+            "queries": queries,
+            "wall": {"p50": p50, "p90": p50 * 2},
+            "peak_memory": peak_memory,
+        }
+        return {"volumes": {}, "results": {"search": result}}
+
+    def test_percentile(self):
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual(benchmark.percentile(values, 50), 3)
+        self.assertEqual(benchmark.percentile(values, 90), 5)
+        self.assertEqual(benchmark.percentile([7], 99), 7)
+
+    def test_within_thresholds(self):
+        thresholds = {"queries": 0, "p50": 0.5, "p90": 1.0, "peak_memory": 0.5}
+        _, regressions = benchmark.compare_reports(
+            self._report(10, 0.010, 1000), self._report(10, 0.014, 1400), thresholds
+        )
+        self.assertEqual(regressions, [])
+
+    def test_regressions(self):
+        thresholds = {"queries": 0, "p50": 0.5, "p90": 1.0, "peak_memory": 0.5}
+        _, regressions = benchmark.compare_reports(
+            self._report(10, 0.010, 1000), self._report(11, 0.020, 1000), thresholds
+        )
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("search: queries"))
+        self.assertTrue(regressions[1].startswith("search: p50"))
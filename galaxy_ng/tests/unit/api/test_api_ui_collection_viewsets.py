@@ -1,6 +1,8 @@
 import urllib
 
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from pulp_ansible.app.models import (
     AnsibleDistribution,
     AnsibleRepository,
@@ -162,6 +164,43 @@ class TestUiCollectionVersionViewSet(BaseTestCase):
         self.assertEqual(response.data['meta']['count'], 1)
         self.assertEqual(response.data['data'][0]['version'], '1.1.2')
 
+    def _count_list_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        return response, len(ctx.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        url = self._versions_url_with_params({'limit': 100})
+        response, few_rows_queries = self._count_list_queries(url)
+        self.assertEqual(response.data['meta']['count'], 2)
+
+        for i in range(10):
+            repo = _create_repo(name=f"more_repo{i}")
+            _get_create_version_in_repo(
+                self.namespace, self.collection, repo, version=f"2.0.{i}"
+            )
+            _get_create_version_in_repo(
+                self.namespace, self.collection, repo, version="1.1.1"
+            )
+
+        response, many_rows_queries = self._count_list_queries(url)
+        self.assertEqual(response.data['meta']['count'], 12)
+        self.assertEqual(few_rows_queries, many_rows_queries)
+
+        v111 = next(v for v in response.data['data'] if v['version'] == '1.1.1')
+        self.assertEqual(
+            v111['repository_list'], [f'more_repo{i}' for i in range(10)] + ['repo1']
+        )
+        for version in response.data['data']:
+            self.assertEqual(version['sign_state'], 'unsigned')
+
+    def test_list_of_missing_repository(self):
+        url = self._versions_url_with_params({'repository': 'repo_dne', 'limit': 100})
+        response, _ = self._count_list_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['meta']['count'], 0)
+        self.assertEqual(response.data['data'], [])
+
     def test_sort_and_repo_list(self):
         url = self._versions_url_with_params({'sort': 'pulp_created'})
         response = self.client.get(url)
@@ -235,6 +274,22 @@ class TestUiCollectionViewSet(BaseTestCase):
         response = self.client.get(self.repo1_collection1_detail_url)
         self.assertEqual(response.data['latest_version']['version'], '1.0.1')
 
+    def test_list_latest_version_is_semver_highest(self):
+        for version in ["1.9.0", "1.10.0-beta.2", "1.10.0-beta.10", "1.10.0", "1.2.0"]:
+            _get_create_version_in_repo(
+                self.namespace, self.collection1, self.repo3, version=version
+            )
+        _get_create_version_in_repo(
+            self.namespace, self.collection2, self.repo3, version="2.0.0-rc.1"
+        )
+
+        response = self.client.get(self.repo3_list_url)
+        self.assertEqual(response.data['meta']['count'], 2)
+        versions = {c['name']: c['latest_version']['version'] for c in response.data['data']}
+        self.assertEqual(
+            versions, {self.collection1.name: '1.10.0', self.collection2.name: '2.0.0-rc.1'}
+        )
+
     def test_include_related(self):
         response = self.client.get(self.repo1_list_url + "?include_related=my_permissions")
         for c in response.data['data']:
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.db.models import F
+from django.test import override_settings
+from pulp_ansible.app.models import CollectionDownloadCount
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+)
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.app.models import Namespace, SearchIndex
+from galaxy_ng.app.tasks import search
+from galaxy_ng.app.tasks.search import rebuild_search_index
+
+from .base import BaseTestCase, get_current_ui_url
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestUiSearchIndex(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.search_url = get_current_ui_url("search-view")
+        self.namespace = Namespace.objects.create(name="geerlingguy", _avatar_url="http://a/b.png")
+        self.legacy_namespace = LegacyNamespace.objects.create(
+            name="geerlingguy", namespace=self.namespace
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.docker = LegacyRole.objects.create(
+                namespace=self.legacy_namespace,
+                name="docker",
+                full_metadata={
+                    "description": "Docker for Linux.",
+                    "tags": ["docker", "containers"],
+                    "platforms": [{"name": "Ubuntu", "versions": ["jammy"]}],
+                    "versions": [{"version": "1.0.0"}, {"version": "2.0.0"}],
+                },
+            )
+            self.java = LegacyRole.objects.create(
+                namespace=self.legacy_namespace,
+                name="java",
+                full_metadata={"description": "Java for Linux.", "tags": ["java"]},
+            )
+
+    def test_roles_are_indexed_on_save(self):
+        entry = SearchIndex.objects.get(role=self.docker)
+        self.assertEqual(entry.content_type, "role")
+        self.assertEqual(entry.namespace_name, "geerlingguy")
+        self.assertEqual(entry.latest_version, "2.0.0")
+        self.assertEqual(entry.tag_names, ["docker", "containers"])
+        self.assertEqual(entry.namespace_avatar, "http://a/b.png")
+        self.assertEqual(entry.download_count, 0)
+
+    def test_download_count_and_avatar_are_propagated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            LegacyRoleDownloadCount.objects.create(legacyrole=self.docker, count=10)
+            self.namespace._avatar_url = "http://a/c.png"
+            self.namespace.save()
+
+        entry = SearchIndex.objects.get(role=self.docker)
+        self.assertEqual(entry.download_count, 10)
+        self.assertEqual(entry.namespace_avatar, "http://a/c.png")
+
+    def test_collection_download_count_is_propagated(self):
+        entry = SearchIndex.objects.create(
+            content_type="collection", namespace_name="geerlingguy", name="docker"
+        )
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch.object(search, "index_collections") as index_collections:
+            counter = CollectionDownloadCount.objects.create(
+                namespace="geerlingguy", name="docker", download_count=1
+            )
+            # what pulp_ansible does on each download
+            counter.download_count = F("download_count") + 1
+            counter.save()
+
+        index_collections.assert_not_called()
+        entry.refresh_from_db()
+        self.assertEqual(entry.download_count, 2)
+        self.assertEqual(SearchIndex.objects.get(role=self.docker).download_count, 0)
+
+    def test_search_reads_from_index(self):
+        response = self.client.get(self.search_url, {"type": "role", "tags": "docker"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["meta"]["count"], 1)
+        self.assertEqual(response.data["data"][0]["name"], "docker")
+        self.assertEqual(response.data["data"][0]["latest_version"], "2.0.0")
+
+        response = self.client.get(self.search_url, {"platform": "ubuntu"})
+        self.assertEqual(response.data["meta"]["count"], 1)
+
+        response = self.client.get(
+            self.search_url, {"search_type": "sql", "keywords": "java", "order_by": "name"}
+        )
+        self.assertEqual([r["name"] for r in response.data["data"]], ["java"])
+
+    def test_rebuild(self):
+        SearchIndex.objects.all().delete()
+        _, roles = rebuild_search_index()
+        self.assertEqual(roles, 2)
+        self.assertEqual(SearchIndex.objects.filter(content_type="role").count(), 2)
+
+    def test_cursor_pagination(self):
+        response = self.client.get(
+            self.search_url, {"pagination": "cursor", "limit": 1, "order_by": "name"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("count", response.data["meta"])
+        self.assertEqual([r["name"] for r in response.data["data"]], ["docker"])
+
+        next_link = response.data["links"]["next"]
+        self.assertIn("cursor=", next_link)
+        response = self.client.get(next_link)
+        self.assertEqual([r["name"] for r in response.data["data"]], ["java"])
+        self.assertIsNone(response.data["links"]["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.search_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,80 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pulp_container.app import models as container_models
+from pulp_container.constants import MEDIA_TYPE
+
+from galaxy_ng.app import models
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.app.models import auth as auth_models
+
+from .base import BaseTestCase
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestContainerRepositoryHistory(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = auth_models.User.objects.create(username="admin", is_superuser=True)
+        self.client.force_authenticate(user=self.admin)
+
+        self.repository = container_models.ContainerRepository.objects.create(name="history")
+        models.ContainerDistribution.objects.create(
+            name="history", base_path="history", repository=self.repository
+        )
+        self.url = reverse(
+            "galaxy:api:v3:container-repository-history", kwargs={"base_path": "history"}
+        )
+        self.pushes = 0
+
+    def _push(self, tag_name):
+        """Add a manifest tagged `tag_name` in a new repository version."""
+        self.pushes += 1
+        manifest = container_models.Manifest.objects.create(
+            digest=f"sha256:{self.pushes:064x}",
+            schema_version=2,
+            media_type=MEDIA_TYPE.MANIFEST_V2,
+        )
+        tag = container_models.Tag.objects.create(name=tag_name, tagged_manifest=manifest)
+        with self.repository.new_version() as version:
+            version.add_content(container_models.Manifest.objects.filter(pk=manifest.pk))
+            version.add_content(container_models.Tag.objects.filter(pk=tag.pk))
+        return manifest, tag
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"limit": 100})
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_content_info(self):
+        manifest, tag = self._push("latest")
+        response, _ = self._list()
+
+        added = sorted(response.data["data"][0]["added"], key=lambda item: item["pulp_type"])
+        self.assertEqual(added, [
+            {
+                "pulp_id": manifest.pk,
+                "pulp_type": "container.manifest",
+                "manifest_digest": manifest.digest,
+                "tag_name": None,
+            },
+            {
+                "pulp_id": tag.pk,
+                "pulp_type": "container.tag",
+                "manifest_digest": manifest.digest,
+                "tag_name": "latest",
+            },
+        ])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._push("v1")
+        response, few_rows_queries = self._list()
+        self.assertEqual(response.data["meta"]["count"], 1)
+
+        for i in range(2, 12):
+            self._push(f"v{i}")
+        response, many_rows_queries = self._list()
+        self.assertEqual(response.data["meta"]["count"], 11)
+        self.assertEqual(few_rows_queries, many_rows_queries)
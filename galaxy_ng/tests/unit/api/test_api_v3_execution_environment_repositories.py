@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pulp_container.app import models as container_models
+from pulpcore.plugin.util import assign_role
+
+from galaxy_ng.app import models
+from galaxy_ng.app.constants import DeploymentMode
+from galaxy_ng.app.models import auth as auth_models
+
+from .base import BaseTestCase
+
+NAMESPACE_OWNER_ROLE = "galaxy.execution_environment_namespace_owner"
+
+
+@override_settings(GALAXY_DEPLOYMENT_MODE=DeploymentMode.STANDALONE.value)
+class TestContainerRepositoryList(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = auth_models.User.objects.create(username="admin", is_superuser=True)
+        self.owner = auth_models.User.objects.create(username="ee_owner")
+        self.client.force_authenticate(user=self.admin)
+
+        self.registry = models.ContainerRegistryRemote.objects.create(
+            name="registry", url="quay.io"
+        )
+        self.url = reverse("galaxy:api:v3:container-repository-list")
+
+    def _add_repository(self, name):
+        namespace = models.ContainerNamespace.objects.create(name=name)
+        assign_role(NAMESPACE_OWNER_ROLE, self.owner, namespace)
+        remote = container_models.ContainerRemote.objects.create(
+            name=name, url="https://quay.io", upstream_name=name
+        )
+        models.ContainerRegistryRepos.objects.create(
+            registry=self.registry, repository_remote=remote
+        )
+        repository = container_models.ContainerRepository.objects.create(
+            name=name, remote=remote
+        )
+        return models.ContainerDistribution.objects.create(
+            name=name, base_path=name, repository=repository, namespace=namespace
+        )
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"limit": 100})
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_list(self):
+        distro = self._add_repository("ee1")
+        response, _ = self._list()
+
+        data = response.data["data"][0]
+        self.assertEqual(data["namespace"]["owners"], ["ee_owner"])
+
+        repository = data["pulp"]["repository"]
+        self.assertEqual(repository["version"], 0)
+        self.assertEqual(repository["sign_state"], "unsigned")
+        self.assertEqual(repository["remote"]["id"], distro.repository.remote_id)
+        self.assertEqual(repository["remote"]["registry"], str(self.registry.pk))
+        self.assertEqual(repository["remote"]["last_sync_task"], {})
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._add_repository("ee1")
+        response, few_rows_queries = self._list()
+        self.assertEqual(response.data["meta"]["count"], 1)
+
+        for i in range(2, 12):
+            self._add_repository(f"ee{i}")
+        response, many_rows_queries = self._list()
+        self.assertEqual(response.data["meta"]["count"], 11)
+        self.assertEqual(few_rows_queries, many_rows_queries)
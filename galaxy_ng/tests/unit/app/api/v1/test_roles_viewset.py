@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+)
+from galaxy_ng.app.api.v1.viewsets.roles import LegacyRolesViewSet
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.models.auth import User
+
+
+def _create_roles(prefix, count):
+    for i in range(count):
+        namespace = Namespace.objects.create(name=f"{prefix}_ns{i}")
+        legacy_namespace = LegacyNamespace.objects.create(
+            name=f"{prefix}_ns{i}", namespace=namespace
+        )
+        role = LegacyRole.objects.create(
+            namespace=legacy_namespace,
+            name=f"role{i}",
+            full_metadata={"versions": [{"name": "1.0.0"}], "tags": ["a"]},
+        )
+        LegacyRoleDownloadCount.objects.create(legacyrole=role, count=i)
+
+
+class TestLegacyRolesViewSetQueries(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="roles_user")
+        self.view = LegacyRolesViewSet.as_view({"get": "list"})
+
+    def _list(self, **params):
+        request = APIRequestFactory().get("/api/v1/roles/", {"page_size": 1000, **params})
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.view(request)
+            response.render()
+        return response, len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        _create_roles("small", 2)
+        response, small_page_queries = self._list()
+        self.assertEqual(response.data["count"], 2)
+
+        _create_roles("large", 30)
+        response, large_page_queries = self._list()
+        self.assertEqual(response.data["count"], 32)
+
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    def test_download_count_and_summary_fields(self):
+        _create_roles("detail", 3)
+        response, _ = self._list(order_by="-download_count")
+        results = response.data["results"]
+        self.assertEqual([r["download_count"] for r in results], [2, 1, 0])
+        self.assertEqual(results[0]["summary_fields"]["provider_namespace"]["name"], "detail_ns2")
+        self.assertEqual(results[0]["summary_fields"]["namespace"]["name"], "detail_ns2")
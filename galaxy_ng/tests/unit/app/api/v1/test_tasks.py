@@ -6,9 +6,11 @@ from galaxy_importer.config import Config
 from galaxy_ng.app.models import Namespace
 from galaxy_ng.app.api.v1.models import LegacyNamespace
 from galaxy_ng.app.api.v1.models import LegacyRole
+from galaxy_ng.app.api.v1.models import LegacyRoleDownloadCount
+from galaxy_ng.app.api.v1.models import LegacyRoleSyncCheckpoint
 
 from galaxy_ng.app.api.v1.tasks import legacy_role_import
-# from galaxy_ng.app.api.v1.tasks import legacy_sync_from_upstream
+from galaxy_ng.app.api.v1.tasks import legacy_sync_from_upstream
 
 
 @pytest.mark.django_db
@@ -187,3 +189,84 @@ def test_legacy_role_import_with_tag_name():
     # the tag should be in the versions ...
     vmap = {x['version']: x for x in role.full_metadata['versions']}
     assert github_reference in vmap
+
+
+def _upstream_role(role_id, modified='2023-01-01T00:00:00Z', download_count=0):
+    return {
+        'id': role_id,
+        'name': f'role{role_id}',
+        'github_user': 'syncuser',
+        'github_repo': f'ansible-role-{role_id}',
+        'github_branch': 'main',
+        'modified': modified,
+        'download_count': download_count,
+    }
+
+
+class FakeUpstream:
+    """Two pages of upstream roles, optionally failing after the first one."""
+
+    def __init__(self, pages, fail_on_page=None):
+        self.pages = pages
+        self.fail_on_page = fail_on_page
+        self.start_pages = []
+
+    def __call__(self, start_page=None, page_callback=None, **kwargs):
+        self.start_pages.append(start_page)
+        ns_data = {'name': 'syncuser', 'id': 1}
+        for pagenum in range(start_page or 1, len(self.pages) + 1):
+            if pagenum == self.fail_on_page:
+                raise ConnectionError('upstream went away')
+            for rdata in self.pages[pagenum - 1]:
+                yield ns_data, rdata, [{'name': '1.0.0'}]
+            next_url = None
+            if pagenum < len(self.pages):
+                next_url = f'https://galaxy.example.com/api/v1/roles/?page={pagenum + 1}'
+            page_callback(next_url)
+
+
+@pytest.mark.django_db
+def test_legacy_sync_from_upstream_resumes_and_skips_unchanged():
+    legacy_ns, _ = LegacyNamespace.objects.get_or_create(name='syncuser')
+    pages = [
+        [_upstream_role(1, download_count=5), _upstream_role(2)],
+        [_upstream_role(3)],
+    ]
+
+    def sync(upstream, **kwargs):
+        with patch('galaxy_ng.app.api.v1.tasks.upstream_role_iterator', upstream), \
+                patch('galaxy_ng.app.api.v1.tasks.process_namespace',
+                      return_value=(legacy_ns, None)):
+            legacy_sync_from_upstream(baseurl='https://galaxy.example.com', **kwargs)
+
+    # the first attempt dies on the second page, the first one is kept
+    with pytest.raises(ConnectionError):
+        sync(FakeUpstream(pages, fail_on_page=2))
+    assert sorted(LegacyRole.objects.values_list('name', flat=True)) == ['role1', 'role2']
+    checkpoint = LegacyRoleSyncCheckpoint.objects.get()
+    assert checkpoint.next_page == 2
+    assert checkpoint.completed is None
+
+    # the next one resumes from the second page
+    upstream = FakeUpstream(pages)
+    sync(upstream)
+    assert upstream.start_pages == [2]
+    assert LegacyRole.objects.count() == 3
+    checkpoint.refresh_from_db()
+    assert checkpoint.next_page is None
+    assert checkpoint.completed is not None
+    assert checkpoint.watermark is not None
+
+    # unchanged roles are not rewritten, changed ones and download counts are
+    role1 = LegacyRole.objects.get(name='role1')
+    role2 = LegacyRole.objects.get(name='role2')
+    pages[0] = [
+        _upstream_role(1, download_count=7),
+        _upstream_role(2, modified='2024-01-01T00:00:00Z'),
+    ]
+    sync(FakeUpstream(pages))
+    assert LegacyRole.objects.get(pk=role1.pk).modified == role1.modified
+    assert LegacyRole.objects.get(pk=role2.pk).modified > role2.modified
+    assert LegacyRole.objects.get(pk=role2.pk).full_metadata['modified'] == \
+        '2024-01-01T00:00:00Z'
+    assert LegacyRoleDownloadCount.objects.get(legacyrole=role1).count == 7
@@ -0,0 +1,67 @@
+import importlib
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+from insights_analytics_collector import register
+
+from galaxy_ng.app.metrics_collection.automation_analytics.collector import Collector
+from galaxy_ng.app.metrics_collection.common_data import changed_between, collections_query
+from galaxy_ng.app.models import MetricsCollectionState
+
+
+@register('config', '1.0', config=True)
+def config(since, **kwargs):
+    return {'hub_version': 'x.y'}
+
+
+@register('table', '1.0', format='csv')
+def table(since, full_path, until, **kwargs):
+    return []
+
+
+class TestIncrementalExport(TestCase):
+    def _collector(self, full_sync=False):
+        collector = Collector(
+            collector_module=importlib.import_module(__name__),
+            collection_type=Collector.MANUAL_COLLECTION,
+            full_sync=full_sync,
+        )
+        collector.last_gathered_entries = collector._load_last_gathered_entries()
+        collector._calculate_collection_interval(None, None)
+        collector._reset_collections_and_packages()
+        collector._create_collections(['table'])
+        return collector.collections['csv'][0]
+
+    def test_changed_between(self):
+        since = now() - timedelta(days=1)
+        until = now()
+        assert changed_between('pulp_last_updated') == ''
+        assert changed_between('pulp_last_updated', None, until) == (
+            f"WHERE pulp_last_updated <= '{until.isoformat()}'::timestamptz"
+        )
+        assert changed_between('pulp_last_updated', since, until) == (
+            f"WHERE pulp_last_updated > '{since.isoformat()}'::timestamptz"
+            f" AND pulp_last_updated <= '{until.isoformat()}'::timestamptz"
+        )
+        assert f"> '{since.isoformat()}'" in collections_query(since, until)
+
+    def test_first_gathering_is_full(self):
+        collection = self._collector()
+        assert collection.since is None
+        assert collection.until is not None
+
+    def test_next_gathering_starts_at_last_entry(self):
+        last_entry = now() - timedelta(weeks=8)
+        Collector(collection_type=Collector.MANUAL_COLLECTION)._save_last_gathered_entries(
+            {'table': last_entry}
+        )
+        state = MetricsCollectionState.objects.get(collector='automation_analytics')
+        assert state.last_gathered_entries == {'table': last_entry.isoformat()}
+
+        # older than the 4 weeks window of the upstream collector, nothing is lost
+        collection = self._collector()
+        assert collection.since == last_entry
+
+        collection = self._collector(full_sync=True)
+        assert collection.since is None
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.access_control import access_policy
+from galaxy_ng.app.access_control.access_policy import (
+    AccessPolicyBase,
+    CollectionAccessPolicy,
+    get_access_cache_stats,
+    request_memoize,
+    user_has_perm,
+)
+
+
+class TestRequestMemoize(TestCase):
+    def setUp(self):
+        access_policy.ACCESS_CACHE_STATS.reset()
+
+    def test_value_is_computed_once_per_request(self):
+        request = SimpleNamespace()
+        func = mock.Mock(return_value=42)
+
+        self.assertEqual(request_memoize(request, "test", ("a",), func), 42)
+        self.assertEqual(request_memoize(request, "test", ("a",), func), 42)
+        func.assert_called_once()
+
+        request_memoize(SimpleNamespace(), "test", ("a",), func)
+        self.assertEqual(func.call_count, 2)
+
+        stats = get_access_cache_stats()["test"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3)
+
+    def test_nothing_is_cached_without_request(self):
+        func = mock.Mock(return_value=True)
+        request_memoize(None, "test", ("a",), func)
+        request_memoize(None, "test", ("a",), func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_has_perm_is_keyed_by_permission_and_object(self):
+        request = SimpleNamespace()
+        user = mock.Mock(pk=1)
+        user.has_perm.side_effect = lambda perm, obj=None: obj is not None
+        repo = mock.Mock(pk=5, _meta=SimpleNamespace(label="ansible.AnsibleRepository"))
+
+        for _ in range(3):
+            self.assertFalse(user_has_perm(request, user, "ansible.view_ansiblerepository"))
+            self.assertTrue(user_has_perm(request, user, "ansible.view_ansiblerepository", repo))
+
+        self.assertEqual(user.has_perm.call_count, 2)
+
+
+class TestResolvedPolicyCache(TestCase):
+    def setUp(self):
+        access_policy._RESOLVED_POLICIES.clear()
+        access_policy.ACCESS_CACHE_STATS.reset()
+
+    def test_named_policy_is_resolved_once_per_deployment_mode(self):
+        first = CollectionAccessPolicy.get_access_policy(None)
+        self.assertIs(CollectionAccessPolicy.get_access_policy(None), first)
+
+        with override_settings(GALAXY_DEPLOYMENT_MODE="insights"):
+            self.assertIsNot(CollectionAccessPolicy.get_access_policy(None), first)
+
+        stats = get_access_cache_stats()["policy"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_views_without_policy_are_not_cached(self):
+        class FakeView:
+            pass
+
+        policy = AccessPolicyBase.get_access_policy(FakeView())
+        self.assertEqual(policy.statements[0]["principal"], "admin")
+        self.assertEqual(access_policy._RESOLVED_POLICIES, {})
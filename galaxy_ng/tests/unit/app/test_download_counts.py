@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleDownloadCount,
+)
+from galaxy_ng.app.tasks import download_counts
+
+
+class TestRoleDownloadCounts(TestCase):
+    def setUp(self):
+        namespace = LegacyNamespace.objects.create(name="geerlingguy")
+        self.role = LegacyRole.objects.create(namespace=namespace, name="docker")
+
+    @override_settings(GALAXY_BUFFER_DOWNLOAD_COUNTS=False)
+    def test_count_is_synchronous_when_buffering_disabled(self):
+        download_counts.count_role_download(self.role)
+        download_counts.count_role_download(self.role)
+        self.assertEqual(LegacyRoleDownloadCount.objects.get(legacyrole=self.role).count, 2)
+
+    @override_settings(GALAXY_BUFFER_DOWNLOAD_COUNTS=True)
+    def test_count_falls_back_to_synchronous_without_redis(self):
+        with mock.patch.object(download_counts, "_buffer_role_download", return_value=False):
+            download_counts.count_role_download(self.role)
+        self.assertEqual(LegacyRoleDownloadCount.objects.get(legacyrole=self.role).count, 1)
+
+    @override_settings(GALAXY_BUFFER_DOWNLOAD_COUNTS=True)
+    def test_count_is_buffered(self):
+        with mock.patch.object(
+            download_counts, "_buffer_role_download", return_value=True
+        ) as buffer:
+            download_counts.count_role_download(self.role)
+        buffer.assert_called_once_with(self.role.pk)
+        self.assertFalse(LegacyRoleDownloadCount.objects.filter(legacyrole=self.role).exists())
+
+    def test_flush_adds_deltas(self):
+        LegacyRoleDownloadCount.objects.create(legacyrole=self.role, count=10)
+        other = LegacyRole.objects.create(namespace=self.role.namespace, name="java")
+        deltas = {self.role.pk: 5, other.pk: 2, 999999: 3}
+
+        with mock.patch.object(download_counts, "_drain_role_downloads", return_value=deltas):
+            download_counts.flush_role_download_counts()
+
+        self.assertEqual(LegacyRoleDownloadCount.objects.get(legacyrole=self.role).count, 15)
+        self.assertEqual(LegacyRoleDownloadCount.objects.get(legacyrole=other).count, 2)
+        self.assertFalse(LegacyRoleDownloadCount.objects.filter(legacyrole_id=999999).exists())
+
+    def test_flush_without_buffered_counts(self):
+        with mock.patch.object(download_counts, "_drain_role_downloads", return_value={}):
+            self.assertEqual(download_counts.flush_role_download_counts(), 0)
@@ -0,0 +1,127 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase, override_settings
+from pulp_container.app import models as container_models
+
+from galaxy_ng.app import models
+from galaxy_ng.app.tasks import index_registry
+
+
+class CatalogStub:
+    """Serves a Red Hat container catalog of the given containers on a local port."""
+
+    def __init__(self, containers, page_size=2):
+        self.containers = containers
+        self.page_size = page_size
+        self.requested_pages = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                page = int(parse_qs(urlparse(self.path).query)["page"][0])
+                stub.requested_pages.append(page)
+                start = page * stub.page_size
+                body = json.dumps({
+                    "data": [
+                        {
+                            "repository": name,
+                            "display_data": {
+                                "short_description": description,
+                                "long_description_markdown": readme,
+                            },
+                        }
+                        for name, description, readme
+                        in stub.containers[start:start + stub.page_size]
+                    ],
+                    "page": page,
+                    "page_size": stub.page_size,
+                    "total": len(stub.containers),
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/containers/v1/repositories"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestIndexRedHatRegistry(TestCase):
+    def setUp(self):
+        self.registry = models.ContainerRegistryRemote.objects.create(
+            name="redhat", url="https://registry.redhat.io"
+        )
+        self.readmes = {
+            name: self._add_indexed_container(name, "description", "readme")
+            for name in ("ee-changed", "ee-unchanged")
+        }
+
+    def _add_indexed_container(self, name, description, readme):
+        remote = container_models.ContainerRemote.objects.create(
+            name=name, url=self.registry.url, upstream_name=name
+        )
+        models.ContainerRegistryRepos.objects.create(
+            registry=self.registry, repository_remote=remote
+        )
+        repository = container_models.ContainerRepository.objects.create(
+            name=name, remote=remote
+        )
+        distro = container_models.ContainerDistribution.objects.create(
+            name=name, base_path=name, repository=repository, description=description
+        )
+        return models.ContainerDistroReadme.objects.create(container=distro, text=readme)
+
+    def _index(self, catalog):
+        with override_settings(GALAXY_CONTAINER_CATALOG_API=catalog.url), \
+                mock.patch.object(index_registry, "dispatch") as dispatch:
+            index_registry.index_execution_environments_from_redhat_registry(
+                self.registry.pk, {"META": {}}
+            )
+        return [call.kwargs["kwargs"]["container_data"]["name"] for call in dispatch.mock_calls]
+
+    def test_only_changes_are_written(self):
+        containers = [
+            ("ee-changed", "new description", "new readme"),
+            ("ee-unchanged", "description", "readme"),
+            ("ee-new", "description", "readme"),
+        ]
+        with CatalogStub(containers) as catalog:
+            dispatched = self._index(catalog)
+
+        self.assertEqual(sorted(catalog.requested_pages), [0, 1])
+        self.assertEqual(dispatched, ["ee-new"])
+
+        changed = models.ContainerDistroReadme.objects.get(container__base_path="ee-changed")
+        self.assertEqual(changed.text, "new readme")
+        self.assertEqual(changed.container.description, "new description")
+
+        unchanged = models.ContainerDistroReadme.objects.get(container__base_path="ee-unchanged")
+        self.assertEqual(unchanged.updated, self.readmes["ee-unchanged"].updated)
+
+    def test_local_container_is_reported(self):
+        repository = container_models.ContainerRepository.objects.create(name="ee-local")
+        container_models.ContainerDistribution.objects.create(
+            name="ee-local", base_path="ee-local", repository=repository
+        )
+
+        with CatalogStub([("ee-local", "description", "readme")]) as catalog:
+            dispatched = self._index(catalog)
+
+        self.assertEqual(dispatched, ["ee-local"])
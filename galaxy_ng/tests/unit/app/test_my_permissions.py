@@ -0,0 +1,81 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from pulpcore.plugin.models.role import Role, UserRole
+from pulpcore.plugin.util import assign_role, get_perms_for_model
+
+from galaxy_ng.app.access_control.fields import MyPermissionsField
+from galaxy_ng.app.models import Namespace
+from galaxy_ng.app.models.auth import Group, User
+
+
+def _reference_permissions(user, obj):
+    """The per object implementation MyPermissionsField used to have."""
+    my_perms = []
+    for perm in get_perms_for_model(type(obj)).all():
+        codename = "{}.{}".format(perm.content_type.app_label, perm.codename)
+        if user.has_perm(codename) or user.has_perm(codename, obj):
+            my_perms.append(codename)
+    return my_perms
+
+
+class TestMyPermissionsField(TestCase):
+    def setUp(self):
+        self.namespaces = [Namespace.objects.create(name=f"my_perms_ns{i}") for i in range(6)]
+        self.group = Group.objects.create(name="my_perms_group")
+
+        self.owner = User.objects.create(username="my_perms_owner")
+        assign_role("galaxy.collection_namespace_owner", self.owner, self.namespaces[0])
+        assign_role("galaxy.collection_namespace_owner", self.group, self.namespaces[1])
+        self.owner.groups.add(self.group)
+
+        self.admin = User.objects.create(username="my_perms_admin")
+        assign_role("galaxy.collection_admin", self.admin)
+
+        self.superuser = User.objects.create(username="my_perms_super", is_superuser=True)
+        self.nobody = User.objects.create(username="my_perms_nobody")
+
+    def _field(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return MyPermissionsField(read_only=True, context={"request": request})
+
+    def test_matches_per_object_implementation(self):
+        for user in (self.owner, self.admin, self.superuser, self.nobody):
+            field = self._field(user)
+            for namespace in self.namespaces:
+                self.assertEqual(
+                    field.to_representation(namespace),
+                    _reference_permissions(user, namespace),
+                    f"{user.username} {namespace.name}",
+                )
+
+    def test_owner_permissions(self):
+        field = self._field(self.owner)
+        self.assertIn("galaxy.change_namespace", field.to_representation(self.namespaces[0]))
+        self.assertIn("galaxy.upload_to_namespace", field.to_representation(self.namespaces[1]))
+        self.assertEqual(field.to_representation(self.namespaces[2]), [])
+
+    def test_queries_do_not_grow_with_rows(self):
+        field = self._field(self.owner)
+        field.to_representation(self.namespaces[0])
+        with CaptureQueriesContext(connection) as ctx:
+            for namespace in self.namespaces:
+                field.to_representation(namespace)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_roles_on_other_models_are_ignored(self):
+        # a role with namespace permissions on a group with the id of a namespace
+        UserRole.objects.create(
+            user=self.nobody,
+            role=Role.objects.get(name="galaxy.collection_namespace_owner"),
+            content_type=ContentType.objects.get_for_model(Group),
+            object_id=str(self.namespaces[2].pk),
+        )
+        field = self._field(self.nobody)
+        self.assertEqual(field.to_representation(self.namespaces[2]), [])
+        self.assertEqual(
+            field.to_representation(self.namespaces[2]),
+            _reference_permissions(self.nobody, self.namespaces[2]),
+        )
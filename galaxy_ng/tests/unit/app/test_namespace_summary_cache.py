@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from galaxy_ng.app.api.v3.serializers.namespace import (
+    NAMESPACE_SUMMARY_CACHE_KEY,
+    get_namespace_summary,
+)
+from galaxy_ng.app.models import Namespace
+
+
+class TestNamespaceSummaryCache(TestCase):
+    def setUp(self):
+        self.namespace = Namespace.objects.create(name="summary_ns", company="Summary")
+        self.addCleanup(cache.delete, NAMESPACE_SUMMARY_CACHE_KEY.format(name="summary_ns"))
+
+    def test_computed_once_per_context(self):
+        context = {}
+        summary = get_namespace_summary("summary_ns", context)
+        self.assertEqual(summary["company"], "Summary")
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = get_namespace_summary("summary_ns", context)
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(again, summary)
+
+        # a new context (request) computes it again
+        with CaptureQueriesContext(connection) as ctx:
+            get_namespace_summary("summary_ns", {})
+        self.assertGreater(len(ctx.captured_queries), 0)
+
+    @override_settings(GALAXY_NAMESPACE_SUMMARY_CACHE_TIMEOUT=60)
+    def test_shared_cache_and_invalidation(self):
+        get_namespace_summary("summary_ns", {})
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = get_namespace_summary("summary_ns", {})
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(summary["company"], "Summary")
+        self.assertEqual(summary["related_fields"], {})
+
+        self.namespace.company = "Renamed"
+        self.namespace.save()
+
+        summary = get_namespace_summary("summary_ns", {})
+        self.assertEqual(summary["company"], "Renamed")
@@ -0,0 +1,157 @@
+import asyncio
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from pulp_container.app import models as container_models
+from pulp_container.constants import MEDIA_TYPE
+from pulpcore.plugin.models import Task
+from pulpcore.plugin.util import get_url
+
+from galaxy_ng.app import models
+from galaxy_ng.app.tasks import registry_sync
+
+DIGEST = f"sha256:{1:064x}"
+
+
+@override_settings(GALAXY_REGISTRY_SYNC_CONCURRENCY=2)
+class TestSyncAllReposInRegistry(TestCase):
+    def setUp(self):
+        self.registry = models.ContainerRegistryRemote.objects.create(
+            name="registry", url="https://quay.io", username="foo", password="bar"
+        )
+        self.repositories = {}
+        for name in ("synced", "new", "moved"):
+            remote = container_models.ContainerRemote.objects.create(
+                name=name, url="https://quay.io", upstream_name=name,
+                username="foo", password="bar",
+            )
+            models.ContainerRegistryRepos.objects.create(
+                registry=self.registry, repository_remote=remote
+            )
+            self.repositories[name] = container_models.ContainerRepository.objects.create(
+                name=name, remote=remote
+            )
+
+        # "synced" and "moved" hold the upstream content, "moved" is synced
+        # from another url than the one of the registry
+        container_models.ContainerRemote.objects.filter(name="moved").update(
+            url="https://old.example.com"
+        )
+        manifest = container_models.Manifest.objects.create(
+            digest=DIGEST, schema_version=2, media_type=MEDIA_TYPE.MANIFEST_V2
+        )
+        tag = container_models.Tag.objects.create(name="latest", tagged_manifest=manifest)
+        for name in ("synced", "moved"):
+            with self.repositories[name].new_version() as version:
+                version.add_content(container_models.Tag.objects.filter(pk=tag.pk))
+            self._complete_sync(name)
+
+    def _complete_sync(self, name):
+        """Record a successful sync of the repository, as the pulp tasking system does."""
+        repository = self.repositories[name]
+        now = timezone.now()
+        Task.objects.create(
+            name=registry_sync.SYNC_TASK_NAME,
+            state="completed",
+            logging_cid="",
+            started_at=now,
+            finished_at=now,
+            reserved_resources_record=[
+                get_url(repository),
+                f"shared:{get_url(repository.remote.cast())}",
+            ],
+        )
+
+    def _sync(self, upstream):
+        probe = mock.patch.object(
+            registry_sync,
+            "_probe_all_upstreams",
+            side_effect=lambda remotes: {remote.pk: upstream for remote in remotes},
+        )
+        with probe as probe_all, \
+                mock.patch.object(registry_sync, "ProgressReport"), \
+                mock.patch.object(registry_sync, "dispatch") as dispatch:
+            registry_sync.sync_all_repos_in_registry(self.registry.pk)
+        return probe_all, dispatch
+
+    def _synced_names(self, dispatch):
+        repository_pks = {call.kwargs["kwargs"]["repository_pk"] for call in dispatch.mock_calls}
+        return {name for name, repo in self.repositories.items() if str(repo.pk) in repository_pks}
+
+    def test_unchanged_repositories_are_skipped(self):
+        probe_all, dispatch = self._sync({"latest": DIGEST})
+
+        # only "synced" is probed, "new" is empty and "moved" has a new url
+        probed = probe_all.call_args.args[0]
+        self.assertEqual([remote.name for remote in probed], ["synced"])
+        self.assertEqual(self._synced_names(dispatch), {"new", "moved"})
+
+        remote = container_models.ContainerRemote.objects.get(name="moved")
+        self.assertEqual(remote.url, "https://quay.io")
+
+        task_groups = {call.kwargs["task_group"] for call in dispatch.mock_calls}
+        self.assertEqual(len(task_groups), 1)
+        self.assertTrue(task_groups.pop().all_tasks_dispatched)
+
+    def test_unchanged_upstream_is_skipped_after_a_remote_change(self):
+        # "moved" is synced once after its url changes, which leaves no new
+        # repository version as upstream is unchanged
+        _, dispatch = self._sync({"latest": DIGEST})
+        self.assertIn("moved", self._synced_names(dispatch))
+        self._complete_sync("moved")
+
+        probe_all, dispatch = self._sync({"latest": DIGEST})
+        self.assertEqual(
+            sorted(remote.name for remote in probe_all.call_args.args[0]), ["moved", "synced"]
+        )
+        self.assertEqual(self._synced_names(dispatch), {"new"})
+
+    def test_failed_sync_is_not_skipped(self):
+        Task.objects.filter(name=registry_sync.SYNC_TASK_NAME).update(state="failed")
+        probe_all, dispatch = self._sync({"latest": DIGEST})
+        self.assertEqual(probe_all.call_args.args[0], [])
+        self.assertEqual(self._synced_names(dispatch), {"synced", "new", "moved"})
+
+    def test_changed_upstream_is_synced(self):
+        _, dispatch = self._sync({"latest": f"sha256:{2:064x}"})
+        self.assertEqual(self._synced_names(dispatch), {"synced", "new", "moved"})
+
+        lanes = [
+            resource
+            for call in dispatch.mock_calls
+            for resource in call.kwargs["exclusive_resources"]
+            if isinstance(resource, str)
+        ]
+        self.assertEqual(len(lanes), 3)
+        self.assertEqual(len(set(lanes)), 2)
+
+    def test_signed_repositories_are_synced(self):
+        container_models.ContainerRemote.objects.filter(name="synced").update(
+            sigstore="https://sigstore.example.com"
+        )
+        probe_all, dispatch = self._sync({"latest": DIGEST})
+        self.assertEqual(probe_all.call_args.args[0], [])
+        self.assertEqual(self._synced_names(dispatch), {"synced", "new", "moved"})
+
+        remote = container_models.ContainerRemote.objects.get(name="new")
+        with mock.patch.object(registry_sync, "_has_signature_api", return_value=True), \
+                mock.patch.object(registry_sync, "_list_upstream_tags") as list_tags:
+            probed = asyncio.run(registry_sync._probe_upstream(remote, asyncio.Semaphore(1)))
+        self.assertIsNone(probed)
+        list_tags.assert_not_called()
+
+    @override_settings(GALAXY_REGISTRY_SYNC_SKIP_UNCHANGED=False)
+    def test_skip_disabled(self):
+        probe_all, dispatch = self._sync({"latest": DIGEST})
+        probe_all.assert_not_called()
+        self.assertEqual(len(dispatch.mock_calls), 3)
+
+    def test_filter_tags(self):
+        remote = container_models.ContainerRemote(
+            include_tags=["v1*", "latest"], exclude_tags=["*-rc"]
+        )
+        self.assertEqual(
+            registry_sync._filter_tags(remote, ["latest", "v1.0", "v1.1-rc", "v2.0"]),
+            ["latest", "v1.0"],
+        )
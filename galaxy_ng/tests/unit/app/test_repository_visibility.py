@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+from pulp_ansible.app.models import AnsibleRepository
+from pulpcore.plugin.util import assign_role, remove_role
+
+from galaxy_ng.app.access_control.access_policy import AccessPolicyBase
+from galaxy_ng.app.access_control.visibility import rebuild_repository_visibility
+from galaxy_ng.app.models import RepositoryVisibility
+from galaxy_ng.app.models.auth import Group, User
+
+REPO_OWNER_ROLE = "galaxy.ansible_repository_owner"
+
+
+class TestRepositoryVisibility(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="visibility_user")
+        self.group = Group.objects.create(name="visibility_group")
+        self.public = AnsibleRepository.objects.create(name="visibility_public")
+        self.private = AnsibleRepository.objects.create(name="visibility_private", private=True)
+        self.hidden = AnsibleRepository.objects.create(name="visibility_hidden", private=True)
+
+    def _scoped_names(self):
+        view = SimpleNamespace(request=SimpleNamespace(user=self.user))
+        qs = AccessPolicyBase().scope_by_view_repository_permissions(
+            view,
+            AnsibleRepository.objects.filter(name__startswith="visibility_"),
+            is_generic=False,
+        )
+        return set(qs.values_list("name", flat=True))
+
+    def test_user_role_is_materialized(self):
+        self.assertEqual(self._scoped_names(), {"visibility_public"})
+
+        assign_role(REPO_OWNER_ROLE, self.user, self.private)
+        self.assertTrue(
+            RepositoryVisibility.objects.filter(user=self.user, repository=self.private).exists()
+        )
+        self.assertEqual(self._scoped_names(), {"visibility_public", "visibility_private"})
+
+        remove_role(REPO_OWNER_ROLE, self.user, self.private)
+        self.assertFalse(RepositoryVisibility.objects.filter(user=self.user).exists())
+        self.assertEqual(self._scoped_names(), {"visibility_public"})
+
+    def test_group_role_follows_membership(self):
+        assign_role(REPO_OWNER_ROLE, self.group, self.private)
+        self.assertTrue(
+            RepositoryVisibility.objects.filter(group=self.group, repository=self.private).exists()
+        )
+        self.assertEqual(self._scoped_names(), {"visibility_public"})
+
+        self.user.groups.add(self.group)
+        self.assertEqual(self._scoped_names(), {"visibility_public", "visibility_private"})
+
+    def test_rebuild(self):
+        assign_role(REPO_OWNER_ROLE, self.user, self.private)
+        assign_role(REPO_OWNER_ROLE, self.group, self.hidden)
+        RepositoryVisibility.objects.all().delete()
+
+        self.assertEqual(rebuild_repository_visibility(), (1, 1))
+        self.assertEqual(RepositoryVisibility.objects.count(), 2)
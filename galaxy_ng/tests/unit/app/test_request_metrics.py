@@ -0,0 +1,62 @@
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from galaxy_ng.app.common.middleware import RequestMetricsMiddleware
+from galaxy_ng.app.models import Namespace
+
+
+def _view(request):
+    for _ in range(3):
+        Namespace.objects.filter(name="nope").exists()
+    return HttpResponse(b"x" * 10)
+
+
+def _sample(name, view):
+    return REGISTRY.get_sample_value(name, {"view": view}) or 0
+
+
+class TestRequestMetricsMiddleware(TestCase):
+    def _request(self, view_name):
+        request = RequestFactory().get("/api/test/")
+        request.resolver_match = type(
+            "Match", (), {"view_name": view_name, "_func_path": "test.view"}
+        )()
+        return request
+
+    @override_settings(GALAXY_REQUEST_METRICS_SAMPLE_RATE=1.0)
+    def test_sampled_request(self):
+        view = "test:sampled"
+        middleware = RequestMetricsMiddleware(_view)
+        middleware(self._request(view))
+
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "galaxy_api_request_latency_seconds_count", {"view": view, "method": "GET"}
+            ),
+            1,
+        )
+        self.assertEqual(_sample("galaxy_api_request_sql_queries_sum", view), 3)
+        self.assertEqual(_sample("galaxy_api_response_size_bytes_sum", view), 10)
+
+    @override_settings(GALAXY_REQUEST_METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_request_has_no_sql_metrics(self):
+        view = "test:unsampled"
+        RequestMetricsMiddleware(_view)(self._request(view))
+        self.assertEqual(_sample("galaxy_api_response_size_bytes_count", view), 1)
+        self.assertEqual(_sample("galaxy_api_request_sql_queries_count", view), 0)
+
+    @override_settings(
+        GALAXY_REQUEST_METRICS_SAMPLE_RATE=1.0,
+        GALAXY_SLOW_REQUEST_THRESHOLD=0,
+        GALAXY_SLOW_REQUEST_EXPLAIN=True,
+    )
+    def test_slow_request_is_logged_with_plan(self):
+        with self.assertLogs("galaxy_ng.app.common.middleware", level="WARNING") as logs:
+            RequestMetricsMiddleware(_view)(self._request("test:slow"))
+        output = "\n".join(logs.output)
+        self.assertIn("Slow request GET /api/test/ (test:slow)", output)
+        self.assertIn("queries=3", output)
+        if connection.vendor == "postgresql":
+            self.assertIn("plan:", output)
@@ -0,0 +1,140 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from galaxy_ng.app.common import response_cache
+from galaxy_ng.app.common.middleware import ResponseCacheMiddleware
+from galaxy_ng.app.tasks import settings_cache
+
+
+class FakeRedis:
+    """The subset of the redis client used by the response cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        pass
+
+
+class CountingView(APIView):
+    permission_classes = [AllowAny]
+    response_cache_scopes = ("roles",)
+    calls = 0
+
+    def get(self, request):
+        CountingView.calls += 1
+        return Response({"calls": CountingView.calls})
+
+
+class HeaderAuthentication(BaseAuthentication):
+    """Authenticates from a header the middleware does not know about."""
+
+    def authenticate(self, request):
+        if "X-Test-User" in request.headers:
+            return (mock.Mock(is_authenticated=True), None)
+        return None
+
+
+class HeaderAuthenticatedView(CountingView):
+    authentication_classes = [HeaderAuthentication]
+
+
+@override_settings(GALAXY_RESPONSE_CACHE_ENABLED=True)
+class TestResponseCache(TestCase):
+    def setUp(self):
+        CountingView.calls = 0
+        self.redis = FakeRedis()
+        for patcher in (
+            mock.patch.object(settings_cache, "conn", self.redis),
+            mock.patch.object(response_cache, "get_redis_connection", return_value=self.redis),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.view = CountingView.as_view()
+        self.middleware = ResponseCacheMiddleware(self._handle)
+
+    def _handle(self, request):
+        # what django's handler does between the middlewares and the view
+        response = self.middleware.process_view(request, self.view, (), {})
+        if response is None:
+            response = self.view(request).render()
+        return response
+
+    def _get(self, path="/api/test/", user=None, **headers):
+        request = RequestFactory().get(path, headers=headers)
+        request.user = user or AnonymousUser()
+        request.resolver_match = type(
+            "Match", (), {"view_name": "test:counting", "_func_path": "test.view"}
+        )()
+        return self.middleware(request)
+
+    def test_hit(self):
+        first = self._get("/api/test/?b=2&a=1")
+        second = self._get("/api/test/?a=1&b=2")
+        self.assertEqual(CountingView.calls, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+        self._get("/api/test/?a=2&b=2")
+        self.assertEqual(CountingView.calls, 2)
+
+    def test_invalidated_by_generation(self):
+        self._get()
+        response_cache.bump_generation("namespaces")
+        self._get()
+        self.assertEqual(CountingView.calls, 1)
+
+        response_cache.bump_generation("roles")
+        response = self._get()
+        self.assertEqual(CountingView.calls, 2)
+        self.assertEqual(response.data, {"calls": 2})
+
+    def test_not_modified(self):
+        etag = self._get()["ETag"]
+        response = self._get(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        response = self._get(**{"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_authenticated_requests_are_not_cached(self):
+        user = mock.Mock(is_authenticated=True)
+        self._get(user=user)
+        self._get(user=user)
+        self._get(Authorization="Token abc")
+        self.assertEqual(CountingView.calls, 3)
+        self.assertEqual(self.redis.data, {})
+
+    def test_drf_authenticated_responses_are_not_stored(self):
+        self.view = HeaderAuthenticatedView.as_view()
+        self._get(**{"X-Test-User": "someone"})
+        self.assertFalse(
+            [key for key in self.redis.data if key.startswith("GALAXY_RESPONSE_CACHE:")]
+        )
+
+        response = self._get()
+        self.assertEqual(CountingView.calls, 2)
+        self.assertEqual(response.data, {"calls": 2})
+
+        self._get(**{"X-DAB-JW-TOKEN": "jwt"})
+        self.assertEqual(CountingView.calls, 3)
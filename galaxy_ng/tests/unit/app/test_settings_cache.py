@@ -0,0 +1,56 @@
+from unittest import mock
+
+import pytest
+
+from galaxy_ng.app.tasks import settings_cache
+
+
+@pytest.fixture
+def local_cache():
+    db_data = {"FOO": "bar"}
+    settings_cache.invalidate_local_settings_cache()
+    with (
+        mock.patch.object(settings_cache, "get_settings_from_cache", return_value={}) as redis,
+        mock.patch.object(settings_cache, "get_settings_from_db", return_value=db_data) as db,
+        mock.patch.object(settings_cache, "start_invalidation_listener"),
+        mock.patch.object(settings_cache, "get_settings_version", return_value="1"),
+    ):
+        yield redis, db
+    settings_cache.invalidate_local_settings_cache()
+
+
+def test_reads_are_served_from_the_local_copy(local_cache):
+    _, db = local_cache
+    snapshot = settings_cache.get_dynamic_settings()
+    assert snapshot.data == {"FOO": "bar"}
+    assert snapshot.source == "db"
+    assert snapshot.keys == {"FOO"}
+
+    for _ in range(10):
+        assert settings_cache.get_dynamic_settings() is snapshot
+    assert db.call_count == 1
+
+
+def test_invalidation_reloads(local_cache):
+    redis, _ = local_cache
+    settings_cache.get_dynamic_settings()
+
+    redis.return_value = {"FOO": "baz"}
+    settings_cache.invalidate_local_settings_cache({"type": "message", "data": "2"})
+    snapshot = settings_cache.get_dynamic_settings()
+    assert snapshot.data == {"FOO": "baz"}
+    assert snapshot.source == "cache"
+
+
+def test_expired_copy_is_kept_while_the_version_is_unchanged(local_cache):
+    _, db = local_cache
+    snapshot = settings_cache.get_dynamic_settings()
+
+    snapshot.expires = 0
+    assert settings_cache.get_dynamic_settings() is snapshot
+    assert db.call_count == 1
+
+    snapshot.expires = 0
+    with mock.patch.object(settings_cache, "get_settings_version", return_value="2"):
+        assert settings_cache.get_dynamic_settings() is not snapshot
+    assert db.call_count == 2
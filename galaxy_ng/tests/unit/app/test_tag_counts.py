@@ -0,0 +1,80 @@
+from django.core.management import call_command
+from django.test import TestCase
+from pulp_ansible.app.models import Collection, CollectionVersion, Tag
+
+from galaxy_ng.app.api.v1.models import (
+    LegacyNamespace,
+    LegacyRole,
+    LegacyRoleTag,
+    LegacyRoleTagCount,
+)
+from galaxy_ng.app.models import CollectionTagCount
+from galaxy_ng.app.tasks import tag_counts
+
+
+class TestTagCounts(TestCase):
+    def setUp(self):
+        namespace = LegacyNamespace.objects.create(name="tagcounts")
+        self.roles = [
+            LegacyRole.objects.create(namespace=namespace, name=f"role{i}") for i in range(3)
+        ]
+        self.database, self.network = (
+            LegacyRoleTag.objects.create(name="database"),
+            LegacyRoleTag.objects.create(name="network"),
+        )
+
+        collection = Collection.objects.create(namespace="tagcounts", name="coll")
+        self.versions = [
+            CollectionVersion.objects.create(
+                collection=collection, namespace="tagcounts", name="coll", version=version
+            )
+            for version in ("1.0.0", "2.0.0")
+        ]
+        self.tools = Tag.objects.create(name="tools")
+
+    def _role_counts(self):
+        tag_counts.refresh_stale_role_tag_counts()
+        return dict(LegacyRoleTagCount.objects.values_list("tag__name", "count"))
+
+    def test_role_tags_attached_and_detached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for role in self.roles:
+                role.tags.add(self.database)
+            self.network.legacyrole.add(self.roles[0])
+        self.assertEqual(self._role_counts(), {"database": 3, "network": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.roles[1].tags.remove(self.database)
+            self.roles[0].tags.clear()
+        self.assertEqual(self._role_counts(), {"database": 1, "network": 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.roles[2].delete()
+        self.assertEqual(self._role_counts(), {"database": 0, "network": 0})
+        self.assertFalse(LegacyRoleTagCount.objects.filter(stale=True).exists())
+
+    def test_collection_tags(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for version in self.versions:
+                version.tags.add(self.tools)
+        tag_counts.refresh_stale_collection_tag_counts()
+        self.assertEqual(CollectionTagCount.objects.get(tag=self.tools).count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tools.ansible_collectionversion.remove(self.versions[0])
+        tag_counts.refresh_stale_collection_tag_counts()
+        self.assertEqual(CollectionTagCount.objects.get(tag=self.tools).count, 1)
+
+    def test_rebuild_command(self):
+        # bulk inserts bypass the signals
+        LegacyRole.tags.through.objects.bulk_create([
+            LegacyRole.tags.through(legacyrole=role, legacyroletag=self.network)
+            for role in self.roles
+        ])
+        CollectionVersion.tags.through.objects.create(
+            collectionversion=self.versions[0], tag=self.tools
+        )
+        call_command("rebuild-tag-counts")
+
+        self.assertEqual(self._role_counts(), {"database": 0, "network": 3})
+        self.assertEqual(CollectionTagCount.objects.get(tag=self.tools).count, 1)
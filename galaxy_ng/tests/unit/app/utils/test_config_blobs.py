@@ -0,0 +1,67 @@
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from galaxy_ng.app.utils import config_blobs
+
+
+class FakeBlob:
+    def __init__(self, digest):
+        self.digest = digest
+
+
+class TestConfigBlobCache(SimpleTestCase):
+    def setUp(self):
+        config_blobs.CONFIG_BLOB_CACHE.clear()
+        self.addCleanup(config_blobs.CONFIG_BLOB_CACHE.clear)
+
+    def _read(self, blob, raw=b'{"architecture": "amd64"}'):
+        with mock.patch.object(config_blobs, "_read_artifact", return_value=raw) as read:
+            data = config_blobs.get_config_blob_data(blob)
+        return data, read.call_count
+
+    def test_read_once(self):
+        blob = FakeBlob("sha256:aaa")
+        self.assertEqual(self._read(blob), ({"architecture": "amd64"}, 1))
+        self.assertEqual(self._read(blob), ({"architecture": "amd64"}, 0))
+
+    @override_settings(GALAXY_CONFIG_BLOB_CACHE_MAX_BLOB_SIZE=10)
+    def test_large_blobs_are_not_cached(self):
+        blob = FakeBlob("sha256:bbb")
+        self._read(blob)
+        self.assertEqual(self._read(blob)[1], 1)
+
+    def test_hits_are_not_shared(self):
+        blob = FakeBlob("sha256:ddd")
+        data, _ = self._read(blob)
+        data["architecture"] = "arm64"
+        self.assertEqual(self._read(blob), ({"architecture": "amd64"}, 0))
+
+    def test_lru_eviction(self):
+        cache = config_blobs.ConfigBlobCache()
+        size = sys.getsizeof("{}")
+        cache.put("a", "{}", max_bytes=2 * size)
+        cache.put("b", "{}", max_bytes=2 * size)
+        cache.get("a")
+        cache.put("c", "{}", max_bytes=2 * size)
+
+        self.assertEqual(cache.get("a"), "{}")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "{}")
+        self.assertEqual(cache.size, 2 * size)
+
+        cache.put("d", "[" + "0," * size + "0]", max_bytes=2 * size)
+        self.assertIsNone(cache.get("d"))
+
+    @override_settings(GALAXY_CONFIG_BLOB_CACHE_REDIS=True)
+    def test_shared_through_redis(self):
+        blob = FakeBlob("sha256:ccc")
+        with mock.patch.object(config_blobs, "_redis_get", return_value='{"os": "linux"}'):
+            self.assertEqual(self._read(blob), ({"os": "linux"}, 0))
+
+        config_blobs.CONFIG_BLOB_CACHE.clear()
+        with mock.patch.object(config_blobs, "_redis_get", return_value=None), \
+                mock.patch.object(config_blobs, "_redis_set") as redis_set:
+            self._read(blob)
+        redis_set.assert_called_once_with("sha256:ccc", '{"architecture": "amd64"}')
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from galaxy_ng.app.utils import content_proxy
+
+
+class FakeRaw:
+    def __init__(self, body):
+        self.body = body
+        self.amounts = []
+
+    def stream(self, amt):
+        self.amounts.append(amt)
+        for i in range(0, len(self.body), amt):
+            yield self.body[i:i + amt]
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = FakeRaw(body)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestContentProxy(TestCase):
+    def test_session_is_reused(self):
+        self.assertIs(content_proxy.get_session(), content_proxy.get_session())
+
+    def test_forwarded_headers(self):
+        request = RequestFactory().get(
+            "/", HTTP_RANGE="bytes=0-9", HTTP_IF_NONE_MATCH='"abc"', HTTP_COOKIE="x=1"
+        )
+        session = mock.Mock()
+        with mock.patch.object(content_proxy, "get_session", return_value=session):
+            content_proxy.fetch("http://content/file.tar.gz", request)
+
+        _, kwargs = session.get.call_args
+        self.assertEqual(kwargs["headers"], {"Range": "bytes=0-9", "If-None-Match": '"abc"'})
+        self.assertTrue(kwargs["stream"])
+        self.assertFalse(kwargs["allow_redirects"])
+
+    @override_settings(GALAXY_ARTIFACT_PROXY_CHUNK_SIZE=4)
+    def test_streaming_response(self):
+        upstream = FakeResponse(
+            206,
+            body=b"0123456789",
+            headers={
+                "Content-Type": "application/gzip",
+                "Content-Range": "bytes 0-9/100",
+                "Content-Length": "10",
+                "Set-Cookie": "x=1",
+            },
+        )
+        response = content_proxy.streaming_response(upstream)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 0-9/100")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertNotIn("Set-Cookie", response)
+        self.assertFalse(upstream.closed)
+
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertEqual(upstream.raw.amounts, [4])
+        self.assertTrue(upstream.closed)
+
+    def test_not_modified(self):
+        upstream = FakeResponse(304, headers={"ETag": '"abc"', "Content-Length": "10"})
+        response = content_proxy.relayed_response(upstream)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"abc"')
+        self.assertNotIn("Content-Length", response)
+        self.assertTrue(upstream.closed)
+
+    @override_settings(
+        GALAXY_ARTIFACT_PROXY_ACCEL_HEADER="X-Accel-Redirect",
+        GALAXY_ARTIFACT_PROXY_ACCEL_LOCATION="/_internal/",
+    )
+    def test_accel_redirect(self):
+        response = content_proxy.accel_redirect_response(
+            "http://localhost:24816/api/v3/artifacts/published/a-b-1.0.0.tar.gz?validate_token=t"
+        )
+        self.assertEqual(response.content, b"")
+        self.assertNotIn("Content-Type", response)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            "/_internal/api/v3/artifacts/published/a-b-1.0.0.tar.gz?validate_token=t",
+        )
@@ -1,6 +1,10 @@
+import random
+import time
 import uuid
+from unittest import mock
 
 from django.test import TestCase
+from galaxy_ng.app.utils import galaxy
 from galaxy_ng.app.utils.galaxy import upstream_role_iterator
 from galaxy_ng.app.utils.galaxy import uuid_to_int
 from galaxy_ng.app.utils.galaxy import int_to_uuid
@@ -43,3 +47,84 @@ class UUIDConversionTestCase(TestCase):
             test_int = uuid_to_int(test_uuid)
             reversed_uuid = int_to_uuid(test_int)
             assert test_uuid == reversed_uuid, f"{test_uuid} != {reversed_uuid}"
+
+
+class FakeResponse:
+
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+
+def fake_upstream(url):
+    """A two page v1 roles api where every response takes a random time."""
+    time.sleep(random.uniform(0, 0.01))
+    base = 'https://galaxy.example.com'
+    path = url[len(base):]
+    if path == '/api/v1/roles/':
+        return FakeResponse({
+            'results': [{'id': i} for i in range(10)],
+            'next_link': '/roles/?page=2',
+        })
+    if path == '/api/v1/roles/?page=2':
+        return FakeResponse({'results': [{'id': i} for i in range(10, 20)], 'next_link': None})
+    if path.startswith('/api/v1/roles/') and path.endswith('/versions'):
+        return FakeResponse({'results': [{'name': '1.0.0'}], 'next_link': None})
+    if path.startswith('/api/v1/roles/'):
+        role_id = int(path.split('/')[4])
+        if role_id == 3:
+            return FakeResponse({'detail': 'Not found.'}, status_code=404)
+        return FakeResponse({
+            'id': role_id,
+            'summary_fields': {'namespace': {'id': role_id % 3}},
+        })
+    if path.endswith('/owners/'):
+        return FakeResponse([{'username': 'owner'}])
+    if path.startswith('/api/v1/namespaces/'):
+        return FakeResponse({'id': int(path.split('/')[4]), 'summary_fields': {}})
+    raise AssertionError(f'unexpected url {url}')
+
+
+class TestUpstreamConcurrentFetch(TestCase):
+
+    def test_role_iterator_preserves_upstream_order(self):
+        with mock.patch.object(galaxy, 'safe_fetch', side_effect=fake_upstream) as fetch:
+            roles = list(upstream_role_iterator(
+                baseurl='https://galaxy.example.com', concurrency=4
+            ))
+
+        assert [role['id'] for _, role, _ in roles] == [i for i in range(20) if i != 3]
+        for namespace, role, versions in roles:
+            assert namespace['id'] == role['summary_fields']['namespace']['id']
+            assert namespace['summary_fields']['owners'] == [{'username': 'owner'}]
+            assert versions == [{'name': '1.0.0'}]
+
+        # each namespace is only fetched once
+        namespace_urls = [
+            c.args[0] for c in fetch.call_args_list
+            if c.args[0].rstrip('/').split('/')[-2] == 'namespaces'
+        ]
+        assert sorted(namespace_urls) == sorted(set(namespace_urls))
+
+    def test_role_iterator_with_limit(self):
+        with mock.patch.object(galaxy, 'safe_fetch', side_effect=fake_upstream):
+            roles = list(upstream_role_iterator(
+                baseurl='https://galaxy.example.com', limit=5, concurrency=4
+            ))
+        assert [role['id'] for _, role, _ in roles] == [0, 1, 2, 4, 5]
+
+    def test_safe_fetch_backs_off_on_server_errors(self):
+        session = mock.Mock()
+        session.get.side_effect = [FakeResponse({}, 502), FakeResponse({}, 503), FakeResponse({})]
+        with mock.patch.object(galaxy, 'get_session', return_value=session), \
+                mock.patch.object(galaxy.time, 'sleep') as sleep:
+            rr = galaxy.safe_fetch('https://galaxy.example.com/api/v1/roles/')
+
+        assert rr.status_code == 200
+        assert session.get.call_count == 3
+        first, second = (c.args[0] for c in sleep.call_args_list)
+        assert 1 <= first <= 2
+        assert 2 <= second <= 4
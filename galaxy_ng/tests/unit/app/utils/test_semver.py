@@ -0,0 +1,65 @@
+import semantic_version
+from django.test import TestCase
+from pulp_ansible.app.models import Collection, CollectionVersion
+
+from galaxy_ng.app.utils.semver import SemverKey, filter_by_spec, sort_key
+
+VERSIONS = [
+    "0.0.1",
+    "1.0.0-a.x",
+    "1.0.0-a-b",
+    "1.0.0-alpha",
+    "1.0.0-alpha.1",
+    "1.0.0-alpha.beta",
+    "1.0.0-alpha1",
+    "1.0.0-beta.2",
+    "1.0.0-beta.11",
+    "1.0.0-rc.1",
+    "1.0.0",
+    "1.9.0",
+    "1.10.0",
+    "2.0.0-beta",
+    "2.0.0",
+    "10.0.0",
+]
+
+
+class TestSemverKey(TestCase):
+    def setUp(self):
+        self.collection = Collection.objects.create(namespace="semver", name="keys")
+        for version in VERSIONS:
+            CollectionVersion.objects.create(
+                collection=self.collection,
+                namespace="semver",
+                name="keys",
+                version=version,
+            )
+
+    def test_sort_key_order(self):
+        shuffled = VERSIONS[::2] + VERSIONS[1::2]
+        self.assertEqual(
+            sorted(shuffled, key=sort_key),
+            sorted(shuffled, key=semantic_version.Version),
+        )
+        self.assertEqual(sorted(shuffled, key=sort_key), VERSIONS)
+
+    def test_database_key_matches_python_key(self):
+        rows = CollectionVersion.objects.filter(collection=self.collection).annotate(
+            semver_key=SemverKey()
+        ).values_list("version", "semver_key")
+        for version, key in rows:
+            self.assertEqual(key, sort_key(version))
+
+    def test_database_order(self):
+        versions = CollectionVersion.objects.filter(collection=self.collection).order_by(
+            SemverKey()
+        ).values_list("version", flat=True)
+        self.assertEqual(list(versions), VERSIONS)
+
+    def test_filter_by_spec(self):
+        queryset = CollectionVersion.objects.filter(collection=self.collection)
+        for expression in [">=1.0.0,<2.0.0", "<2.0.0", "==1.0.0-rc.1", "!=1.0.0", "^1.9", "*"]:
+            spec = semantic_version.SimpleSpec(expression)
+            expected = {v for v in VERSIONS if spec.match(semantic_version.Version(v))}
+            found = set(filter_by_spec(queryset, spec).values_list("version", flat=True))
+            self.assertEqual(found, expected, expression)